@@ -0,0 +1,182 @@
+import http.client
+import json
+import queue
+import re
+import select
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+# =====================================================
+# BACKEND HTTP DO BORDERÔ (REAPROVEITA A SESSÃO DO SELENIUM)
+# =====================================================
+
+def sessao_do_driver(driver) -> dict:
+    """
+    Cookies + User-Agent (+ token CSRF, se a página tiver) do Chrome já logado.
+    """
+    cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
+    info = driver.execute_script("""
+        const m = document.querySelector('meta[name="csrf-token"], meta[name="_token"], input[name="_token"]');
+        return { ua: navigator.userAgent, csrf: m ? (m.content || m.value || null) : null };
+    """) or {}
+    return {"cookies": cookies, "user_agent": info.get("ua"), "csrf": info.get("csrf")}
+
+
+def _conexao_caiu(conn) -> bool:
+    # conexão ociosa "legível" = o servidor mandou FIN (ou lixo): não dá para mandar o POST nela
+    if conn.sock is None:
+        return True
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class LimitadorTaxa:
+    # token bucket simples, compartilhado entre as threads
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._proximo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def aguardar(self):
+        if not self.intervalo:
+            return
+        with self._lock:
+            agora = time.monotonic()
+            espera = self._proximo - agora
+            self._proximo = max(self._proximo, agora) + self.intervalo
+        if espera > 0:
+            time.sleep(espera)
+
+
+class ClienteBorderoHTTP:
+    """
+    Faz o POST do borderô direto, com conexões keep-alive reaproveitadas.
+
+    `modelo` descreve a requisição capturada no DevTools (aba Network, clique em salvarBordero):
+        url            ex.: "https://erp.olist.com/contas_receber/salvar_bordero/{id_conta}"
+        campos         dict nome -> valor, aceitando {id_conta} {data} {taxa} {desconto} {valor} {csrf}
+        json           True = corpo JSON; False = form-urlencoded
+        regex_sucesso  regex procurada no corpo da resposta 2xx
+        regex_sessao   regex que indica sessão expirada/tela de login
+    """
+
+    def __init__(self, modelo: dict, sessao: dict, conexoes: int = 4, por_segundo: float = 5.0, timeout: float = 20):
+        self.modelo = modelo
+        self.sessao = sessao
+        self.timeout = timeout
+        self.limitador = LimitadorTaxa(por_segundo)
+        partes = urlsplit(modelo["url"])
+        self._esquema = partes.scheme
+        self._host = partes.netloc
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=conexoes)
+        self._re_sucesso = re.compile(modelo.get("regex_sucesso", r"sucesso|\"ok\"\s*:\s*true"), re.I)
+        self._re_sessao = re.compile(modelo.get("regex_sessao", r"sess[aã]o expirou|fa[cç]a login"), re.I)
+
+    def _nova_conexao(self):
+        cls = http.client.HTTPSConnection if self._esquema == "https" else http.client.HTTPConnection
+        return cls(self._host, timeout=self.timeout)
+
+    def _pegar_conexao(self):
+        # (conexão, reaproveitada?); keep-alive que o servidor já fechou é trocado antes de escrever
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return self._nova_conexao(), False
+            if not _conexao_caiu(conn):
+                return conn, True
+            conn.close()
+
+    def _devolver_conexao(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def fechar(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _montar(self, id_conta: str, valores: dict) -> tuple[str, bytes, dict]:
+        ctx = {"id_conta": id_conta, "csrf": self.sessao.get("csrf") or "", **valores}
+        ctx = {k: ("" if v is None else v) for k, v in ctx.items()}
+
+        partes = urlsplit(self.modelo["url"].format(**ctx))
+        caminho = partes.path + (f"?{partes.query}" if partes.query else "")
+        campos = {k: str(v).format(**ctx) for k, v in self.modelo["campos"].items()}
+
+        headers = {
+            "Cookie": "; ".join(f"{k}={v}" for k, v in self.sessao["cookies"].items()),
+            "User-Agent": self.sessao.get("user_agent") or "Mozilla/5.0",
+            "X-Requested-With": "XMLHttpRequest",
+            "Connection": "keep-alive",
+        }
+        if self.sessao.get("csrf"):
+            headers["X-CSRF-Token"] = self.sessao["csrf"]
+        if self.modelo.get("json"):
+            corpo = json.dumps(campos).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        else:
+            corpo = urlencode(campos).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded; charset=UTF-8"
+        return caminho, corpo, headers
+
+    def baixar(self, id_conta: str, valores: dict) -> str:
+        """
+        Retorna "BAIXADO_OK", "RELOGAR", "TIMEOUT" ou "ERRO_HTTP_<motivo>".
+        "TIMEOUT" = o POST foi enviado e a resposta não veio/não deu para ler: o borderô pode ter sido
+        gravado, então não reenvia nem serve para o navegador refazer (a reconciliação decide).
+        "ERRO_HTTP_*" = o ERP respondeu que não gravou ou o pedido nem saiu: seguro refazer.
+        """
+        caminho, corpo, headers = self._montar(id_conta, valores)
+        self.limitador.aguardar()
+
+        for tentativa in (1, 2):
+            conn, reaproveitada = self._pegar_conexao()
+            try:
+                conn.request(self.modelo.get("metodo", "POST"), caminho, body=corpo, headers=headers)
+            except (http.client.HTTPException, OSError):
+                # falhou escrevendo: o ERP não recebeu o pedido inteiro. Só o keep-alive derrubado
+                # pelo servidor ganha uma segunda chance, numa conexão nova.
+                conn.close()
+                if reaproveitada and tentativa == 1:
+                    continue
+                return "ERRO_HTTP_CONEXAO"
+
+            try:
+                resp = conn.getresponse()
+                texto = resp.read().decode("utf-8", errors="replace")
+            except (http.client.HTTPException, OSError):
+                # pedido já enviado (timeout de leitura, conexão caiu, resposta truncada): ambíguo
+                conn.close()
+                return "TIMEOUT"
+
+            if resp.getheader("Connection", "").lower() == "close":
+                conn.close()
+            else:
+                self._devolver_conexao(conn)
+
+            if resp.status in (401, 403) or (300 <= resp.status < 400 and "login" in (resp.getheader("Location") or "")):
+                return "RELOGAR"
+            if self._re_sessao.search(texto):
+                return "RELOGAR"
+            if 200 <= resp.status < 300 and self._re_sucesso.search(texto):
+                return "BAIXADO_OK"
+            if resp.status == 504:
+                return "TIMEOUT"   # o proxy desistiu de esperar; o ERP pode ter gravado
+            return f"ERRO_HTTP_{resp.status}"
+
+        return "ERRO_HTTP_CONEXAO"
+
+
+def id_conta_da_url(url: str | None, regex: str) -> str | None:
+    if not url:
+        return None
+    m = re.search(regex, url)
+    return m.group(1) if m else None
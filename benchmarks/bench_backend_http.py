@@ -0,0 +1,61 @@
+"""
+Benchmark do backend HTTP do borderô contra o mock local (sem navegador).
+Confere também o formato das requisições que chegaram no mock.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_backend_http
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend_http import ClienteBorderoHTTP
+from mock_olist import COOKIE_SESSAO, TOKEN_SESSAO, iniciar_mock
+
+N_PEDIDOS = 500
+LATENCIA_MOCK = 0.05
+CENARIOS = [(1, 0), (4, 0), (8, 0), (8, 40)]   # (conexões, pedidos/s; 0 = sem limite)
+
+CAMPOS = {
+    "idConta": "{id_conta}",
+    "idContaContabil": "737401193",
+    "idCategoria": "{categoria}",
+    "data": "{data}",
+    "taxa0": "{taxa}",
+    "desconto0": "{desconto}",
+    "valor0": "{valor}",
+}
+
+
+def rodar(conexoes: int, por_segundo: float, sessao_ok: bool = True) -> tuple[float, list, object]:
+    servidor, estado, url = iniciar_mock(latencia=LATENCIA_MOCK)
+    modelo = {"url": url + "/contas_receber/salvar_bordero/{id_conta}", "campos": CAMPOS}
+    sessao = {"cookies": {COOKIE_SESSAO: TOKEN_SESSAO if sessao_ok else "velha"}, "user_agent": "bench"}
+    cliente = ClienteBorderoHTTP(modelo, sessao, conexoes=conexoes, por_segundo=por_segundo)
+
+    valores = {"data": "05/11/2025", "taxa": "12,34", "desconto": "", "valor": "87,66", "categoria": "1"}
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(conexoes) as ex:
+        resultados = list(ex.map(lambda i: cliente.baixar(str(100000 + i), valores), range(N_PEDIDOS)))
+    dt = time.perf_counter() - t0
+
+    cliente.fechar()
+    servidor.shutdown()
+    return dt, resultados, estado
+
+
+def main():
+    dt, resultados, _ = rodar(2, 0, sessao_ok=False)
+    assert set(resultados) == {"RELOGAR"}, set(resultados)
+    print("✅ sessão inválida detectada como RELOGAR")
+
+    for conexoes, por_segundo in CENARIOS:
+        dt, resultados, estado = rodar(conexoes, por_segundo)
+        assert resultados.count("BAIXADO_OK") == N_PEDIDOS, set(resultados)
+        req = estado.requisicoes[0]
+        assert req["campos"]["valor0"] == "87,66" and req["campos"]["idConta"] == req["caminho"].rsplit("/", 1)[1]
+        limite = f"{por_segundo}/s" if por_segundo else "sem limite"
+        print(f"conexões {conexoes:>2} | {limite:>10} | {N_PEDIDOS / dt * 60:8.0f} pedidos/min")
+
+
+if __name__ == "__main__":
+    main()
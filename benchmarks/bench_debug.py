@@ -0,0 +1,83 @@
+"""
+Benchmark do debug de falhas: jeito antigo (save_screenshot PNG + page_source gravados no loop,
+um arquivo por falha) x GravadorDebug (JPEG, gravação/gzip na thread, amostragem e teto).
+O Chrome é simulado: a captura devolve bytes do tamanho típico de cada formato depois de uma
+pausa fixa (PNG_MS/JPEG_MS), então o p95 do loop é essa pausa mais o que sobra além dela. Não é
+medida de Chrome real: Page.captureScreenshot e page_source continuam síncronos no loop e custam
+o que a página custar; o ganho medido aqui é a gravação/gzip que saiu do loop e o teto de disco.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_debug
+"""
+import base64
+import os
+import shutil
+import tempfile
+import time
+
+from debug_artefatos import GravadorDebug
+from metricas import percentil
+
+N_FALHAS = 1_000
+PNG_KB, JPEG_KB, HTML_KB = 350, 70, 400
+PNG_MS, JPEG_MS = 25.0, 8.0     # codificação no Chrome (simulada)
+
+
+class DriverFalso:
+    def __init__(self):
+        self._png = os.urandom(PNG_KB * 1024)
+        self._jpeg = base64.b64encode(os.urandom(JPEG_KB * 1024)).decode()
+        self.page_source = "<html><body>" + "<tr><td>2511000001</td><td>Em aberto</td></tr>" * (HTML_KB * 24) + "</body></html>"
+
+    def save_screenshot(self, caminho: str):
+        time.sleep(PNG_MS / 1000)
+        with open(caminho, "wb") as f:
+            f.write(self._png)
+        return True
+
+    def execute_cdp_cmd(self, cmd: str, params: dict):
+        time.sleep(JPEG_MS / 1000)
+        return {"data": self._jpeg}
+
+
+def tamanho(pasta: str) -> tuple[int, int]:
+    n = total = 0
+    for raiz, _, arquivos in os.walk(pasta):
+        for a in arquivos:
+            n += 1
+            total += os.path.getsize(os.path.join(raiz, a))
+    return n, total
+
+
+def main():
+    drv = DriverFalso()
+    pasta = tempfile.mkdtemp(prefix="bench_debug_")
+
+    antigo = os.path.join(pasta, "antigo")
+    os.makedirs(antigo)
+    ms = []
+    for i in range(N_FALHAS):
+        t0 = time.perf_counter()
+        drv.save_screenshot(os.path.join(antigo, f"erro_2511{i:08d}_t1.png"))
+        with open(os.path.join(antigo, f"erro_2511{i:08d}_t1.html"), "w", encoding="utf-8") as f:
+            f.write(drv.page_source)
+        ms.append((time.perf_counter() - t0) * 1000)
+    n, total = tamanho(antigo)
+    print(f"antigo (PNG + HTML no loop)    p95 {percentil(ms, 95):6.1f} ms/falha (simulado) | {n} arquivos, {total / 1e6:7.1f} MB")
+
+    gravador = GravadorDebug(os.path.join(pasta, "novo"))
+    for i in range(N_FALHAS):
+        gravador.capturar(drv, f"erro_2511{i:08d}_t1.png", codigo=f"2511{i:08d}", etapa="preencher", html=True)
+    loop = list(gravador.ms_captura)
+    pulados = sum(v for k, v in gravador.stats.items() if k.startswith("pulado_"))
+    gravador.fechar()
+    n, total = tamanho(os.path.join(pasta, "novo"))
+    print(f"GravadorDebug (JPEG + thread)  p95 {percentil(loop, 95):6.1f} ms/captura (simulado) | {n} arquivos, {total / 1e6:7.1f} MB "
+          f"| {pulados} de {N_FALHAS} falhas iguais só contadas")
+    print(f"   (captura simulada do Chrome: PNG {PNG_MS:.0f} ms, JPEG {JPEG_MS:.0f} ms de pausa fixa; "
+          f"o p95 acima é quase só essa pausa)")
+    shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
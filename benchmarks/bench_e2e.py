@@ -0,0 +1,265 @@
+"""
+Benchmark ponta a ponta: roda o gerar_olist.py de verdade (Chrome headless) contra o mock local
+e mede pedidos/min. Cada cenário é comparado com o baseline salvo em benchmarks/baseline_e2e.json.
+
+Rodar a partir da raiz do projeto (precisa de Chrome + chromedriver no PATH, ou Selenium Manager):
+    python -m benchmarks.bench_e2e --pedidos 200 --latencia 0.05
+    python -m benchmarks.bench_e2e --workers 4 --salvar-baseline
+    python -m benchmarks.bench_e2e --falha-salvar 0.02 --busca-lenta 0.01 --expirar-a-cada 50
+    python -m benchmarks.bench_e2e --expirar-a-cada 20 --relogin senha     (re-login sem operador)
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from diario_execucao import DiarioExecucao
+from mock_olist import COOKIE_SESSAO, iniciar_mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_BASELINE = os.path.join(RAIZ, "benchmarks", "baseline_e2e.json")
+# histórico normal x enxuto entre execuções: fica no temp do sistema, fora da árvore do projeto
+ARQUIVO_REDE = os.path.join(tempfile.gettempdir(), "olist_bench_e2e", "rede_e2e.csv")
+RE_REDE = re.compile(r"🌐 Rede .*")
+RE_RECICLAGEM = re.compile(r"♻️ Navegador: .*")
+RE_PIPELINE = re.compile(r"⏩ Pipeline .*")
+USUARIO_MOCK, SENHA_MOCK = "robo", "robo123"
+RE_THROUGHPUT = re.compile(r"Throughput: (\d+) pedidos em [\d.]+ min = ([\d.]+) pedidos/min")
+
+
+def gerar_planilha(caminho: str, n: int) -> pd.DataFrame:
+    hoje = datetime.now()
+    df = pd.DataFrame({
+        "ID do pedido": [f"2511{i:08d}" for i in range(n)],
+        "Data": [hoje - timedelta(days=i % 30) for i in range(n)],
+        "TOTAL TAXAS": [round(10 + (i % 17) * 0.37, 2) for i in range(n)],
+        "Frete cobrado do comprador": [round((i % 3) * 4.99, 2) for i in range(n)],
+        "VALOR LIQUIDO": [round(80 + (i % 50) * 1.11, 2) for i in range(n)],
+        "VALIDAÇÃO": ["OK"] * n,
+    })
+    df["VALOR BRUTO"] = (df["VALOR LIQUIDO"] + df["TOTAL TAXAS"] + df["Frete cobrado do comprador"]).round(2)
+    df.to_excel(caminho, index=False)
+    return df
+
+
+def ambiente(pasta: str, url: str, args) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "OLIST_URL": url + "/contas_receber",
+        "OLIST_ARQUIVO_ENTRADA": os.path.join(pasta, "entrada.xlsx"),
+        "OLIST_ARQUIVO_SAIDA": os.path.join(pasta, "saida.xlsx"),
+        "OLIST_ARQUIVO_DIARIO": os.path.join(pasta, "diario.sqlite"),
+        "OLIST_ARQUIVO_INDICE": os.path.join(pasta, "indice.json"),
+        "OLIST_ARQUIVO_METRICAS": os.path.join(pasta, "metricas.jsonl"),
+        "OLIST_ARQUIVO_THROUGHPUT": os.path.join(pasta, "throughput.csv"),
+        "OLIST_ARQUIVO_REJEITADOS": os.path.join(pasta, "rejeitados.csv"),
+        "OLIST_PASTA_DEBUG": os.path.join(pasta, "debug"),
+        "OLIST_CHROME_USER_DATA_ORIGINAL": os.path.join(pasta, "perfil_origem"),
+        "OLIST_CHROME_USER_DATA_CLONE": os.path.join(pasta, "perfil_robo"),
+        "OLIST_CHROME_HEADLESS": "True",
+        "OLIST_N_WORKERS": str(args.workers),
+        "OLIST_TENTATIVAS_POR_PEDIDO": str(args.tentativas),
+        "OLIST_USAR_INDICE_LISTAGEM": str(not args.sem_indice),
+        "OLIST_BACKEND_HTTP": str(args.http),
+        "OLIST_MODO_ENXUTO": str(args.enxuto),
+        "OLIST_PIPELINE_ABAS": str(args.pipeline),
+        "OLIST_MEDIR_REDE": "True",
+        "OLIST_ARQUIVO_REDE": ARQUIVO_REDE,
+        "OLIST_CATEGORIA_SHOPEE_VALUE": "55",
+        "OLIST_URL_RECONCILIACAO": url + "/contas_receber?situacao=recebida",
+        "OLIST_LISTAGEM_SO_BAIXADOS": "True",
+        "OLIST_ARQUIVO_DISCREPANCIAS": os.path.join(pasta, "discrepancias.csv"),
+    })
+    if args.reciclar_a_cada:
+        # recicla a cada N pedidos, sem esperar memória/lentidão (exercita aba nova e Chrome novo)
+        env["OLIST_RECICLAGEM"] = repr({"max_pedidos": args.reciclar_a_cada, "min_pedidos": args.reciclar_a_cada,
+                                        "abas_por_driver": 1})
+    if args.relogin:
+        env["OLIST_URL_LOGIN"] = url + "/login"
+    if args.relogin == "senha":
+        env["OLIST_USUARIO"], env["OLIST_SENHA"] = USUARIO_MOCK, SENHA_MOCK
+    elif args.relogin == "cookies":
+        env["OLIST_ARQUIVO_COOKIES"] = os.path.join(pasta, "cookies.json")
+    return env
+
+
+def status_do_diario(caminho: str) -> dict:
+    diario = DiarioExecucao(caminho)
+    ultimo = {codigo: status for codigo, status, _, _ in diario.eventos()}
+    diario.fechar()
+    return dict(Counter(ultimo.values()))
+
+
+def contar_discrepancias(caminho: str) -> int:
+    # relatório da reconciliação final (só existe se sobrou pedido ambíguo)
+    if not os.path.exists(caminho):
+        return 0
+    rel = pd.read_csv(caminho, keep_default_na=False)
+    return int((rel["discrepancia"] != "").sum())
+
+
+def nome_cenario(args) -> str:
+    partes = [f"n{args.pedidos}", f"lat{args.latencia}", f"w{args.workers}"]
+    if args.sem_indice:
+        partes.append("sem_indice")
+    if args.http:
+        partes.append("http")
+    if args.enxuto:
+        partes.append("enxuto")
+    if args.pipeline:
+        partes.append("pipeline")
+    if args.relogin:
+        partes.append(f"relogin_{args.relogin}")
+    if args.reciclar_a_cada:
+        partes.append(f"reciclar{args.reciclar_a_cada}")
+    for nome in ("falha_salvar", "busca_lenta", "erro_pagina", "expirar_a_cada"):
+        if getattr(args, nome):
+            partes.append(f"{nome}{getattr(args, nome)}")
+    return "_".join(partes)
+
+
+def rodar(args) -> dict:
+    pasta = tempfile.mkdtemp(prefix="bench_e2e_")
+    os.makedirs(os.path.join(pasta, "perfil_origem", "Default"))
+    os.makedirs(os.path.dirname(ARQUIVO_REDE), exist_ok=True)
+    df = gerar_planilha(os.path.join(pasta, "entrada.xlsx"), args.pedidos)
+    codigos = df["ID do pedido"].tolist()
+
+    servidor, estado, url = iniciar_mock(
+        latencia=args.latencia, falha_salvar=args.falha_salvar, busca_lenta=args.busca_lenta,
+        erro_pagina=args.erro_pagina, expirar_a_cada=args.expirar_a_cada, semente=42,
+        exigir_login=bool(args.relogin), usuario=USUARIO_MOCK, senha=SENHA_MOCK,
+        arquivo_cookies=os.path.join(pasta, "cookies.json") if args.relogin == "cookies" else None,
+    )
+    if args.relogin == "cookies":
+        # cookie store inicial (um navegador logado); o mock regrava a cada queda de sessão
+        with estado.lock:
+            token = estado.novo_token()
+        with open(os.path.join(pasta, "cookies.json"), "w", encoding="utf-8") as f:
+            json.dump([{"name": COOKIE_SESSAO, "value": token, "path": "/"}], f)
+    # uma fração já aparece "Recebida" no ERP (caminho JA_BAIXADO)
+    ja_baixados = set(codigos[::max(1, int(1 / args.ja_baixados))]) if args.ja_baixados else set()
+    estado.carregar_contas(zip(codigos, df["VALOR LIQUIDO"] + df["TOTAL TAXAS"]), ja_baixados)
+
+    log = os.path.join(pasta, "saida_robo.log")
+    print(f"▶️ {nome_cenario(args)} | mock em {url} | pasta {pasta}")
+    t0 = time.perf_counter()
+    with open(log, "w", encoding="utf-8") as f:
+        proc = subprocess.run(
+            [sys.executable, "-u", os.path.join(RAIZ, "gerar_olist.py")],
+            cwd=pasta, env=ambiente(pasta, url, args), input="\n" * 1000, text=True,
+            stdout=f, stderr=subprocess.STDOUT, timeout=args.timeout,
+        )
+    total_s = time.perf_counter() - t0
+    servidor.shutdown()
+
+    with open(log, encoding="utf-8") as f:
+        saida = f.read()
+    if proc.returncode != 0:
+        print(saida[-3000:])
+        raise SystemExit(f"❌ gerar_olist.py terminou com código {proc.returncode} (log em {log})")
+
+    m = RE_THROUGHPUT.search(saida)
+    rede = RE_REDE.search(saida)
+    reciclagem = RE_RECICLAGEM.search(saida)
+    pipeline = RE_PIPELINE.search(saida)
+    resultado_df = pd.read_excel(os.path.join(pasta, "saida.xlsx"), dtype={"ID do pedido": str})
+    # "JA_BAIXADO" = o robô achou a conta já recebida no mock; conta como marcada
+    marcados = set(resultado_df.loc[resultado_df["BAIXADO"].astype(str).isin(("SIM", "JA_BAIXADO")), "ID do pedido"])
+    no_mock = estado.codigos_baixados()
+
+    r = {
+        "cenario": nome_cenario(args),
+        "pedidos_loop": int(m.group(1)) if m else 0,
+        "pedidos_por_minuto": float(m.group(2)) if m else 0.0,
+        "segundos_total": round(total_s, 1),
+        "baixados_no_mock": len(no_mock),
+        "falso_positivo": len(marcados - no_mock),     # planilha diz SIM/JA_BAIXADO, ERP não baixou
+        "nao_marcado": len(no_mock - marcados),        # ERP baixou, planilha não marcou
+        "falhas_injetadas": dict(estado.falhas_injetadas),
+        "logins": dict(estado.logins),
+        "rede": rede.group(0) if rede else None,
+        "reciclagem": reciclagem.group(0) if reciclagem else None,
+        "pipeline": pipeline.group(0) if pipeline else None,
+        "status": status_do_diario(os.path.join(pasta, "diario.sqlite")),
+        "discrepancias": contar_discrepancias(os.path.join(pasta, "discrepancias.csv")),
+        "pasta": pasta,
+    }
+    if not args.manter:
+        shutil.rmtree(pasta, ignore_errors=True)
+    return r
+
+
+def comparar_baseline(r: dict, salvar: bool):
+    try:
+        with open(ARQUIVO_BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    anterior = baseline.get(r["cenario"])
+    if anterior:
+        delta = (r["pedidos_por_minuto"] / anterior["pedidos_por_minuto"] - 1) * 100 if anterior["pedidos_por_minuto"] else 0
+        print(f"   baseline {anterior['pedidos_por_minuto']:.1f}/min ({anterior['em']}) → {delta:+.1f}%")
+    else:
+        print("   (sem baseline para este cenário; use --salvar-baseline)")
+
+    if salvar:
+        baseline[r["cenario"]] = {"pedidos_por_minuto": r["pedidos_por_minuto"], "em": f"{datetime.now():%Y-%m-%d}"}
+        with open(ARQUIVO_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline salvo em {ARQUIVO_BASELINE}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark ponta a ponta do gerar_olist.py contra o mock")
+    ap.add_argument("--pedidos", type=int, default=100)
+    ap.add_argument("--latencia", type=float, default=0.05, help="segundos por requisição no mock")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--tentativas", type=int, default=2)
+    ap.add_argument("--sem-indice", action="store_true", help="desliga o índice da listagem (busca pedido a pedido)")
+    ap.add_argument("--http", action="store_true", help="liga o backend HTTP do borderô")
+    ap.add_argument("--enxuto", action="store_true", help="MODO_ENXUTO (headless + bloqueio de recursos)")
+    ap.add_argument("--pipeline", action="store_true", help="PIPELINE_ABAS (abre o próximo pedido enquanto o borderô salva)")
+    ap.add_argument("--ja-baixados", type=float, default=0.1, help="fração já recebida no ERP")
+    ap.add_argument("--falha-salvar", type=float, default=0.0)
+    ap.add_argument("--busca-lenta", type=float, default=0.0)
+    ap.add_argument("--erro-pagina", type=float, default=0.0)
+    ap.add_argument("--expirar-a-cada", type=int, default=0)
+    ap.add_argument("--relogin", choices=("senha", "cookies"), default=None,
+                    help="mock exige login; o robô recupera a sessão sozinho por usuário/senha ou cookies")
+    ap.add_argument("--reciclar-a-cada", type=int, default=0,
+                    help="força a reciclagem do Chrome a cada N pedidos (aba nova, depois Chrome novo com os cookies)")
+    ap.add_argument("--timeout", type=float, default=3600)
+    ap.add_argument("--manter", action="store_true", help="não apaga a pasta temporária (log, métricas, debug)")
+    ap.add_argument("--salvar-baseline", action="store_true")
+    args = ap.parse_args()
+
+    r = rodar(args)
+    print(f"\n📈 {r['cenario']}: {r['pedidos_por_minuto']:.1f} pedidos/min "
+          f"({r['pedidos_loop']} no loop, {r['segundos_total']:.0f}s no total)")
+    print(f"   mock: {r['baixados_no_mock']} baixados | falso positivo {r['falso_positivo']} | "
+          f"não marcado {r['nao_marcado']} | falhas injetadas {r['falhas_injetadas']}")
+    print(f"   status no diário: {r['status']}")
+    if r["rede"]:
+        print(f"   {r['rede']}")
+    if r["pipeline"]:
+        print(f"   {r['pipeline']}")
+    if r["reciclagem"]:
+        print(f"   {r['reciclagem']} | logins no mock: {r['logins']}")
+    if args.manter:
+        print(f"   pasta: {r['pasta']}")
+    comparar_baseline(r, args.salvar_baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark da gravação do checkpoint: df.to_excel da tabela inteira x escrita_status
+(cópia da planilha original trocando só as células BAIXADO). Confere que fórmulas e
+formatação da planilha original continuam lá e que os status gravados batem.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_escrita
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+
+from escrita_status import EscritorStatus, gravar_copia_xlsx
+
+N_LINHAS = 50_000
+N_ALTERADOS = 2_000
+
+
+def gerar(caminho: str):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "NOV.2025"
+    cab = ["ID do pedido", "Data", "TOTAL TAXAS", "Frete cobrado do comprador", "VALOR LIQUIDO", "VALIDAÇÃO", "BAIXADO"]
+    ws.append(cab)
+    for c in ws[1]:
+        c.font = Font(bold=True)
+        c.fill = PatternFill("solid", fgColor="FFFF00")
+    for i in range(N_LINHAS):
+        n = i + 2
+        ws.append([f"2511{i:08d}", "05/11/2025", 10.5, 4.99, f"=C{n}+D{n}", f'=IF(E{n}>0,"OK","ERRO")', None])
+    wb.save(caminho)
+
+
+def main():
+    pasta = tempfile.mkdtemp(prefix="bench_escrita_")
+    origem = os.path.join(pasta, "entrada.xlsx")
+    print(f"Gerando {N_LINHAS} linhas...")
+    gerar(origem)
+    alterados = {f"2511{i:08d}": "SIM" for i in range(0, N_LINHAS, N_LINHAS // N_ALTERADOS)}
+
+    df = pd.read_excel(origem)
+    df["BAIXADO"] = df["BAIXADO"].astype("string")
+    t0 = time.perf_counter()
+    df.loc[df["ID do pedido"].isin(alterados.keys()), "BAIXADO"] = "SIM"
+    df.to_excel(os.path.join(pasta, "saida_antiga.xlsx"), index=False)
+    antigo = time.perf_counter() - t0
+    print(f"df.to_excel (tabela inteira)   {antigo:6.2f}s")
+
+    destino = os.path.join(pasta, "saida.xlsx")
+    t0 = time.perf_counter()
+    n = gravar_copia_xlsx(origem, destino, "ID do pedido", "BAIXADO", alterados)
+    novo = time.perf_counter() - t0
+    print(f"escrita_status (só células)    {novo:6.2f}s ({n} células) → {antigo / novo:.1f}x")
+
+    # thread: o agendar() volta na hora; o custo fica todo fora do loop
+    esc = EscritorStatus(origem, os.path.join(pasta, "saida_thread.xlsx"), "ID do pedido", "BAIXADO")
+    t0 = time.perf_counter()
+    esc.agendar(alterados)
+    print(f"EscritorStatus.agendar         {(time.perf_counter() - t0) * 1000:6.2f}ms no loop")
+    esc.fechar()
+
+    ws = load_workbook(destino)["NOV.2025"]
+    assert ws["A1"].font.bold and ws["A1"].fill.fgColor.rgb.endswith("FFFF00"), "formatação perdida"
+    assert ws["F2"].value == '=IF(E2>0,"OK","ERRO")' and ws["E3"].value == "=C3+D3", "fórmula perdida"
+    lido = pd.read_excel(destino, dtype={"ID do pedido": str})
+    marcados = set(lido.loc[lido["BAIXADO"] == "SIM", "ID do pedido"])
+    assert marcados == set(alterados), (len(marcados), len(alterados))
+    print("✅ formatação e fórmulas preservadas, status conferidos")
+    shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: lookup de status via df.loc (varredura da coluna) x LedgerStatus.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_ledger
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from ledger_status import LedgerStatus
+
+COLUNA_CODIGO = "ID do pedido"
+COLUNA_STATUS = "BAIXADO"
+
+TAMANHOS = [10_000, 50_000, 200_000]
+AMOSTRA_LEGADO = 300      # o caminho antigo é O(N²): mede uma amostra e extrapola
+SALVAR_A_CADA = 2000
+
+
+def montar_df(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    codigos = [f"25110{i:09d}" for i in range(n)]
+    status = np.where(rng.random(n) < 0.1, "SIM", "")
+    df = pd.DataFrame({COLUNA_CODIGO: codigos, COLUNA_STATUS: status})
+    df[COLUNA_STATUS] = df[COLUNA_STATUS].astype("string")
+    return df
+
+
+def loop_legado(df: pd.DataFrame, codigos: list[str]):
+    # ✅ mesma sequência de acessos do loop antigo (processar_pedido + loop principal)
+    for codigo in codigos:
+        atual = df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS].iloc[0]
+        if str(atual).strip().upper() == "SIM":
+            status = "JA_BAIXADO"
+        else:
+            status = "BAIXADO_OK"
+        if status == "BAIXADO_OK":
+            df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS] = "SIM"
+        else:
+            atual = df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS].iloc[0]
+            if str(atual).strip().upper() != "SIM":
+                df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS] = status
+
+
+def materializar(df: pd.DataFrame, ledger: LedgerStatus):
+    # checkpoint no DataFrame só com os alterados (o robô manda os mesmos para o EscritorStatus)
+    alterados = ledger.retirar_alterados()
+    if alterados:
+        mask = df[COLUNA_CODIGO].isin(alterados.keys())
+        df.loc[mask, COLUNA_STATUS] = df.loc[mask, COLUNA_CODIGO].map(alterados)
+
+
+def loop_ledger(df: pd.DataFrame, codigos: list[str]):
+    ledger = LedgerStatus.do_dataframe(df, COLUNA_CODIGO, COLUNA_STATUS)
+    for i, codigo in enumerate(codigos, start=1):
+        ledger.iniciar_tentativa(codigo)
+        status = "JA_BAIXADO" if ledger.ja_baixado(codigo) else "BAIXADO_OK"
+        ledger.registrar(codigo, status)
+        if i % SALVAR_A_CADA == 0:
+            materializar(df, ledger)
+    materializar(df, ledger)
+
+
+def main():
+    print(f"{'linhas':>10} | {'legado (estimado)':>18} | {'ledger':>10} | {'ganho':>8}")
+    print("-" * 56)
+    for n in TAMANHOS:
+        df = montar_df(n)
+        codigos = df[COLUNA_CODIGO].tolist()
+
+        amostra = codigos[:AMOSTRA_LEGADO]
+        t0 = time.perf_counter()
+        loop_legado(df.copy(), amostra)
+        t_legado = (time.perf_counter() - t0) / len(amostra) * n
+
+        t0 = time.perf_counter()
+        loop_ledger(df.copy(), codigos)
+        t_ledger = time.perf_counter() - t0
+
+        print(f"{n:>10} | {t_legado:>17.1f}s | {t_ledger:>9.2f}s | {t_legado / t_ledger:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
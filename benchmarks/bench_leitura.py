@@ -0,0 +1,80 @@
+"""
+Benchmark da leitura da entrada: pd.read_excel da planilha inteira x leitura_entrada.ler_entrada
+(só as colunas usadas, openpyxl read-only) x cache parquet. Confere que o preprocessamento
+dá o mesmo resultado nos dois caminhos.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_leitura
+"""
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from leitura_entrada import ler_entrada
+from preprocessamento import preprocessar
+
+N_LINHAS = 20_000
+N_COLUNAS_EXTRAS = 40
+
+COLUNAS = ["ID do pedido", "Data", "TOTAL TAXAS", "Frete cobrado do comprador", "VALOR LIQUIDO", "VALIDAÇÃO", "BAIXADO"]
+
+
+def gerar(caminho: str):
+    base = datetime(2025, 11, 1)
+    df = pd.DataFrame({
+        "ID do pedido": [f"2511{i:08d}" for i in range(N_LINHAS)],
+        "Data": [base + timedelta(days=i % 30) for i in range(N_LINHAS)],
+        "TOTAL TAXAS": [round(10 + (i % 17) * 0.37, 2) for i in range(N_LINHAS)],
+        "Frete cobrado do comprador": [None if i % 4 == 0 else round((i % 3) * 4.99, 2) for i in range(N_LINHAS)],
+        "VALOR LIQUIDO": [round(80 + (i % 50) * 1.11, 2) for i in range(N_LINHAS)],
+        "VALIDAÇÃO": ["OK" if i % 9 else "DIVERGENTE" for i in range(N_LINHAS)],
+        **{f"Coluna {k}": [f"texto {i % 97}" for i in range(N_LINHAS)] for k in range(N_COLUNAS_EXTRAS)},
+    })
+    df.to_excel(caminho, index=False)
+
+
+def medir(rotulo: str, func):
+    t0 = time.perf_counter()
+    df = func()
+    dt = time.perf_counter() - t0
+    print(f"{rotulo:<28} {dt:7.2f}s | df {df.memory_usage(deep=True).sum() / 1e6:6.1f} MB")
+    return df
+
+
+def main():
+    pasta = tempfile.mkdtemp(prefix="bench_leitura_")
+    caminho = os.path.join(pasta, "entrada.xlsx")
+    print(f"Gerando {N_LINHAS} linhas x {N_COLUNAS_EXTRAS + 6} colunas...")
+    gerar(caminho)
+    cache = os.path.join(pasta, "cache")
+
+    def antigo():
+        df = pd.read_excel(caminho)
+        df["ID do pedido"] = df["ID do pedido"].astype(str).str.strip()
+        return df
+
+    a = medir("pd.read_excel (tudo)", antigo)
+    b = medir("ler_entrada (openpyxl)", lambda: ler_entrada(caminho, COLUNAS, "ID do pedido", "Data",
+                                                               pasta_cache=cache))
+    c = None
+    if os.path.isdir(cache) and os.listdir(cache):
+        c = medir("ler_entrada (cache parquet)", lambda: ler_entrada(caminho, COLUNAS, "ID do pedido", "Data",
+                                                                       pasta_cache=cache))
+    else:
+        print("(sem pyarrow: cache parquet não medido)")
+
+    args = ("ID do pedido", "Data", "TOTAL TAXAS", "Frete cobrado do comprador", "VALOR LIQUIDO", "VALIDAÇÃO")
+    esperado = preprocessar(a, *args).mapas()
+    assert preprocessar(b, *args).mapas() == esperado
+    if c is not None:
+        assert preprocessar(c, *args).mapas() == esperado
+    print("✅ preprocessamento igual nos dois caminhos")
+    shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: preprocessar_legado (iterrows) x preprocessar (por coluna).
+Também confere se os dois caminhos produzem exatamente os mesmos valores.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_preprocessamento
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessamento import preprocessar, preprocessar_legado
+
+COLUNAS = ("ID do pedido", "Data", "TOTAL TAXAS", "Frete cobrado do comprador", "VALOR LIQUIDO", "VALIDAÇÃO")
+
+TAMANHOS = [10_000, 50_000]
+
+
+def montar_df(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dias = pd.date_range("2025-11-01", "2025-11-30")
+    taxas = np.round(rng.uniform(0, 80, n), 2)
+    frete = np.round(rng.uniform(0, 30, n), 2)
+    frete[rng.random(n) < 0.3] = np.nan
+
+    # valor líquido vem como texto em parte das planilhas ("1.234,56", "R$ 10,00")
+    liquido = [
+        f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") if i % 3 else v
+        for i, v in enumerate(np.round(rng.uniform(5, 2000, n), 2))
+    ]
+
+    df = pd.DataFrame({
+        COLUNAS[0]: [f"2511{rng.integers(10**9, 10**10)}" for _ in range(n)],
+        COLUNAS[1]: rng.choice(dias, n),
+        COLUNAS[2]: taxas,
+        COLUNAS[3]: frete,
+        COLUNAS[4]: pd.Series(liquido, dtype=object),
+        COLUNAS[5]: rng.choice(["ok", "OK ", "divergente", None], n),
+    })
+    df[COLUNAS[0]] = df[COLUNAS[0]].astype(str).str.strip()
+    df[COLUNAS[5]] = df[COLUNAS[5]].astype("string")
+    return df
+
+
+def main():
+    for n in TAMANHOS:
+        df = montar_df(n)
+
+        t0 = time.perf_counter()
+        legado = preprocessar_legado(df, *COLUNAS)
+        t_legado = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        registros = preprocessar(df, *COLUNAS)
+        t_novo = time.perf_counter() - t0
+
+        novo = registros.mapas()
+        for campo, mapa in legado.items():
+            if mapa != novo[campo]:
+                diff = [k for k in mapa if mapa[k] != novo[campo].get(k)][:5]
+                raise AssertionError(f"campo {campo} diverge em {diff}")
+
+        print(f"{n:>8} linhas | legado {t_legado:6.2f}s | novo {t_novo:6.2f}s | "
+              f"{t_legado / t_novo:5.1f}x | {len(registros)} pedidos iguais ✅")
+
+
+if __name__ == "__main__":
+    main()
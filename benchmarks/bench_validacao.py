@@ -0,0 +1,105 @@
+"""
+Benchmark da validação prévia: validacao_previa.validar_pedidos (em lote, centavos) x o mesmo
+conjunto de regras linha a linha. Planilha sintética com erros injetados (data vazia, líquido <= 0,
+valores negativos, bruto que não fecha). Confere que as duas rejeitam exatamente os mesmos pedidos
+pelos mesmos motivos e estima o tempo de navegador poupado.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_validacao
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from validacao_previa import resumo_rejeicoes, validar_pedidos
+from valores_br import centavos, data_br
+
+COLUNAS = ("ID do pedido", "Data", "VALOR BRUTO", "TOTAL TAXAS", "Frete cobrado do comprador", "VALOR LIQUIDO", "VALIDAÇÃO")
+SEGUNDOS_POR_PEDIDO = 8.0   # ida ao ERP de um pedido que seria pulado/falharia (abrir + borderô)
+
+
+def montar_df(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    taxas = np.round(rng.uniform(2, 40, n), 2)
+    frete = np.where(rng.random(n) < 0.3, np.round(rng.uniform(5, 25, n), 2), 0.0)
+    liquido = np.round(rng.uniform(20, 900, n), 2)
+    bruto = np.round(liquido + taxas + frete, 2)
+    datas = pd.Series(pd.date_range("2025-11-01", periods=30).strftime("%d/%m/%Y")[rng.integers(0, 30, n)], dtype=object)
+    validacao = pd.Series(np.where(rng.random(n) < 0.97, "ok", "divergente"), dtype=object)
+
+    erro = rng.integers(0, 100, n)   # ~8% das linhas com algum problema
+    datas[erro == 0] = None
+    datas[erro == 1] = "31/02/2025"
+    liquido = np.where(erro == 2, 0.0, liquido)
+    taxas = np.where(erro == 3, -taxas, taxas)
+    frete = np.where(erro == 4, -5.0, frete)
+    bruto = np.where(erro == 5, bruto + 1.37, bruto)
+    bruto = np.where(erro == 6, bruto + 0.01, bruto)   # dentro da tolerância: passa
+    liquido_txt = pd.Series([f"{v:.2f}".replace(".", ",") for v in liquido], dtype=object)
+    liquido_txt[erro == 7] = "abc"
+
+    return pd.DataFrame({
+        "ID do pedido": [f"2511{i:08d}" for i in range(n)],
+        "Data": datas, "VALOR BRUTO": bruto, "TOTAL TAXAS": taxas, "Frete cobrado do comprador": frete,
+        "VALOR LIQUIDO": liquido_txt, "VALIDAÇÃO": validacao,
+    })
+
+
+def validar_linha_a_linha(df: pd.DataFrame, tolerancia: int = 1) -> dict[str, str]:
+    # referência: as mesmas regras, célula a célula
+    out = {}
+    for _, row in df.iterrows():
+        motivos = []
+        data = data_br(row["Data"])
+        bruto, taxas, frete, valor = (centavos(row[c]) for c in COLUNAS[2:6])
+        if data is None:
+            motivos.append("data vazia ou inválida")
+        if valor is None:
+            motivos.append("líquido vazio ou inválido")
+        elif valor <= 0:
+            motivos.append("líquido <= 0")
+        if taxas is not None and taxas < 0:
+            motivos.append("taxas negativas")
+        if frete is not None and frete < 0:
+            motivos.append("frete negativo")
+        if bruto is not None and bruto < 0:
+            motivos.append("bruto negativo")
+        if bruto is None:
+            motivos.append("bruto vazio ou inválido")
+        if bruto is not None and valor is not None and abs(bruto - (taxas or 0) - (frete or 0) - valor) > tolerancia:
+            motivos.append("bruto − taxas − frete ≠ líquido")
+        if str(row["VALIDAÇÃO"]).strip().lower() != "ok":
+            motivos.append("VALIDAÇÃO da planilha não é ok")
+        if motivos:
+            out[str(row["ID do pedido"])] = "; ".join(motivos)
+    return out
+
+
+def main():
+    for n in (10_000, 100_000):
+        df = montar_df(n)
+
+        t0 = time.perf_counter()
+        ref = validar_linha_a_linha(df)
+        t_linha = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        prontos, rejeitados = validar_pedidos(df, *COLUNAS[:2], *COLUNAS[2:])
+        t_lote = time.perf_counter() - t0
+
+        igual = dict(zip(rejeitados["codigo"], rejeitados["motivo"])) == ref and int(prontos.sum()) == n - len(ref)
+        print(f"{n:>7} pedidos: linha a linha {t_linha:6.2f}s | em lote {t_lote:6.3f}s | {t_linha / t_lote:5.0f}x | "
+              f"{len(rejeitados)} rejeitados {'iguais ✅' if igual else 'DIFERENTES ❌'}")
+        if not igual:
+            raise SystemExit(1)
+
+    print(f"\nMotivos ({n} pedidos):")
+    for motivo, qtd in resumo_rejeicoes(rejeitados).items():
+        print(f"   {qtd:>6}  {motivo}")
+    horas = len(rejeitados) * SEGUNDOS_POR_PEDIDO / 3600
+    print(f"\nNavegador poupado: {len(rejeitados)} idas ao ERP ≈ {horas:.1f} h a {SEGUNDOS_POR_PEDIDO:.0f}s/pedido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Corpus de correção + micro-benchmark do valores_br (centavos inteiros, datas dd/mm/aaaa) contra os
+helpers antigos por célula (br_money, valor_num, formatar_data_br). O corpus tem que passar inteiro;
+depois mostra onde os helpers antigos discordam entre si / do esperado e o tempo em coluna inteira.
+
+Rodar a partir da raiz do projeto:
+    python -m benchmarks.bench_valores
+"""
+import time
+import warnings
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from preprocessamento import br_money, formatar_data_br, valor_num
+from valores_br import brl_coluna, centavos, centavos_coluna, data_br, datas_coluna, formatar_centavos
+
+N_LINHAS = 200_000
+N_DATAS_ANTIGO = 5_000   # formatar_data_br antigo leva ~0,5 ms/célula: mede numa fatia e projeta
+
+# (célula, centavos esperados)
+CORPUS_VALORES = [
+    ("1.234,56", 123456), ("R$ 1.234,56", 123456), ("R$\xa01.234,56", 123456), ("1234,56", 123456),
+    ("1,234.56", 123456), ("1234.56", 123456), ("1.234", 123400), ("1.234.567", 123456700),
+    ("1.234.567,8", 123456780), ("12.5", 1250), ("0.123", 12), ("0.125", 13), ("1,5", 150),
+    ("1,234", 123), ("1,235", 124), ("10", 1000), ("  7,00 ", 700), ("-3,50", -350), ("3,50-", -350),
+    ("(3,50)", -350), ("-R$ 3,50", -350), ("+2,00", 200), (",5", 50), ("0,01", 1), ("0,005", 1),
+    (12.5, 1250), (0.1, 10), (0.285, 29), (1.005, 101), (-0.285, -29), (19.99, 1999), (100, 10000),
+    (np.float64(2.675), 268), (np.int64(3), 300), (Decimal("1.015"), 102),
+    ("", None), ("   ", None), (None, None), (float("nan"), None), (pd.NA, None), ("abc", None),
+    ("1,2,3", None), ("1e5", None), ("R$", None), ("--1", None), (True, None),
+]
+
+# (célula, dd/mm/aaaa esperado)
+CORPUS_DATAS = [
+    ("05/11/2025", "05/11/2025"), ("5/11/2025", "05/11/2025"), ("05/11/25", "05/11/2025"),
+    ("2025-11-05", "05/11/2025"), ("2025-11-05 13:45:00", "05/11/2025"), ("05-11-2025", "05/11/2025"),
+    ("05.11.2025", "05/11/2025"), ("05/11/2025 08:30", "05/11/2025"), ("31/12/2025", "31/12/2025"),
+    (datetime(2025, 11, 5), "05/11/2025"), (pd.Timestamp("2025-11-05"), "05/11/2025"), (45966, "05/11/2025"),
+    (45966.5, "05/11/2025"), ("31/02/2025", None), ("ontem", None), ("", None), (None, None), (pd.NaT, None),
+]
+
+
+def conferir_corpus() -> int:
+    falhas = 0
+    for entrada, esperado in CORPUS_VALORES:
+        obtido = centavos(entrada)
+        if obtido != esperado:
+            falhas += 1
+            print(f"   ❌ centavos({entrada!r}) = {obtido}, esperado {esperado}")
+        if esperado is not None and centavos(formatar_centavos(esperado)) != esperado:
+            falhas += 1
+            print(f"   ❌ ida e volta de {esperado} ({formatar_centavos(esperado)!r})")
+    for entrada, esperado in CORPUS_DATAS:
+        obtido = data_br(entrada)
+        if obtido != esperado:
+            falhas += 1
+            print(f"   ❌ data_br({entrada!r}) = {obtido!r}, esperado {esperado!r}")
+
+    # a API em lote tem que bater com a de célula
+    serie = pd.Series([e for e, _ in CORPUS_VALORES], dtype=object)
+    c, nulos = centavos_coluna(serie)
+    lote = [None if n else int(v) for v, n in zip(c, nulos)]
+    if lote != [esperado for _, esperado in CORPUS_VALORES]:
+        falhas += 1
+        print("   ❌ centavos_coluna difere de centavos() no corpus")
+    flutuantes = pd.Series([0.285, 1.005, -0.285, 19.99, 2.675, np.nan])
+    c, nulos = centavos_coluna(flutuantes)
+    if [None if n else int(v) for v, n in zip(c, nulos)] != [29, 101, -29, 1999, 268, None]:
+        falhas += 1
+        print(f"   ❌ centavos_coluna (float) = {c.tolist()}")
+    if datas_coluna(pd.Series([e for e, _ in CORPUS_DATAS], dtype=object)) != [e for _, e in CORPUS_DATAS]:
+        falhas += 1
+        print("   ❌ datas_coluna difere de data_br() no corpus")
+    return falhas
+
+
+def divergencias_antigas():
+    print("\nHelpers antigos no corpus (onde erram ou discordam entre si):")
+    for entrada, esperado in CORPUS_VALORES:
+        if esperado is None or isinstance(entrada, bool):
+            continue
+        texto = br_money(entrada)
+        numero = valor_num(entrada)
+        certo = formatar_centavos(esperado)
+        if texto != certo or round(numero * 100) != esperado:
+            print(f"   {entrada!r:>16}: br_money {texto!r:>14} | valor_num {numero!r:>12} | certo {certo!r}")
+    for entrada, esperado in CORPUS_DATAS:
+        try:
+            antigo = formatar_data_br(entrada)
+        except Exception as e:
+            antigo = f"erro {e.__class__.__name__}"
+        if antigo != esperado:
+            print(f"   {entrada!r:>24}: formatar_data_br {antigo!r:>14} | certo {esperado!r}")
+
+
+def montar_colunas(n: int):
+    rng = np.random.default_rng(11)
+    v = np.round(rng.uniform(0.5, 5000, 3000), 2)
+    textos = [f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for x in v]
+    dias = pd.date_range("2025-01-01", "2025-12-31")
+    datas = [d.strftime("%d/%m/%Y") for d in dias]
+    return (pd.Series(rng.choice(textos, n), dtype=object), pd.Series(rng.choice(v, n)),
+            pd.Series(rng.choice(datas, n), dtype=object))
+
+
+def main():
+    warnings.filterwarnings("ignore", category=UserWarning)   # aviso de dayfirst do helper antigo
+    falhas = conferir_corpus()
+    print(f"Corpus: {len(CORPUS_VALORES)} valores, {len(CORPUS_DATAS)} datas → "
+          f"{'✅ tudo certo' if not falhas else f'❌ {falhas} falhas'}")
+    divergencias_antigas()
+
+    textos, numeros, datas = montar_colunas(N_LINHAS)
+    print(f"\nColuna inteira ({N_LINHAS} linhas, texto com ~3000 valores distintos, 365 datas):")
+    for nome, serie, antigo, novo in (
+        ("dinheiro (texto)", textos,
+         lambda s: (s.map(br_money).tolist(), s.map(valor_num).to_numpy()),
+         lambda s: brl_coluna(*centavos_coluna(s))),
+        ("dinheiro (float)", numeros,
+         lambda s: (s.map(br_money).tolist(), s.map(valor_num).to_numpy()),
+         lambda s: brl_coluna(*centavos_coluna(s))),
+        ("datas (texto)", datas, lambda s: s.head(N_DATAS_ANTIGO).map(formatar_data_br).tolist(), datas_coluna),
+    ):
+        t0 = time.perf_counter()
+        antigo(serie)
+        t_antigo = time.perf_counter() - t0
+        if serie is datas:
+            t_antigo *= len(serie) / N_DATAS_ANTIGO
+        t0 = time.perf_counter()
+        novo(serie)
+        t_novo = time.perf_counter() - t0
+        print(f"   {nome:<18} antigo por célula {t_antigo:6.2f}s | valores_br em lote {t_novo:6.3f}s | "
+              f"{t_antigo / t_novo:6.1f}x")
+
+    if falhas:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import base64
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from metricas import percentil
+
+# =====================================================
+# DEBUG: CAPTURA RÁPIDA, GRAVAÇÃO EM SEGUNDO PLANO, LIMITES E ÍNDICE
+# =====================================================
+
+# "timeout_2511000001_t2.png" -> "timeout"; "outro_X_NAO_ENCONTRADO_t1.png" -> "outro_NAO_ENCONTRADO"
+RE_VARIAVEL = re.compile(r"_(?:[0-9A-Za-z]*\d[0-9A-Za-z]{5,}|t\d+)(?=_|$)")
+
+
+def tipo_do_nome(nome: str, codigo: str | None = None) -> str:
+    base = os.path.splitext(nome)[0]
+    if codigo:
+        base = base.replace(f"_{codigo}", "")
+    return RE_VARIAVEL.sub("", base) or base
+
+
+def _arquivos_do_item(item: dict) -> int:
+    return (1 if item["jpeg"] or item["png"] else 0) + (1 if item["html"] else 0)
+
+
+class GravadorDebug:
+    """
+    Screenshots/HTML de debug sem travar o loop: no loop só acontece a captura (uma ida ao Chrome,
+    JPEG via CDP, que codifica bem mais rápido que PNG); decodificar, comprimir e gravar é na thread.
+    Cada execução grava numa subpasta própria com `indice.jsonl` (arquivo, tipo, pedido, etapa, bytes).
+    Limites por execução: `max_arquivos` e `max_mb`, reservados na hora de enfileirar (o que ainda está
+    na fila já conta), então o teto não estoura. Falha repetida do mesmo tipo é amostrada:
+    as `amostra_por_tipo` primeiras e depois 1 a cada `depois_a_cada`. Fila cheia = descarta (nunca espera).
+    Só as `manter_execucoes` subpastas mais novas ficam em disco.
+    """
+
+    def __init__(self, pasta: str, max_arquivos: int = 500, max_mb: float = 200, amostra_por_tipo: int = 5,
+                 depois_a_cada: int = 50, qualidade_jpeg: int = 60, fila_max: int = 32, manter_execucoes: int = 10):
+        self.pasta_raiz = pasta
+        self.pasta = os.path.join(pasta, datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self.max_arquivos = max_arquivos
+        self.max_bytes = max_mb * 1e6
+        self.amostra_por_tipo = amostra_por_tipo
+        self.depois_a_cada = depois_a_cada
+        self.qualidade_jpeg = qualidade_jpeg
+        self.manter_execucoes = manter_execucoes
+        self.vistos: Counter = Counter()
+        self.stats: Counter = Counter()
+        self.bytes = 0
+        self._reservados = 0   # bytes (estimados) de itens na fila, ainda não gravados
+        self.ms_captura: list[float] = []
+        self._arquivos = 0
+        self._avisou_limite = False
+        self._fila: queue.Queue = queue.Queue(maxsize=fila_max)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._rodar, name="gravador-debug", daemon=True)
+        self._iniciado = False
+
+    def _iniciar(self):
+        # pasta e thread só na primeira captura (execução limpa não cria nada)
+        os.makedirs(self.pasta, exist_ok=True)
+        self._limpar_antigas()
+        self._thread.start()
+        self._iniciado = True
+
+    def _limpar_antigas(self):
+        try:
+            subpastas = sorted(
+                d for d in os.listdir(self.pasta_raiz)
+                if os.path.isdir(os.path.join(self.pasta_raiz, d)) and re.fullmatch(r"\d{8}_\d{6}", d)
+            )
+        except OSError:
+            return
+        for d in subpastas[:-self.manter_execucoes] if self.manter_execucoes else []:
+            shutil.rmtree(os.path.join(self.pasta_raiz, d), ignore_errors=True)
+
+    def _decidir(self, tipo: str, forcar: bool) -> str | None:
+        # chamar com self._lock; None = captura; senão o motivo do pulo
+        self.vistos[tipo] += 1
+        n = self.vistos[tipo]
+        if not forcar and n > self.amostra_por_tipo and (n - self.amostra_por_tipo) % self.depois_a_cada:
+            return "amostragem"
+        if self._arquivos >= self.max_arquivos or self.bytes + self._reservados >= self.max_bytes:
+            return self._no_limite()
+        return None
+
+    def _no_limite(self) -> str:
+        # chamar com self._lock
+        if not self._avisou_limite:
+            self._avisou_limite = True
+            print(f"⚠️ Debug: limite da execução atingido ({self._arquivos} arquivos, "
+                  f"{(self.bytes + self._reservados) / 1e6:.0f} MB); próximas capturas só contadas")
+        return "limite"
+
+    def _reservar(self, item: dict) -> str | None:
+        # chamar com self._lock; separa arquivos/bytes do item antes de enfileirar (HTML: o tamanho cru,
+        # teto para o .gz). None = cabe; senão o motivo do pulo
+        arquivos = _arquivos_do_item(item)
+        estimado = len(item["jpeg"] or item["png"] or "") * 3 // 4 + len((item["html"] or "").encode("utf-8"))
+        if (self._arquivos + arquivos > self.max_arquivos
+                or self.bytes + self._reservados + estimado > self.max_bytes):
+            return self._no_limite()
+        self._arquivos += arquivos
+        self._reservados += estimado
+        item["reserva"] = estimado
+        return None
+
+    def _liberar(self, item: dict):
+        # chamar com self._lock; devolve a reserva do item e os arquivos que não chegaram ao disco
+        self._reservados -= item.pop("reserva", 0)
+        self._arquivos -= _arquivos_do_item(item) - item.get("gravados", 0)
+
+    def capturar(self, driver, nome: str, codigo: str | None = None, etapa: str | None = None,
+                 html: bool = False, forcar: bool = False):
+        """
+        Screenshot (e o HTML se `html`) para a fila. `forcar` ignora a amostragem (não os limites).
+        """
+        t0 = time.perf_counter()
+        tipo = tipo_do_nome(nome, codigo)
+        with self._lock:
+            motivo = self._decidir(tipo, forcar)
+            if motivo:
+                self.stats[f"pulado_{motivo}"] += 1
+                return
+            if not self._iniciado:
+                self._iniciar()
+
+        item = {"nome": os.path.splitext(nome)[0], "tipo": tipo, "codigo": codigo, "etapa": etapa,
+                "em": time.time(), "jpeg": None, "png": None, "html": None}
+        try:
+            item["jpeg"] = driver.execute_cdp_cmd(
+                "Page.captureScreenshot", {"format": "jpeg", "quality": self.qualidade_jpeg}
+            )["data"]
+        except Exception:
+            try:
+                item["png"] = driver.get_screenshot_as_base64()
+            except Exception:
+                pass
+        if html:
+            try:
+                item["html"] = driver.page_source
+            except Exception:
+                pass
+
+        with self._lock:
+            motivo = self._reservar(item)
+            if motivo:
+                self.stats[f"pulado_{motivo}"] += 1
+        if not motivo:
+            try:
+                self._fila.put_nowait(item)
+            except queue.Full:
+                with self._lock:
+                    self._liberar(item)
+                    self.stats["descartado_fila_cheia"] += 1
+        with self._lock:
+            self.ms_captura.append((time.perf_counter() - t0) * 1000)
+
+    def _rodar(self):
+        indice = open(os.path.join(self.pasta, "indice.jsonl"), "a", encoding="utf-8")
+        try:
+            while True:
+                item = self._fila.get()
+                if item is None:
+                    return
+                try:
+                    for linha in self._gravar(item):
+                        indice.write(json.dumps(linha, ensure_ascii=False) + "\n")
+                    indice.flush()
+                except Exception as e:
+                    with self._lock:
+                        self.stats["erro_gravacao"] += 1
+                    print(f"⚠️ Debug: não consegui gravar {item['nome']}: {e}")
+                finally:
+                    with self._lock:
+                        self._liberar(item)
+        finally:
+            indice.close()
+
+    def _gravar(self, item: dict) -> list[dict]:
+        saidas = []
+        if item["jpeg"]:
+            saidas.append((".jpg", base64.b64decode(item["jpeg"])))
+        elif item["png"]:
+            saidas.append((".png", base64.b64decode(item["png"])))
+        if item["html"]:
+            saidas.append((".html.gz", gzip.compress(item["html"].encode("utf-8"), compresslevel=6)))
+
+        linhas = []
+        for ext, dados in saidas:
+            arquivo = f"{item['nome']}{ext}"
+            caminho = os.path.join(self.pasta, arquivo)
+            if os.path.exists(caminho):
+                arquivo = f"{item['nome']}_{int(item['em'] * 1000) % 100000}{ext}"
+                caminho = os.path.join(self.pasta, arquivo)
+            with open(caminho, "wb") as f:
+                f.write(dados)
+            with self._lock:
+                self.bytes += len(dados)
+                self.stats["gravado"] += 1
+                item["gravados"] = item.get("gravados", 0) + 1
+            linhas.append({
+                "arquivo": arquivo, "tipo": item["tipo"], "codigo": item["codigo"], "etapa": item["etapa"],
+                "em": datetime.fromtimestamp(item["em"]).isoformat(timespec="seconds"), "bytes": len(dados),
+            })
+        return linhas
+
+    def fechar(self):
+        if self._iniciado:
+            self._fila.put(None)
+            self._thread.join()
+        if not (self.stats or self.ms_captura):
+            return
+        p95 = percentil(self.ms_captura, 95)
+        puladas = self.stats["pulado_amostragem"] + self.stats["pulado_limite"]
+        print(f"\n🖼 Debug: {self.stats['gravado']} arquivos ({self.bytes / 1e6:.1f} MB) em {self.pasta} | "
+              f"{puladas} capturas puladas ({dict(self.vistos)}) | captura no loop p95 {p95:.0f} ms")
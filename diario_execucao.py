@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+import time
+
+# =====================================================
+# DIÁRIO DE EXECUÇÃO (APPEND-ONLY, SQLITE WAL)
+# =====================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eventos (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    entrada       TEXT    NOT NULL DEFAULT '',
+    codigo        TEXT    NOT NULL,
+    status        TEXT    NOT NULL,
+    tentativas    INTEGER NOT NULL DEFAULT 0,
+    registrado_em REAL    NOT NULL
+);
+"""
+INDICE = "CREATE INDEX IF NOT EXISTS idx_eventos_entrada ON eventos (entrada, codigo)"
+
+
+class DiarioExecucao:
+    """
+    Cada resultado de pedido vira uma linha nova (nunca UPDATE/DELETE).
+    Com synchronous=FULL o commit só retorna depois do fsync, então um
+    crash do Python ou do Chrome não perde pedidos já registrados.
+    `entrada` (hash da planilha de entrada) vai em cada linha: reaplicar() só traz de volta os
+    eventos da mesma planilha, então o diário de um mês não marca pedidos de outro.
+    """
+
+    def __init__(self, caminho: str, entrada: str = ""):
+        self.caminho = caminho
+        self.entrada = entrada
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+        # diário de antes da coluna `entrada`: as linhas antigas ficam com '' e não são reaplicadas
+        if "entrada" not in {c[1] for c in self._conn.execute("PRAGMA table_info(eventos)")}:
+            self._conn.execute("ALTER TABLE eventos ADD COLUMN entrada TEXT NOT NULL DEFAULT ''")
+        self._conn.execute(INDICE)
+
+    def registrar(self, codigo: str, status: str, tentativas: int = 0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO eventos (entrada, codigo, status, tentativas, registrado_em) VALUES (?, ?, ?, ?, ?)",
+                (self.entrada, codigo, status, int(tentativas), time.time()),
+            )
+
+    def registrar_lote(self, eventos):
+        """
+        `eventos`: iterável de (codigo, status, tentativas). Tudo numa transação só (um fsync).
+        """
+        agora = time.time()
+        linhas = [(self.entrada, codigo, status, int(tentativas), agora) for codigo, status, tentativas in eventos]
+        if not linhas:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO eventos (entrada, codigo, status, tentativas, registrado_em) VALUES (?, ?, ?, ?, ?)",
+                    linhas,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def eventos(self):
+        # só os desta entrada, em ordem de gravação: o último evento de cada pedido é o que vale
+        with self._lock:
+            return self._conn.execute(
+                "SELECT codigo, status, tentativas, registrado_em FROM eventos WHERE entrada = ? ORDER BY id",
+                (self.entrada,),
+            ).fetchall()
+
+    def reaplicar(self, ledger) -> int:
+        """
+        Reaplica no LedgerStatus o diário desta entrada (retomada depois de um crash). Os pedidos
+        reaplicados ficam como alterados no ledger, para o próximo checkpoint gravá-los na planilha.
+        Retorna quantos eventos foram lidos.
+        """
+        eventos = self.eventos()
+        for codigo, status, tentativas, quando in eventos:
+            ledger.restaurar(codigo, status, tentativas, quando)
+        return len(eventos)
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
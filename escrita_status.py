@@ -0,0 +1,397 @@
+import html
+import os
+import posixpath
+import re
+import threading
+import time
+import zipfile
+
+import pandas as pd
+
+# =====================================================
+# ESCRITA DO STATUS NA CÓPIA DA PLANILHA (SÓ AS CÉLULAS ALTERADAS)
+# =====================================================
+
+RE_LINHA_QUALQUER = re.compile(r"<row\b[^>]*?(?:/>|>.*?</row>)", re.S)
+RE_LINHA = re.compile(r'<row\b[^>]*?\br="(\d+)"[^>]*?(?:/>|>.*?</row>)', re.S)
+RE_CELULA = re.compile(r"<c\b(?P<attrs>[^>]*?)(?:/>|>(?P<corpo>.*?)</c>)", re.S)
+RE_V = re.compile(r"<v>(.*?)</v>", re.S)
+RE_T = re.compile(r"<t\b[^>]*>(.*?)</t>", re.S)
+RE_SI = re.compile(r"<si>(.*?)</si>", re.S)
+RE_DIMENSAO = re.compile(r'(<dimension\b[^>]*\bref=")([^"]*)(")')
+RE_ABA = re.compile(r"<sheet\b[^>]*>")
+RE_REL = re.compile(r"<Relationship\b[^>]*>")
+
+
+class EstruturaInesperada(Exception):
+    pass
+
+
+_RE_ATTR: dict[str, re.Pattern] = {}
+
+
+def _attr(attrs: str, nome: str) -> str | None:
+    padrao = _RE_ATTR.get(nome)
+    if padrao is None:
+        padrao = _RE_ATTR[nome] = re.compile(rf'(?<![\w:]){nome}="([^"]*)"')
+    m = padrao.search(attrs)
+    return html.unescape(m.group(1)) if m else None
+
+
+def _col_idx(letras: str) -> int:
+    n = 0
+    for ch in letras:
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+def _col_letras(idx: int) -> str:
+    out = ""
+    while idx:
+        idx, r = divmod(idx - 1, 26)
+        out = chr(65 + r) + out
+    return out
+
+
+def _separar_ref(ref: str) -> tuple[str, int]:
+    m = re.match(r"([A-Z]+)(\d+)$", ref or "")
+    if not m:
+        raise EstruturaInesperada(f"referência de célula inesperada: {ref!r}")
+    return m.group(1), int(m.group(2))
+
+
+def _normalizar_codigo(texto: str | None, numerico: bool) -> str:
+    # célula numérica "2511000123.0" ou "2.511000123E9" -> "2511000123" (igual à leitura)
+    s = (texto or "").strip()
+    if numerico:
+        try:
+            f = float(s)
+            if f.is_integer():
+                return str(int(f))
+        except ValueError:
+            pass
+    return s
+
+
+def _valor(attrs: str, corpo: str | None, compartilhadas: list[str]) -> str:
+    if not corpo:
+        return ""
+    tipo = _attr(attrs, "t")
+    if tipo == "inlineStr":
+        return html.unescape("".join(RE_T.findall(corpo)))
+    m = RE_V.search(corpo)
+    if not m:
+        return ""
+    if tipo == "s":
+        return compartilhadas[int(m.group(1))]
+    return html.unescape(m.group(1))
+
+
+def _celula_texto(ref: str, estilo: str | None, texto: str) -> str:
+    s = f' s="{estilo}"' if estilo else ""
+    return f'<c r="{ref}"{s} t="inlineStr"><is><t>{html.escape(texto, quote=False)}</t></is></c>'
+
+
+def _gravar_na_linha(linha: str, numero: int, letra: str, texto: str) -> str:
+    # troca a célula da coluna (mantendo o estilo) ou insere na posição certa
+    ref = f"{letra}{numero}"
+    alvo = _col_idx(letra)
+    for m in RE_CELULA.finditer(linha):
+        r = _attr(m.group("attrs"), "r")
+        if r is None:
+            raise EstruturaInesperada("célula sem atributo r")
+        idx = _col_idx(_separar_ref(r)[0])
+        if idx == alvo:
+            nova = _celula_texto(ref, _attr(m.group("attrs"), "s"), texto)
+            return linha[:m.start()] + nova + linha[m.end():]
+        if idx > alvo:
+            return linha[:m.start()] + _celula_texto(ref, None, texto) + linha[m.start():]
+
+    nova = _celula_texto(ref, None, texto)
+    if linha.endswith("/>"):
+        return linha[:-2] + ">" + nova + "</row>"
+    return linha[:-len("</row>")] + nova + "</row>"
+
+
+def patch_planilha(xml: str, compartilhadas: list[str], coluna_codigo: str, coluna_status: str,
+                   valores: dict[str, str]) -> tuple[str, int] | None:
+    """
+    Reescreve o XML de uma aba gravando `valores` (código -> status) na coluna de status.
+    Retorna (xml, células gravadas), ou None se a aba não tem a coluna do código no cabeçalho.
+    """
+    m_cab = RE_LINHA_QUALQUER.search(xml)
+    if not m_cab:
+        return None
+    cab = m_cab.group(0)
+    numero_cab = _attr(cab[:cab.index(">") + 1], "r")
+    celulas = {}
+    for c in RE_CELULA.finditer(cab):
+        r = _attr(c.group("attrs"), "r")
+        if r is None or numero_cab is None:
+            raise EstruturaInesperada("cabeçalho sem atributo r")
+        celulas[_separar_ref(r)[0]] = _valor(c.group("attrs"), c.group("corpo"), compartilhadas).strip()
+    nomes = {v: letra for letra, v in celulas.items()}
+    cod = nomes.get(coluna_codigo)
+    if cod is None:
+        return None
+
+    status = nomes.get(coluna_status)
+    nova_coluna = status is None
+    if nova_coluna:
+        status = _col_letras(max(_col_idx(l) for l in celulas) + 1)
+        cab = _gravar_na_linha(cab, int(numero_cab), status, coluna_status)
+
+    # ✅ uma varredura em C só pelas células da coluna do código; linha em Python só para quem muda.
+    # Excel/openpyxl escrevem r como primeiro atributo; se não for o caso, usa o padrão genérico (mais lento).
+    re_cod = re.compile(rf'<c r="{cod}(\d+)"(?P<attrs>[^>]*?)(?:/>|>(?P<corpo>.*?)</c>)', re.S)
+    if not re_cod.search(xml, m_cab.end()):
+        re_cod = re.compile(rf'<c\b(?=[^>]*?\br="{cod}(\d+)")(?P<attrs>[^>]*?)(?:/>|>(?P<corpo>.*?)</c>)', re.S)
+    alvo: dict[int, str] = {}
+    achadas = 0
+    for m in re_cod.finditer(xml, m_cab.end()):
+        achadas += 1
+        a = m.group("attrs")
+        codigo = _normalizar_codigo(_valor(a, m.group("corpo"), compartilhadas), _attr(a, "t") in (None, "n"))
+        texto = valores.get(codigo)
+        if texto is not None:
+            alvo[int(m.group(1))] = texto
+    if not achadas and RE_LINHA_QUALQUER.search(xml, m_cab.end()):
+        raise EstruturaInesperada("células da coluna do código sem atributo r")
+
+    partes = [xml[:m_cab.start()], cab]
+    pos = m_cab.end()
+    if alvo:
+        for m in RE_LINHA.finditer(xml, pos):
+            numero = int(m.group(1))
+            if numero in alvo:
+                partes += [xml[pos:m.start()], _gravar_na_linha(m.group(0), numero, status, alvo[numero])]
+                pos = m.end()
+    partes.append(xml[pos:])
+    novo = "".join(partes)
+
+    if nova_coluna:
+        def dimensao(m):
+            ini, _, fim = m.group(2).partition(":")
+            fim_col, fim_lin = _separar_ref(fim or ini)
+            fim_col = _col_letras(max(_col_idx(fim_col), _col_idx(status)))
+            return f"{m.group(1)}{ini}:{fim_col}{fim_lin}{m.group(3)}"
+        try:
+            novo = RE_DIMENSAO.sub(dimensao, novo, count=1)
+        except EstruturaInesperada:
+            pass
+    return novo, len(alvo)
+
+
+def _abas_do_pacote(z: zipfile.ZipFile, aba) -> list[str]:
+    # caminhos (dentro do zip) das abas escolhidas, na ordem do workbook.xml
+    wb = z.read("xl/workbook.xml").decode("utf-8")
+    rels = z.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+    alvos = {}
+    for m in RE_REL.finditer(rels):
+        alvo = _attr(m.group(0), "Target") or ""
+        alvos[_attr(m.group(0), "Id")] = alvo.lstrip("/") if alvo.startswith("/") else posixpath.normpath(
+            posixpath.join("xl", alvo)
+        )
+
+    abas = []
+    for m in RE_ABA.finditer(wb):
+        nome = _attr(m.group(0), "name")
+        rid = re.search(r'\b[\w]+:id="([^"]*)"', m.group(0))
+        if rid and rid.group(1) in alvos:
+            abas.append((nome, alvos[rid.group(1)]))
+    if not abas:
+        raise EstruturaInesperada("workbook.xml sem abas")
+
+    if aba == "*":
+        return [p for _, p in abas]
+    if aba is None:
+        return [abas[0][1]]
+    for nome, p in abas:
+        if nome == aba:
+            return [p]
+    raise EstruturaInesperada(f"aba {aba!r} não encontrada")
+
+
+def _compartilhadas(z: zipfile.ZipFile) -> list[str]:
+    try:
+        xml = z.read("xl/sharedStrings.xml").decode("utf-8")
+    except KeyError:
+        return []
+    return [html.unescape("".join(RE_T.findall(si))) for si in RE_SI.findall(xml)]
+
+
+def gravar_copia_xlsx(origem: str, destino: str, coluna_codigo: str, coluna_status: str,
+                      valores: dict[str, str], aba=None, _cache: dict | None = None) -> int:
+    """
+    Copia `origem` para `destino` trocando só as células de status dos códigos em `valores`.
+    Todas as outras partes do arquivo (estilos, fórmulas, outras abas) vão byte a byte.
+    Grava num .tmp e troca com os.replace (nunca deixa o destino pela metade).
+    """
+    cache = _cache if _cache is not None else {}
+    base, ext = os.path.splitext(destino)
+    tmp = f"{base}.tmp{ext}"
+    gravadas = 0
+
+    with zipfile.ZipFile(origem) as zin:
+        if "abas" not in cache:
+            cache["abas"] = _abas_do_pacote(zin, aba)
+            cache["compartilhadas"] = _compartilhadas(zin)
+        abas = set(cache["abas"])
+
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zout:
+            achou = False
+            for item in zin.infolist():
+                dados = zin.read(item)
+                if item.filename in abas:
+                    r = patch_planilha(dados.decode("utf-8"), cache["compartilhadas"],
+                                       coluna_codigo, coluna_status, valores)
+                    if r is not None:
+                        achou = True
+                        dados = r[0].encode("utf-8")
+                        gravadas += r[1]
+                zout.writestr(item, dados)
+
+    if not achou:
+        os.remove(tmp)
+        raise EstruturaInesperada(f"coluna '{coluna_codigo}' não encontrada no cabeçalho das abas")
+    os.replace(tmp, destino)
+    return gravadas
+
+
+def _separador_csv(caminho: str) -> str:
+    with open(caminho, "r", encoding="utf-8-sig", errors="ignore") as f:
+        primeira = f.readline()
+    return ";" if primeira.count(";") > primeira.count(",") else ","
+
+
+def _texto_codigo(v) -> str:
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return "" if v is None or (isinstance(v, float) and pd.isna(v)) else str(v).strip()
+
+
+class EscritorStatus:
+    """
+    Grava o status numa thread própria: o loop só chama agendar() com o que mudou.
+    .xlsx/.xlsm: cópia da planilha original com só as células de status trocadas.
+    .csv/.parquet (ou .xlsx que o patch não entende): a origem é lida inteira uma vez (todas as
+    colunas e abas) e regravada com a coluna de status atualizada; .csv/.parquet saem no mesmo formato.
+    Checkpoints que chegam enquanto uma gravação roda são juntados numa só.
+    """
+
+    def __init__(self, origem: str, destino: str, coluna_codigo: str, coluna_status: str, aba=None):
+        ext = os.path.splitext(origem)[1].lower()
+        self.modo = "celulas" if ext in (".xlsx", ".xlsm") else "tabela"
+        if ext in (".xlsm", ".csv", ".parquet") and not destino.lower().endswith(ext):
+            # macros exigem .xlsm; csv/parquet: a cópia fica no formato da entrada
+            destino = os.path.splitext(destino)[0] + ext
+        self.origem = origem
+        self.destino = destino
+        self.coluna_codigo = coluna_codigo
+        self.coluna_status = coluna_status
+        self.aba = aba
+        self._tabelas: dict | None = None   # aba -> DataFrame completo da origem (modo tabela)
+        self._cache: dict = {}
+        self._valores: dict[str, str] = {}
+        self._pendente = False
+        self._parar = False
+        self._cond = threading.Condition()
+        self.gravacoes = 0
+        self.duracoes: list[float] = []
+        self.erro: Exception | None = None
+        self._thread = threading.Thread(target=self._rodar, name="escritor_status", daemon=True)
+        self._thread.start()
+
+    def agendar(self, alterados: dict[str, str]):
+        if not alterados:
+            return
+        with self._cond:
+            self._valores.update(alterados)
+            self._pendente = True
+            self._cond.notify()
+
+    def fechar(self, timeout: float | None = None):
+        with self._cond:
+            self._parar = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self.duracoes:
+            print(f"\n💾 Planilha: {self.gravacoes} gravações ({self.modo}), "
+                  f"média {sum(self.duracoes) / len(self.duracoes):.2f}s, última {self.duracoes[-1]:.2f}s")
+        if self.erro:
+            print(f"⚠️ Última gravação da planilha falhou: {self.erro}")
+
+    def _rodar(self):
+        while True:
+            with self._cond:
+                while not self._pendente and not self._parar:
+                    self._cond.wait()
+                if not self._pendente:
+                    return
+                valores = dict(self._valores)
+                self._pendente = False
+            self._gravar(valores)
+
+    def _gravar(self, valores: dict[str, str]):
+        t0 = time.perf_counter()
+        try:
+            if self.modo == "celulas":
+                try:
+                    gravar_copia_xlsx(self.origem, self.destino, self.coluna_codigo, self.coluna_status,
+                                      valores, self.aba, self._cache)
+                except (EstruturaInesperada, KeyError, zipfile.BadZipFile, UnicodeDecodeError) as e:
+                    print(f"\n⚠️ Não deu para gravar só as células ({e}); gravando a tabela inteira.")
+                    self.modo = "tabela"
+            if self.modo == "tabela":
+                self._gravar_tabela(valores)
+            self.gravacoes += 1
+            self.erro = None
+        except Exception as e:
+            self.erro = e
+            print(f"\n⚠️ Falha ao gravar {self.destino}: {e}")
+        self.duracoes.append(time.perf_counter() - t0)
+
+    def _ler_tabelas(self) -> dict:
+        # origem inteira, sem perder coluna nenhuma; texto do CSV fica texto (nada é reinterpretado)
+        ext = os.path.splitext(self.origem)[1].lower()
+        if ext == ".csv":
+            return {None: pd.read_csv(self.origem, sep=_separador_csv(self.origem), dtype=str,
+                                      keep_default_na=False, encoding="utf-8-sig")}
+        if ext == ".parquet":
+            return {None: pd.read_parquet(self.origem)}
+        return pd.read_excel(self.origem, sheet_name=None, dtype=object)
+
+    def _abas_com_status(self) -> list:
+        nomes = list(self._tabelas)
+        if self.aba == "*":
+            return [n for n in nomes if self.coluna_codigo in self._tabelas[n].columns]
+        if self.aba is None or self.aba not in self._tabelas:
+            return nomes[:1]
+        return [self.aba]
+
+    def _gravar_tabela(self, valores: dict[str, str]):
+        if self._tabelas is None:
+            self._tabelas = self._ler_tabelas()
+        for nome in self._abas_com_status():
+            df = self._tabelas[nome]
+            if self.coluna_codigo not in df.columns:
+                raise EstruturaInesperada(f"coluna '{self.coluna_codigo}' não encontrada na aba '{nome}'")
+            if self.coluna_status not in df.columns:
+                df[self.coluna_status] = ""
+            df[self.coluna_status] = df[self.coluna_status].astype(object)
+            codigos = df[self.coluna_codigo].map(_texto_codigo)
+            mask = codigos.isin(valores.keys())
+            df.loc[mask, self.coluna_status] = codigos[mask].map(valores)
+
+        base, ext = os.path.splitext(self.destino)
+        ext = ext.lower() or ".xlsx"
+        tmp = f"{base}.tmp{ext}"
+        if ext == ".csv":
+            next(iter(self._tabelas.values())).to_csv(tmp, index=False, encoding="utf-8-sig")
+        elif ext == ".parquet":
+            next(iter(self._tabelas.values())).to_parquet(tmp, index=False)
+        else:
+            with pd.ExcelWriter(tmp) as w:
+                for nome, df in self._tabelas.items():
+                    df.to_excel(w, sheet_name=nome or "Sheet1", index=False)
+        os.replace(tmp, self.destino)
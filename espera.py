@@ -0,0 +1,170 @@
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
+
+from selenium.common.exceptions import (
+    UnexpectedAlertPresentException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from metricas import percentil
+
+# =====================================================
+# MOTOR DE ESPERA (EVENTOS DA PÁGINA EM VEZ DE SLEEP FIXO)
+# =====================================================
+
+# Roda dentro do navegador numa única chamada: só devolve quando a página
+# está "pronta" (sem XHR/fetch pendente, jQuery.active == 0, DOM parado há
+# `silencioMs` e, se informado, o alvo visível e habilitado) ou quando estoura o limite.
+JS_AGUARDAR = """
+const [by, sel, silencioMs, limiteMs, done] = arguments;
+const t0 = performance.now();
+
+if (!window.__olistRede) {
+    const rede = window.__olistRede = { pendentes: 0 };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        rede.pendentes++;
+        this.addEventListener('loadend', () => { rede.pendentes--; }, { once: true });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const f = window.fetch;
+        window.fetch = function () {
+            rede.pendentes++;
+            return f.apply(this, arguments).finally(() => { rede.pendentes--; });
+        };
+    }
+}
+
+function acharAlvo() {
+    if (!sel) return true;
+    let el = null;
+    if (by === 'id') el = document.getElementById(sel);
+    else if (by === 'xpath') el = document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    else el = document.querySelector(sel);
+    if (!el || el.disabled) return false;
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+
+let ultimaMutacao = performance.now();
+const obs = new MutationObserver(() => { ultimaMutacao = performance.now(); });
+obs.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+
+function fim(ok) {
+    obs.disconnect();
+    done({ ok: ok, ms: performance.now() - t0 });
+}
+
+function checar() {
+    const agora = performance.now();
+    const pronto = document.readyState !== 'loading'
+        && window.__olistRede.pendentes <= 0
+        && !(window.jQuery && window.jQuery.active > 0)
+        && agora - ultimaMutacao >= silencioMs
+        && acharAlvo();
+    if (pronto) return fim(true);
+    if (agora - t0 >= limiteMs) return fim(false);
+    setTimeout(checar, 25);
+}
+checar();
+"""
+
+
+class MotorEspera:
+    """
+    Espera por condição real da página, com teto por etapa, e guarda quanto
+    cada espera levou (ver resumo()).
+    """
+
+    def __init__(self, limites: dict[str, float], limite_padrao: float = 10, silencio_ms: int = 150):
+        self.limites = limites
+        self.limite_padrao = limite_padrao
+        self.silencio_ms = silencio_ms
+        self.tempos: dict[str, list[float]] = defaultdict(list)
+        self.estouros: Counter = Counter()
+        # por objeto driver (fraco): driver reciclado some daqui, e um novo nunca herda o estado
+        # de outro que calhou de ter o mesmo id()
+        self._alertas: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._configurados: weakref.WeakSet = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _configurar(self, driver):
+        if driver in self._configurados:
+            return
+        teto = max([self.limite_padrao, *self.limites.values()]) + 5
+        driver.set_script_timeout(teto)
+        self._configurados.add(driver)
+
+    def aguardar(self, driver, etapa: str, alvo: tuple[str, str] | None = None,
+                 silencio_ms: int | None = None) -> bool:
+        """
+        alvo = (By.ID / By.CSS_SELECTOR / By.XPATH, seletor). Retorna False se estourou o teto.
+        """
+        limite = self.limites.get(etapa, self.limite_padrao)
+        silencio = self.silencio_ms if silencio_ms is None else silencio_ms
+        by, sel = alvo if alvo else (None, None)
+        if by == "css selector":
+            by = "css"
+
+        t0 = time.perf_counter()
+        ok = False
+        self._configurar(driver)
+
+        while True:
+            resta = limite - (time.perf_counter() - t0)
+            if resta <= 0:
+                break
+            try:
+                r = driver.execute_async_script(JS_AGUARDAR, by, sel, silencio, int(resta * 1000))
+                ok = bool(r and r.get("ok"))
+                break
+            except UnexpectedAlertPresentException as e:
+                # o alerta já foi aceito pelo chromedriver; guarda o texto para fechar_alerta_se_existir
+                with self._lock:
+                    self._alertas[driver] = e.alert_text or ""
+                ok = True
+                break
+            except TimeoutException:
+                break
+            except WebDriverException:
+                # navegação em andamento (documento descarregado): tenta de novo na página nova
+                time.sleep(0.05)
+
+        with self._lock:
+            self.tempos[etapa].append(time.perf_counter() - t0)
+            if not ok:
+                self.estouros[etapa] += 1
+        return ok
+
+    def consumir_alerta(self, driver) -> str | None:
+        with self._lock:
+            return self._alertas.pop(driver, None)
+
+    def resumo(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "etapa": etapa,
+                    "n": len(v),
+                    "media": sum(v) / len(v),
+                    "p50": percentil(v, 50),
+                    "p95": percentil(v, 95),
+                    "max": max(v),
+                    "estouros": self.estouros[etapa],
+                }
+                for etapa, v in self.tempos.items() if v
+            ]
+
+    def imprimir_resumo(self):
+        linhas = self.resumo()
+        if not linhas:
+            return
+        print("\n⏱ Esperas por etapa (s):")
+        print(f"   {'etapa':<22} {'n':>7} {'média':>7} {'p50':>7} {'p95':>7} {'máx':>7} {'teto':>6}")
+        for r in linhas:
+            print(f"   {r['etapa']:<22} {r['n']:>7} {r['media']:>7.2f} {r['p50']:>7.2f} "
+                  f"{r['p95']:>7.2f} {r['max']:>7.2f} {r['estouros']:>6}")
@@ -0,0 +1,209 @@
+import heapq
+import random
+import threading
+import time
+from collections import Counter, deque
+
+# =====================================================
+# RETENTATIVAS ADIADAS + DISJUNTOR DE LENTIDÃO DO ERP
+# =====================================================
+
+
+class FilaRetentativas:
+    """
+    Pedidos que falharam (TIMEOUT/ERRO) saem do loop principal e voltam depois da passada,
+    com espera exponencial: base, base*fator, base*fator²... até `teto` (± `jitter`).
+    Cada pedido volta no máximo `max_rodadas` vezes; depois disso fica com o último status.
+    """
+
+    def __init__(self, base: float = 20.0, fator: float = 2.0, teto: float = 300.0, max_rodadas: int = 3,
+                 jitter: float = 0.2, semente=None):
+        self.base = base
+        self.fator = fator
+        self.teto = teto
+        self.max_rodadas = max_rodadas
+        self.jitter = jitter
+        self.rng = random.Random(semente)
+        self.rodadas: Counter = Counter()
+        self.adiados: Counter = Counter()
+        self.esgotados: dict[str, str] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+    def __contains__(self, codigo: str) -> bool:
+        with self._lock:
+            return any(item[2] == codigo for item in self._heap)
+
+    def espera(self, rodada: int) -> float:
+        s = min(self.base * self.fator ** (rodada - 1), self.teto)
+        return s * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def adiar(self, codigo: str, status: str) -> bool:
+        """False se o pedido já esgotou as rodadas (não volta mais)."""
+        with self._lock:
+            rodada = self.rodadas[codigo] + 1
+            if rodada > self.max_rodadas:
+                self.esgotados[codigo] = status
+                return False
+            self.rodadas[codigo] = rodada
+            self.adiados[status] += 1
+            self._seq += 1
+            heapq.heappush(self._heap, (time.monotonic() + self.espera(rodada), self._seq, codigo))
+            return True
+
+    def proximo(self) -> str | None:
+        """
+        Tira o pedido com a volta mais cedo, dormindo até a hora dele. None quando a fila acabou.
+        """
+        while True:
+            with self._lock:
+                if not self._heap:
+                    return None
+                quando, _, codigo = self._heap[0]
+                falta = quando - time.monotonic()
+                if falta <= 0:
+                    heapq.heappop(self._heap)
+                    return codigo
+            time.sleep(min(falta, 5))
+
+    def codigos(self) -> list[str]:
+        with self._lock:
+            return [codigo for _, _, codigo in sorted(self._heap)]
+
+    def descartar(self, codigos):
+        # tira da fila quem já se resolveu (ex.: reconciliação achou baixado no ERP)
+        fora = set(codigos)
+        if not fora:
+            return
+        with self._lock:
+            self._heap = [item for item in self._heap if item[2] not in fora]
+            heapq.heapify(self._heap)
+
+    def rodada(self):
+        """
+        Os pedidos que estão na fila agora, na ordem da volta (dorme até a hora de cada um).
+        O que for adiado de novo durante a rodada fica para a próxima.
+        """
+        with self._lock:
+            n = len(self._heap)
+        for _ in range(n):
+            codigo = self.proximo()
+            if codigo is None:
+                return
+            yield codigo
+
+    def imprimir_resumo(self):
+        if not self.rodadas:
+            return
+        print(f"\n🔁 Retentativas: {len(self.rodadas)} pedidos adiados ({dict(self.adiados)}), "
+              f"{len(self.esgotados)} esgotaram {self.max_rodadas} rodadas")
+
+
+class DisjuntorLentidao:
+    """
+    Circuit breaker da lentidão do ERP. Olha as últimas `janela` tentativas: se a fração de
+    timeouts chega a `limite` (com pelo menos `minimo` amostras), abre e todo mundo pausa
+    `pausa` segundos antes do próximo pedido, em vez de gastar um timeout cheio por pedido.
+    Depois da pausa fica meio-aberto: passa um pedido de teste; deu certo, fecha; deu timeout,
+    reabre com a pausa dobrada (até `pausa_max`). Teste que terminou sem veredito (re-login,
+    alerta, status que não conta) devolve a vez com `liberar_sonda()`; se ninguém devolver,
+    a vez expira em `sonda_max` segundos e outro pedido vira o teste.
+    """
+
+    def __init__(self, janela: int = 20, limite: float = 0.5, minimo: int = 8,
+                 pausa: float = 60.0, pausa_max: float = 600.0, sonda_max: float = 300.0):
+        self.limite = limite
+        self.minimo = minimo
+        self.pausa = pausa
+        self.pausa_max = pausa_max
+        self.sonda_max = sonda_max
+        self.estado = "fechado"
+        self.aberturas = 0
+        self.segundos_pausado = 0.0
+        self._janela: deque[bool] = deque(maxlen=janela)
+        self._pausa_atual = pausa
+        self._ate = 0.0
+        self._sonda_em_voo = False
+        self._sonda_dona = None      # thread que está com o pedido de teste
+        self._sonda_desde = 0.0
+        self._lock = threading.Lock()
+
+    def _abrir(self, motivo: str):
+        # chamar com self._lock
+        self.estado = "aberto"
+        self.aberturas += 1
+        self._ate = time.monotonic() + self._pausa_atual
+        print(f"\n🔴 ERP lento ({motivo}): pausando {self._pausa_atual:.0f}s antes do próximo pedido")
+
+    def registrar(self, lento: bool):
+        with self._lock:
+            self._janela.append(lento)
+            if self.estado == "meio_aberto":
+                self._sonda_em_voo = False
+                self._sonda_dona = None
+                if lento:
+                    self._pausa_atual = min(self._pausa_atual * 2, self.pausa_max)
+                    self._abrir("pedido de teste também deu timeout")
+                else:
+                    self.estado = "fechado"
+                    self._pausa_atual = self.pausa
+                    self._janela.clear()
+                    print("🟢 ERP voltou a responder: seguindo no ritmo normal")
+                return
+            if self.estado == "fechado" and len(self._janela) >= self.minimo:
+                taxa = sum(self._janela) / len(self._janela)
+                if taxa >= self.limite:
+                    self._abrir(f"{taxa:.0%} de timeout nas últimas {len(self._janela)} tentativas")
+
+    def aguardar(self) -> float:
+        """Chamar antes de cada tentativa. Devolve quantos segundos ficou parado."""
+        parado = 0.0
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                if self.estado == "fechado":
+                    break
+                if self.estado == "aberto" and agora >= self._ate:
+                    self.estado = "meio_aberto"
+                    self._pegar_sonda(agora)
+                    print("🟡 Pausa encerrada: mandando um pedido de teste")
+                    break
+                if self.estado == "meio_aberto" and self._sonda_em_voo and agora - self._sonda_desde >= self.sonda_max:
+                    print(f"🟡 Pedido de teste sem resposta há {self.sonda_max:.0f}s: mandando outro")
+                    self._sonda_em_voo = False
+                if self.estado == "meio_aberto" and not self._sonda_em_voo:
+                    self._pegar_sonda(agora)
+                    break
+                dormir = max(self._ate - agora, 0.05) if self.estado == "aberto" else 0.5
+            dormir = min(dormir, 5)
+            time.sleep(dormir)
+            parado += dormir
+        if parado:
+            with self._lock:
+                self.segundos_pausado += parado
+        return parado
+
+    def _pegar_sonda(self, agora: float):
+        # chamar com self._lock
+        self._sonda_em_voo = True
+        self._sonda_dona = threading.get_ident()
+        self._sonda_desde = agora
+
+    def liberar_sonda(self):
+        """
+        Chamar depois de toda tentativa (no finally). Se esta thread estava com o pedido de teste
+        e ele não chegou a `registrar()`, a vez volta e o próximo pedido vira o teste.
+        """
+        with self._lock:
+            if self._sonda_em_voo and self._sonda_dona == threading.get_ident():
+                self._sonda_em_voo = False
+                self._sonda_dona = None
+
+    def imprimir_resumo(self):
+        if self.aberturas:
+            print(f"\n🔴 Disjuntor de lentidão: abriu {self.aberturas}x, {self.segundos_pausado:.0f}s pausado no total")
@@ -1,6 +1,11 @@
+import ast
 import os
+import queue
 import shutil
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime
 
@@ -13,15 +18,48 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import (
     UnexpectedAlertPresentException,
     NoAlertPresentException,
+    StaleElementReferenceException,
     TimeoutException
 )
 
+from backend_http import ClienteBorderoHTTP, id_conta_da_url, sessao_do_driver
+from debug_artefatos import GravadorDebug
+from diario_execucao import DiarioExecucao
+from escrita_status import EscritorStatus
+from espera import MotorEspera
+from fila_retentativas import DisjuntorLentidao, FilaRetentativas
+from indice_listagem import JS_COLUNAS_PELO_TITULO, IndiceListagem, ler_linhas
+from indice_listagem import SITUACOES_BAIXADO as SITUACOES_BAIXADO_PADRAO
+from leitura_entrada import hash_arquivo, ler_entrada
+from ledger_status import LedgerStatus
+from metricas import Medidor
+from navegador_enxuto import MedidorRede, aplicar_bloqueio, configurar_opcoes
+from pipeline_abas import PipelineAbas
+from perfil_chrome import clonar_perfil_incremental, clonar_workers
+from seletores import CacheSeletores
+from preprocessamento import agregar_por_pedido, preprocessar
+from reciclagem_navegador import ReciclagemNavegador
+from reconciliacao import STATUS_AMBIGUOS, conciliar, intervalo_datas, pedidos_ambiguos, relatorio_discrepancias
+from relogin import JS_TELA_LOGIN, RecuperadorSessao, VigiaSessao
+from validacao_previa import resumo_rejeicoes, validar_pedidos
+from valores_br import centavos
+
 # =====================================================
 # CONFIG
 # =====================================================
 
-ARQUIVO_ENTRADA = "_GESTAO_FINANCEIRA_SHOPEE_NOV.2025.xlsx"
-ARQUIVO_SAIDA = "resultado_olist.xlsx"
+def _cfg(nome: str, padrao):
+    # OLIST_<NOME> no ambiente sobrescreve a constante (usado pelo mock/benchmark)
+    bruto = os.environ.get(f"OLIST_{nome}")
+    if bruto is None:
+        return padrao
+    if padrao is None or isinstance(padrao, str):
+        return bruto
+    return type(padrao)(ast.literal_eval(bruto))
+
+ARQUIVO_ENTRADA = _cfg("ARQUIVO_ENTRADA", "_GESTAO_FINANCEIRA_SHOPEE_NOV.2025.xlsx")
+ARQUIVO_SAIDA = _cfg("ARQUIVO_SAIDA", "resultado_olist.xlsx")   # cópia da entrada com a coluna BAIXADO preenchida
+ARQUIVO_DIARIO = _cfg("ARQUIVO_DIARIO", "diario_olist.sqlite")   # ✅ cada resultado gravado na hora (retomada após crash)
 
 COLUNA_CODIGO = "ID do pedido"
 COLUNA_DATA = "Data"
@@ -30,14 +68,52 @@ COLUNA_FRETE_COBRADO = "Frete cobrado do comprador"
 COLUNA_VALOR_LIQUIDO = "VALOR LIQUIDO"
 COLUNA_VALIDACAO = "VALIDAÇÃO"   # coluna S
 COLUNA_STATUS = "BAIXADO"        # gravar "SIM"
+COLUNA_VALOR_BRUTO = _cfg("COLUNA_VALOR_BRUTO", "VALOR BRUTO")   # opcional: sem ela a conta bruto − taxas − frete não é refeita
 
-URL = "https://erp.olist.com/contas_receber"
+# Várias linhas com o mesmo ID (ajuste, reembolso parcial, frete em linha separada) viram um pedido só.
+# Regra por coluna: "soma", "max", "primeira" ou "ultima". Linhas idênticas caem antes de somar.
+# Datas diferentes, validação divergente ou líquido <= 0 no total = conflito (pedido pulado, vai para o CSV).
+REGRAS_AGREGACAO = {COLUNA_TOTAL_TAXAS: "soma", COLUNA_FRETE_COBRADO: "soma", COLUNA_VALOR_LIQUIDO: "soma",
+                    COLUNA_VALOR_BRUTO: "soma"}
+BLOQUEAR_CONFLITOS = _cfg("BLOQUEAR_CONFLITOS", True)
+ARQUIVO_CONFLITOS = _cfg("ARQUIVO_CONFLITOS", "conflitos_agregacao.csv")
 
-WAIT_TIMEOUT = 20
-SALVAR_A_CADA = 2000              # ✅checkpoint
-TENTATIVAS_POR_PEDIDO = 1
+# ✅ validação prévia, antes de abrir o Chrome: data, líquido > 0, nada negativo e
+# bruto − taxas − frete = líquido (± tolerância). Só os pedidos prontos para baixar vão para o loop;
+# os rejeitados vão para o CSV com o motivo e saem como PULADO_VALIDACAO, sem tocar no navegador.
+TOLERANCIA_CENTAVOS = _cfg("TOLERANCIA_CENTAVOS", 1)
+CONFIAR_VALIDACAO_PLANILHA = _cfg("CONFIAR_VALIDACAO_PLANILHA", True)   # VALIDAÇÃO != "ok" também rejeita
+ARQUIVO_REJEITADOS = _cfg("ARQUIVO_REJEITADOS", "rejeitados_validacao.csv")
+
+# Entrada: .xlsx/.xlsm, .csv ou .parquet; só as colunas acima são lidas
+ABA_ENTRADA = _cfg("ABA_ENTRADA", None)   # None = primeira aba; "*" = todas com COLUNA_CODIGO (uma por mês)
+PASTA_CACHE_ENTRADA = _cfg("PASTA_CACHE_ENTRADA", ".cache_entrada")   # ✅ parquet por hash do arquivo (precisa de pyarrow)
 
-PASTA_DEBUG = "debug"
+URL = _cfg("URL", "https://erp.olist.com/contas_receber")
+
+WAIT_TIMEOUT = 20
+SALVAR_A_CADA = 200               # ✅checkpoint (em segundo plano, só as células alteradas)
+TENTATIVAS_POR_PEDIDO = _cfg("TENTATIVAS_POR_PEDIDO", 1)
+N_WORKERS = _cfg("N_WORKERS", 1)     # ✅ >1 = vários Chrome em paralelo puxando de uma fila única
+ARQUIVO_THROUGHPUT = _cfg("ARQUIVO_THROUGHPUT", "throughput_workers.csv")
+# ✅ 2 abas no mesmo Chrome (só com 1 worker): abre a conta do próximo pedido enquanto o borderô salva
+PIPELINE_ABAS = _cfg("PIPELINE_ABAS", False)
+
+# ✅ TIMEOUT/ERRO não confirmam nem repetem no meio do loop: vão para uma fila rodada depois da
+# passada principal, com espera exponencial (base, base*fator, ... até teto) e no máx. N rodadas
+ADIAR_FALHAS = _cfg("ADIAR_FALHAS", True)
+RETENTATIVAS = {"base": 20, "fator": 2, "teto": 300, "max_rodadas": 3}
+# Disjuntor: muitos timeouts seguidos = ERP lento; pausa o robô em vez de gastar 35 s em cada pedido
+DISJUNTOR_LENTIDAO = {"janela": 20, "limite": 0.5, "minimo": 8, "pausa": 60, "pausa_max": 600}
+
+PASTA_DEBUG = _cfg("PASTA_DEBUG", "debug")
+# ✅ screenshots/HTML gravados em segundo plano, numa subpasta por execução com indice.jsonl.
+# Falha repetida do mesmo tipo é amostrada (as N primeiras, depois 1 a cada M) e há teto por execução.
+LIMITES_DEBUG = {"max_arquivos": 500, "max_mb": 200, "amostra_por_tipo": 5, "depois_a_cada": 50, "manter_execucoes": 10}
+
+# Métricas por etapa (uma linha JSONL por span) e, opcionalmente, textfile do Prometheus
+ARQUIVO_METRICAS = _cfg("ARQUIVO_METRICAS", "metricas_etapas.jsonl")
+ARQUIVO_PROMETHEUS = _cfg("ARQUIVO_PROMETHEUS", None)   # ex.: "/var/lib/node_exporter/textfile/olist_rpa.prom"
 
 # Busca
 SEARCH_INPUT_ID = "pesquisa-mini"
@@ -46,12 +122,112 @@ SEARCH_BUTTON_CSS = "span.input-group-btn > button.btn.btn-default"
 # Tabela
 RESULT_ROW_SELECTOR = "table tbody tr"
 NO_RESULTS_XPATH = "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'nenhum')]"
+# Colunas da listagem (título do <th>) e situações que contam como "já baixado" (texto exato da célula)
+TITULOS_LISTAGEM = (_cfg("COLUNA_PEDIDO_LISTAGEM", "Pedido"), _cfg("COLUNA_SITUACAO_LISTAGEM", "Situação"))
+SITUACOES_BAIXADO = _cfg("SITUACOES_BAIXADO", SITUACOES_BAIXADO_PADRAO)
+# Conta achada já baixada no ERP vira "JA_BAIXADO" na planilha (o robô não gravou nada); True = grava "SIM"
+JA_BAIXADO_COMO_SIM = _cfg("JA_BAIXADO_COMO_SIM", False)
+
+# Sonda da busca: uma chamada só devolve "nenhum", a linha do pedido e se ela já está baixada.
+# A linha casa pela célula do pedido exatamente igual ao código (sem cabeçalho: qualquer célula igual);
+# "baixado" só quando a célula de situação é uma de SITUACOES_BAIXADO. Nunca por substring.
+JS_SONDAR_BUSCA = JS_COLUNAS_PELO_TITULO + """
+const [codigo, situacoes, seletorLinhas, xpathNenhum, clicar, titulos] = arguments;
+const linhas = Array.from(document.querySelectorAll(seletorLinhas));
+const [iCodigo, iSituacao] = colunasPeloTitulo(linhas[0], titulos);
+const norm = s => (s || '').normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').trim().toLowerCase();
+const baixadas = situacoes.map(norm);
+for (let i = 0; i < linhas.length; i++) {
+    const tr = linhas[i];
+    const celulas = Array.from(tr.querySelectorAll('td')).map(td => (td.innerText || '').trim());
+    if (iCodigo >= 0 ? celulas[iCodigo] !== codigo : !celulas.includes(codigo)) continue;
+    const btn = tr.querySelector('button.button-navigate');
+    if (clicar && btn) btn.click();
+    const baixado = iSituacao >= 0 && baixadas.includes(norm(celulas[iSituacao]));
+    return { nenhum: false, indice: i, baixado: baixado, navegavel: !!btn };
+}
+const nenhum = !!document.evaluate(xpathNenhum, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return { nenhum: nenhum, indice: -1, baixado: false, navegavel: false };
+"""
+
+# Índice da listagem (pré-varredura das páginas de Contas a Receber)
+USAR_INDICE_LISTAGEM = _cfg("USAR_INDICE_LISTAGEM", True)
+ARQUIVO_INDICE = _cfg("ARQUIVO_INDICE", "indice_contas_receber.json")
+TTL_INDICE_HORAS = 12             # linhas "em aberto" mais velhas que isso são relidas
+MAX_PAGINAS_INDICE = 2000
+
+# Reconciliação: TIMEOUT/ERRO conferidos em lote na listagem (antes de cada rodada de retentativas e no fim).
+# URL_RECONCILIACAO: listagem já filtrada no ERP (ex.: situação "recebida" + período), com {data_ini}/{data_fim}
+# (dd/mm/aaaa) preenchidos com as datas dos pedidos. Com LISTAGEM_SO_BAIXADOS=True ela só mostra
+# contas recebidas, então quem não aparece está em aberto. Sem URL, lê a listagem normal.
+URL_RECONCILIACAO = _cfg("URL_RECONCILIACAO", None)
+LISTAGEM_SO_BAIXADOS = _cfg("LISTAGEM_SO_BAIXADOS", False)
+ARQUIVO_DISCREPANCIAS = _cfg("ARQUIVO_DISCREPANCIAS", "discrepancias_olist.csv")
 
 # Perfil Chrome
-CHROME_USER_DATA_ORIGINAL = r"C:\Users\DELL\AppData\Local\Google\Chrome\User Data"
+CHROME_USER_DATA_ORIGINAL = _cfg("CHROME_USER_DATA_ORIGINAL", r"C:\Users\DELL\AppData\Local\Google\Chrome\User Data")
 CHROME_PROFILE_ORIGINAL = "Default"
-CHROME_USER_DATA_CLONE = r"C:\olist_profile_selenium"
+CHROME_USER_DATA_CLONE = _cfg("CHROME_USER_DATA_CLONE", r"C:\olist_profile_selenium")
 CHROME_PROFILE_CLONE = "Default"
+CLONE_COMPLETO = False            # True = copia o perfil inteiro (jeito antigo, lento)
+CHROME_HEADLESS = _cfg("CHROME_HEADLESS", False)   # True = sem janela (Linux/servidor, benchmark no mock)
+
+# Navegador enxuto: headless, sem imagens, DNS só para os hosts permitidos e URLs bloqueadas via CDP.
+# Se algum formulário parar de funcionar, veja no DevTools (Network) qual host/arquivo ele precisa.
+MODO_ENXUTO = _cfg("MODO_ENXUTO", False)
+MEDIR_REDE = _cfg("MEDIR_REDE", False)   # req/KB por pedido e memória do Chrome, histórico por modo
+ARQUIVO_REDE = _cfg("ARQUIVO_REDE", "rede_por_modo.csv")
+BLOQUEIO_RECURSOS = {
+    "hosts_permitidos": [
+        "erp.olist.com", "*.olist.com", "*.tiny.com.br",
+        "code.jquery.com", "ajax.googleapis.com", "cdnjs.cloudflare.com", "cdn.jsdelivr.net",
+        "127.0.0.1", "localhost",
+    ],
+    "urls_bloqueadas": [
+        "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+        "*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*.mp4*", "*.webm*",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+        "*hotjar.com*", "*clarity.ms*", "*intercom.io*", "*zdassets.com*", "*hs-scripts.com*",
+    ],
+}
+
+# Reciclagem do Chrome: entre pedidos, se a memória do Chrome passa de max_mb (ou o heap JS de max_heap_mb,
+# quando não dá para ver o processo) ou a mediana do pedido passa de fator_lentidao x a do começo, abre uma
+# aba nova; a cada abas_por_driver reciclagens (ou se o Chrome caiu) reinicia o driver levando os cookies.
+# max_pedidos > 0 recicla a cada N pedidos de qualquer jeito.
+RECICLAR_NAVEGADOR = _cfg("RECICLAR_NAVEGADOR", True)
+RECICLAGEM = _cfg("RECICLAGEM", {
+    "max_mb": 2500, "max_heap_mb": 600, "fator_lentidao": 1.8, "janela": 30,
+    "amostrar_a_cada": 20, "min_pedidos": 100, "max_pedidos": 0, "abas_por_driver": 3,
+})
+
+# Re-login automático quando a sessão cai (no lugar do ENTER do operador).
+# Usuário/senha SÓ por variável de ambiente (OLIST_USUARIO / OLIST_SENHA), nunca aqui no código.
+# ARQUIVO_COOKIES: JSON de cookies exportado de um navegador logado (é relido quando muda).
+RELOGIN_AUTOMATICO = _cfg("RELOGIN_AUTOMATICO", True)
+URL_LOGIN = _cfg("URL_LOGIN", "https://erp.olist.com/login")
+USUARIO_OLIST = _cfg("USUARIO", "")
+SENHA_OLIST = _cfg("SENHA", "")
+ARQUIVO_COOKIES = _cfg("ARQUIVO_COOKIES", None)
+RELOGINS_POR_PEDIDO = 2           # pedido interrompido pela sessão volta sem gastar tentativa (até N vezes)
+LOGIN_SELECTORS = {
+    "usuario": [
+        (By.ID, "login"),
+        (By.NAME, "login"),
+        (By.ID, "username"),
+        (By.NAME, "username"),
+        (By.CSS_SELECTOR, "input[type='email']"),
+        (By.CSS_SELECTOR, "input[name*='email']"),
+    ],
+    "senha": [
+        (By.CSS_SELECTOR, "input[type='password']"),
+    ],
+    "entrar": [
+        (By.CSS_SELECTOR, "button[type='submit']"),
+        (By.CSS_SELECTOR, "input[type='submit']"),
+        (By.XPATH, "//button[contains(normalize-space(.),'Entrar') or contains(normalize-space(.),'Continuar')]"),
+    ],
+}
 
 # Selects do Olist
 CONTA_SHOPEE_VALUE = "737401193"
@@ -66,29 +242,68 @@ INPUT_VALOR_ID = "valor0"
 # Botão final
 BTN_SALVAR_BORDERO_ID = "salvarBordero"
 
+# ✅ preenche o borderô inteiro num execute_script e confere numa leitura só;
+# se a conferência falhar, cai para o preenchimento tecla a tecla
+PREENCHIMENTO_EM_LOTE = _cfg("PREENCHIMENTO_EM_LOTE", True)
+
+# Backend HTTP: baixa direto por POST usando os cookies do Chrome logado (Selenium só p/ login e fallback).
+# Capture a requisição real no DevTools (Network → salvarBordero) e ajuste BORDERO_HTTP antes de ligar.
+BACKEND_HTTP = _cfg("BACKEND_HTTP", False)
+CONEXOES_HTTP = 4
+TAXA_HTTP_POR_SEGUNDO = 5.0
+CATEGORIA_SHOPEE_VALUE = _cfg("CATEGORIA_SHOPEE_VALUE", "")   # value do option "RECEITA SHOPEE" em idCategoria
+ID_CONTA_REGEX = r"/(\d+)(?:[/?#]|$)"   # id da conta dentro da URL do button-navigate (índice)
+BORDERO_HTTP = {
+    "url": URL + "/salvar_bordero/{id_conta}",
+    "metodo": "POST",
+    "json": False,
+    "campos": {
+        "idConta": "{id_conta}",
+        "idContaContabil": CONTA_SHOPEE_VALUE,
+        "idCategoria": "{categoria}",
+        "data": "{data}",
+        INPUT_TAXA_ID: "{taxa}",
+        INPUT_DESCONTO_ID: "{desconto}",
+        INPUT_VALOR_ID: "{valor}",
+        "_token": "{csrf}",
+    },
+    "regex_sucesso": r"sucesso|\"ok\"\s*:\s*true",
+    "regex_sessao": r"sess[aã]o expirou|fa[cç]a login",
+}
+
+# Link "Receber/baixar" da conta
+RECEBER_BAIXAR_XPATH = "//a[.//i[contains(@class,'fa-check')] and contains(normalize-space(.),'Receber') and contains(normalize-space(.),'baixar')]"
+
+# Esperas por evento da página (teto em segundos por etapa, no lugar dos sleeps fixos)
+LIMITES_ESPERA = {
+    "contas_receber": 15,
+    "navigate": 15,
+    "receber_baixar": 15,
+    "preencher": 5,
+    "salvar_bordero": 20,
+    "listagem": 15,
+    "mais_opcoes": 10,
+}
+
 # =====================================================
 # HELPERS
 # =====================================================
 
+motor_espera = MotorEspera(LIMITES_ESPERA)
+medidor = Medidor(ARQUIVO_METRICAS, ARQUIVO_PROMETHEUS)
+medidor_rede = MedidorRede("enxuto" if MODO_ENXUTO else "normal")
+fila_retentativas = FilaRetentativas(**RETENTATIVAS)
+disjuntor = DisjuntorLentidao(**DISJUNTOR_LENTIDAO)
+gravador_debug = GravadorDebug(PASTA_DEBUG, **LIMITES_DEBUG)
+
 def garantir_pasta(path: str):
     if not os.path.exists(path):
         os.makedirs(path)
 
-def screenshot(driver, nome: str):
-    garantir_pasta(PASTA_DEBUG)
-    try:
-        driver.save_screenshot(os.path.join(PASTA_DEBUG, nome))
-    except Exception:
-        pass
-
-def salvar_html_debug(driver, nome: str):
-    garantir_pasta(PASTA_DEBUG)
-    try:
-        html = driver.page_source
-        with open(os.path.join(PASTA_DEBUG, nome), "w", encoding="utf-8") as f:
-            f.write(html)
-    except Exception:
-        pass
+def screenshot(driver, nome: str, codigo: str | None = None, etapa: str | None = None,
+               html: bool = False, forcar: bool = False):
+    # só a captura acontece aqui; gravar/comprimir fica com o gravador_debug (thread)
+    gravador_debug.capturar(driver, nome, codigo=codigo, etapa=etapa, html=html, forcar=forcar)
 
 def click_js(driver, element):
     driver.execute_script("arguments[0].click();", element)
@@ -98,11 +313,15 @@ def fechar_alerta_se_existir(driver) -> str | None:
         alert = driver.switch_to.alert
         texto = alert.text
         alert.accept()
-        return texto
     except NoAlertPresentException:
-        return None
+        # alerta que apareceu durante uma espera do motor (já aceito pelo chromedriver)
+        texto = motor_espera.consumir_alerta(driver)
     except Exception:
         return None
+    if texto:
+        # ✅ alerta de sessão fechado no meio de uma etapa não se perde: o vigia lembra
+        vigia_sessao.marcar(driver, texto)
+    return texto
 
 def sessao_expirada(texto_alerta: str) -> bool:
     if not texto_alerta:
@@ -110,10 +329,23 @@ def sessao_expirada(texto_alerta: str) -> bool:
     t = texto_alerta.lower()
     return ("sessão expirou" in t) or ("sessao expirou" in t) or ("login em outra máquina" in t)
 
+# ✅ checado entre etapas: sessão caída vira RELOGAR antes de esperar timeouts na tela de login
+vigia_sessao = VigiaSessao(sessao_expirada)
+
 def clonar_perfil():
     print("\n🔁 Clonando perfil do Chrome para uso do robô...")
     garantir_pasta(CHROME_USER_DATA_CLONE)
 
+    if not CLONE_COMPLETO:
+        # ✅ só cookies/Local Storage/Local State..., e só o que mudou desde o último clone
+        st = clonar_perfil_incremental(
+            CHROME_USER_DATA_ORIGINAL, CHROME_PROFILE_ORIGINAL,
+            CHROME_USER_DATA_CLONE, CHROME_PROFILE_CLONE,
+        )
+        print(f"✅ Perfil sincronizado em: {CHROME_USER_DATA_CLONE} "
+              f"({st['copiados']} copiados, {st['pulados']} iguais, {st['bytes'] / 1e6:.1f} MB)")
+        return
+
     src_profile = os.path.join(CHROME_USER_DATA_ORIGINAL, CHROME_PROFILE_ORIGINAL)
     dst_profile = os.path.join(CHROME_USER_DATA_CLONE, CHROME_PROFILE_CLONE)
 
@@ -129,55 +361,6 @@ def clonar_perfil():
 
     print("✅ Perfil clonado em:", CHROME_USER_DATA_CLONE)
 
-def formatar_data_br(valor) -> str | None:
-    if pd.isna(valor):
-        return None
-    if isinstance(valor, (pd.Timestamp, datetime)):
-        return valor.strftime("%d/%m/%Y")
-    s = str(valor).strip()
-    if not s:
-        return None
-    dt = pd.to_datetime(s, errors="coerce", dayfirst=False)
-    if pd.isna(dt):
-        return None
-    return dt.strftime("%d/%m/%Y")
-
-def br_money(valor) -> str | None:
-    if valor is None or pd.isna(valor):
-        return None
-    if isinstance(valor, (int, float)):
-        return f"{float(valor):.2f}".replace(".", ",")
-    s = str(valor).strip()
-    if not s:
-        return None
-    s = s.replace("R$", "").replace(" ", "")
-    if "," in s and "." in s:
-        s = s.replace(".", "")
-    elif "." in s and "," not in s:
-        s = s.replace(".", ",")
-    try:
-        v = float(s.replace(".", "").replace(",", "."))
-        return f"{v:.2f}".replace(".", ",")
-    except Exception:
-        return s
-
-def valor_num(valor) -> float:
-    if valor is None or pd.isna(valor):
-        return 0.0
-    if isinstance(valor, (int, float)):
-        return float(valor)
-    s = str(valor).strip()
-    if not s:
-        return 0.0
-    s = s.replace("R$", "").replace(" ", "")
-    if "," in s and "." in s:
-        s = s.replace(".", "")
-    s = s.replace(",", ".")
-    try:
-        return float(s)
-    except Exception:
-        return 0.0
-
 # =====================================================
 # ACHAR CAMPO DE BUSCA (ROBUSTO)
 # =====================================================
@@ -194,7 +377,21 @@ BUSCA_SELECTORS = [
     (By.XPATH, "//input[contains(@id,'pesquisa') or contains(@name,'pesquisa')]"),
 ]
 
+LUPA_SELECTORS = [
+    (By.CSS_SELECTOR, SEARCH_BUTTON_CSS),
+    (By.CSS_SELECTOR, "button.btn.btn-default"),
+    (By.CSS_SELECTOR, "span.input-group-btn button"),
+    (By.CSS_SELECTOR, "button[type='submit']"),
+]
+
+# ✅ lembra a estratégia que funcionou e reaproveita o elemento até ficar stale
+cache_seletores = CacheSeletores()
+
 def achar_input_busca(driver, timeout=25):
+    el = cache_seletores.resolver(driver, "busca", BUSCA_SELECTORS)
+    if el is not None:
+        return el
+
     w = WebDriverWait(driver, timeout)
 
     try:
@@ -202,58 +399,100 @@ def achar_input_busca(driver, timeout=25):
     except Exception:
         pass
 
-    for by, sel in BUSCA_SELECTORS:
-        try:
-            els = driver.find_elements(by, sel)
-            if els:
-                for e in els:
-                    try:
-                        if e.is_displayed() and e.is_enabled():
-                            return e
-                    except Exception:
-                        continue
-        except Exception:
-            continue
+    el = cache_seletores.resolver(driver, "busca", BUSCA_SELECTORS)
+    if el is not None:
+        return el
 
     try:
-        return w.until(EC.element_to_be_clickable((By.ID, SEARCH_INPUT_ID)))
+        el = w.until(EC.element_to_be_clickable((By.ID, SEARCH_INPUT_ID)))
+        cache_seletores.lembrar(driver, "busca", (By.ID, SEARCH_INPUT_ID), el)
+        return el
     except Exception:
         pass
 
-    screenshot(driver, "nao_achei_busca.png")
-    salvar_html_debug(driver, "nao_achei_busca.html")
-    raise RuntimeError("Ainda não achei o campo de busca. Salvei debug/nao_achei_busca.png e .html")
+    screenshot(driver, "nao_achei_busca.png", etapa="buscar", html=True)
+    raise RuntimeError(f"Ainda não achei o campo de busca. Salvei nao_achei_busca (.jpg e .html.gz) em {gravador_debug.pasta}")
 
 def achar_botao_lupa(driver, timeout=20):
+    el = cache_seletores.resolver(driver, "lupa", LUPA_SELECTORS)
+    if el is not None:
+        return el
+
     w = WebDriverWait(driver, timeout)
     try:
-        return w.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SEARCH_BUTTON_CSS)))
+        el = w.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SEARCH_BUTTON_CSS)))
+        cache_seletores.lembrar(driver, "lupa", (By.CSS_SELECTOR, SEARCH_BUTTON_CSS), el)
+        return el
     except Exception:
         pass
 
-    for css in [
-        "button.btn.btn-default",
-        "span.input-group-btn button",
-        "button[type='submit']",
-    ]:
+    el = cache_seletores.resolver(driver, "lupa", LUPA_SELECTORS)
+    if el is not None:
+        return el
+
+    screenshot(driver, "nao_achei_lupa.png", etapa="buscar", html=True)
+    raise RuntimeError(f"Não achei o botão da lupa. Salvei nao_achei_lupa (.jpg e .html.gz) em {gravador_debug.pasta}")
+
+def buscar_pedido(driver, codigo: str, timeout=25):
+    """
+    Digita o código na busca e clica na lupa. Se o elemento guardado no cache
+    ficou stale (a página recarregou), invalida e tenta mais uma vez.
+    """
+    for tentativa in (1, 2):
         try:
-            els = driver.find_elements(By.CSS_SELECTOR, css)
-            for e in els:
-                try:
-                    if e.is_displayed() and e.is_enabled():
-                        return e
-                except Exception:
-                    continue
-        except Exception:
-            continue
+            busca = achar_input_busca(driver, timeout=timeout)
+            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", busca)
+
+            busca.click()
+            busca.send_keys(Keys.CONTROL, "a")
+            busca.send_keys(Keys.DELETE)
+            busca.send_keys(codigo)
+
+            lupa = achar_botao_lupa(driver, timeout=timeout)
+            click_js(driver, lupa)
+            return
+        except StaleElementReferenceException:
+            cache_seletores.invalidar(driver)
+            if tentativa == 2:
+                raise
+
+def na_tela_contas_receber(driver) -> bool:
+    # sem input(): usado pelo re-login automático para saber se a sessão voltou
+    cache_seletores.invalidar(driver)
+    motor_espera.aguardar(driver, "contas_receber", (By.ID, SEARCH_INPUT_ID))
+    fechar_alerta_se_existir(driver)
+    try:
+        if driver.execute_script(JS_TELA_LOGIN):
+            return False
+        _ = achar_input_busca(driver, timeout=10)
+        return True
+    except Exception:
+        return False
+
+recuperador_sessao = RecuperadorSessao(
+    URL_LOGIN, URL, LOGIN_SELECTORS, na_tela_contas_receber,
+    usuario=USUARIO_OLIST, senha=SENHA_OLIST, arquivo_cookies=ARQUIVO_COOKIES,
+)
 
-    screenshot(driver, "nao_achei_lupa.png")
-    salvar_html_debug(driver, "nao_achei_lupa.html")
-    raise RuntimeError("Não achei o botão da lupa. Salvei debug/nao_achei_lupa.png e .html")
+def relogar(driver, motivo: str):
+    """
+    Sessão caiu: tenta o re-login automático (cookies / usuário e senha) e volta para
+    Contas a Receber. Sem credenciais configuradas, ou se falhar, pede o login ao operador.
+    """
+    print(f"\n🔐 Sessão expirou ({motivo}).")
+    if RELOGIN_AUTOMATICO and recuperador_sessao.configurado and recuperador_sessao.recuperar(driver):
+        vigia_sessao.limpar(driver)
+        cache_seletores.invalidar(driver)
+        return
+
+    input("\n👉 Sessão expirou. Faça login novamente e volte para Contas a Receber. ENTER... ")
+    vigia_sessao.limpar(driver)
+    garantir_na_tela_contas_receber(driver)
 
 def garantir_na_tela_contas_receber(driver):
     driver.get(URL)
-    time.sleep(2)
+    cache_seletores.invalidar(driver)
+    motor_espera.aguardar(driver, "contas_receber", (By.ID, SEARCH_INPUT_ID))
     fechar_alerta_se_existir(driver)
 
     try:
@@ -262,6 +501,12 @@ def garantir_na_tela_contas_receber(driver):
     except Exception:
         pass
 
+    if RELOGIN_AUTOMATICO and recuperador_sessao.configurado and vigia_sessao.checar(driver):
+        # caiu na tela de login: re-login automático antes de chamar o operador
+        if recuperador_sessao.recuperar(driver):
+            vigia_sessao.limpar(driver)
+            return
+
     screenshot(driver, "antes_pedir_navegar.png")
     input("\n👉 Não achei o campo de busca. No Chrome do robô, clique em Contas a Receber (nessa tela) e aperte ENTER... ")
     time.sleep(1)
@@ -271,7 +516,8 @@ def garantir_na_tela_contas_receber(driver):
         return
     except Exception:
         driver.get(URL)
-        time.sleep(2)
+        cache_seletores.invalidar(driver)
+        motor_espera.aguardar(driver, "contas_receber", (By.ID, SEARCH_INPUT_ID))
         fechar_alerta_se_existir(driver)
         _ = achar_input_busca(driver, timeout=25)
         return
@@ -287,38 +533,25 @@ def confirmar_se_baixou(driver, codigo: str, timeout=20) -> bool:
     """
     garantir_na_tela_contas_receber(driver)
 
-    busca = achar_input_busca(driver, timeout=timeout)
-    busca.click()
-    busca.send_keys(Keys.CONTROL, "a")
-    busca.send_keys(Keys.DELETE)
-    time.sleep(0.05)
-    busca.send_keys(codigo)
-
-    lupa = achar_botao_lupa(driver, timeout=timeout)
-    click_js(driver, lupa)
+    buscar_pedido(driver, codigo, timeout=timeout)
 
     resp = esperar_resultado_da_busca(driver, codigo, timeout=timeout)
     if resp != "OK":
         return False
 
-    rows = driver.find_elements(By.CSS_SELECTOR, RESULT_ROW_SELECTOR)
-    for r in rows:
-        try:
-            if codigo in r.text:
-                txt = r.text.lower()
-                # ✅ sinais comuns de "já baixado"
-                if ("baixad" in txt) or ("recebid" in txt) or ("pago" in txt) or ("liquid" in txt):
-                    return True
-                return False
-        except Exception:
-            continue
-
-    return False
+    # ✅ célula de situação da linha do pedido é uma de SITUACOES_BAIXADO
+    return sondar_busca(driver, codigo)["baixado"]
 
 # =====================================================
 # OLIST ACTIONS
 # =====================================================
 
+def sondar_busca(driver, codigo: str, clicar: bool = False) -> dict:
+    return driver.execute_script(
+        JS_SONDAR_BUSCA, codigo, list(SITUACOES_BAIXADO), RESULT_ROW_SELECTOR, NO_RESULTS_XPATH, clicar,
+        list(TITULOS_LISTAGEM),
+    )
+
 def esperar_resultado_da_busca(driver, codigo: str, timeout=35) -> str:
     t0 = time.time()
     while time.time() - t0 < timeout:
@@ -326,39 +559,30 @@ def esperar_resultado_da_busca(driver, codigo: str, timeout=35) -> str:
         if txt and sessao_expirada(txt):
             return "RELOGAR"
 
-        if driver.find_elements(By.XPATH, NO_RESULTS_XPATH):
-            return "NAO_ENCONTRADO"
+        try:
+            sonda = sondar_busca(driver, codigo)
+        except UnexpectedAlertPresentException as e:
+            if sessao_expirada(e.alert_text):
+                return "RELOGAR"
+            continue
 
-        rows = driver.find_elements(By.CSS_SELECTOR, RESULT_ROW_SELECTOR)
-        for r in rows:
-            try:
-                if codigo in r.text:
-                    return "OK"
-            except Exception:
-                pass
+        if sonda["indice"] >= 0:
+            return "OK"
+        if sonda["nenhum"]:
+            return "NAO_ENCONTRADO"
 
-        time.sleep(0.3)
+        time.sleep(0.15)
 
     return "TIMEOUT"
 
 def clicar_navigate_da_linha(driver, codigo: str):
-    rows = driver.find_elements(By.CSS_SELECTOR, RESULT_ROW_SELECTOR)
-    for r in rows:
-        try:
-            if codigo in r.text:
-                btn = r.find_element(By.CSS_SELECTOR, "button.button-navigate")
-                click_js(driver, btn)
-                return
-        except Exception:
-            continue
-    raise RuntimeError("Não encontrei a linha do pedido (ou button-navigate) para este código.")
+    sonda = sondar_busca(driver, codigo, clicar=True)
+    if sonda["indice"] < 0 or not sonda["navegavel"]:
+        raise RuntimeError("Não encontrei a linha do pedido (ou button-navigate) para este código.")
 
 def clicar_receber_baixar(driver, timeout=35):
     w = WebDriverWait(driver, timeout)
-    el = w.until(EC.element_to_be_clickable((
-        By.XPATH,
-        "//a[.//i[contains(@class,'fa-check')] and contains(normalize-space(.),'Receber') and contains(normalize-space(.),'baixar')]"
-    )))
+    el = w.until(EC.element_to_be_clickable((By.XPATH, RECEBER_BAIXAR_XPATH)))
     click_js(driver, el)
 
 def selecionar_shopee_conta_contabil(driver, timeout=20):
@@ -366,7 +590,6 @@ def selecionar_shopee_conta_contabil(driver, timeout=20):
 
     sel = w.until(EC.element_to_be_clickable((By.ID, "idContaContabil")))
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", sel)
-    time.sleep(0.2)
 
     WebDriverWait(driver, 10).until(
         lambda d: len(Select(d.find_element(By.ID, "idContaContabil")).options) > 1
@@ -374,7 +597,6 @@ def selecionar_shopee_conta_contabil(driver, timeout=20):
 
     try:
         ActionChains(driver).move_to_element(sel).click(sel).perform()
-        time.sleep(0.2)
         opt = w.until(EC.element_to_be_clickable((
             By.XPATH, f"//select[@id='idContaContabil']/option[normalize-space()='{CONTA_SHOPEE_TEXTO}']"
         )))
@@ -428,7 +650,6 @@ def preencher_taxas_e_frete(driver, taxa_br: str | None, frete_br: str | None, f
     try:
         lbl = w.until(EC.presence_of_element_located((By.XPATH, "//label[normalize-space()='Taxas']")))
         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", lbl)
-        time.sleep(0.2)
     except Exception:
         pass
 
@@ -439,7 +660,7 @@ def preencher_taxas_e_frete(driver, taxa_br: str | None, frete_br: str | None, f
         inp_taxa.send_keys(Keys.DELETE)
         inp_taxa.send_keys(taxa_br)
         inp_taxa.send_keys(Keys.ENTER)
-        time.sleep(0.15)
+        motor_espera.aguardar(driver, "preencher", silencio_ms=80)
 
     if frete_br is not None and frete_num > 0:
         inp_desc = w.until(EC.element_to_be_clickable((By.ID, INPUT_DESCONTO_ID)))
@@ -448,7 +669,7 @@ def preencher_taxas_e_frete(driver, taxa_br: str | None, frete_br: str | None, f
         inp_desc.send_keys(Keys.DELETE)
         inp_desc.send_keys(frete_br)
         inp_desc.send_keys(Keys.ENTER)
-        time.sleep(0.15)
+        motor_espera.aguardar(driver, "preencher", silencio_ms=80)
 
 def preencher_valor_liquido(driver, valor_br: str | None, timeout=25):
     if valor_br is None:
@@ -456,75 +677,246 @@ def preencher_valor_liquido(driver, valor_br: str | None, timeout=25):
     w = WebDriverWait(driver, timeout)
     inp = w.until(EC.element_to_be_clickable((By.ID, INPUT_VALOR_ID)))
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", inp)
-    time.sleep(0.15)
     inp.click()
     inp.send_keys(Keys.CONTROL, "a")
     inp.send_keys(Keys.DELETE)
     inp.send_keys(valor_br)
     inp.send_keys(Keys.ENTER)
 
-def aplicar_mais_opcoes_shopee(driver, data_br: str | None, timeout=35):
+def abrir_mais_opcoes(driver, timeout=35):
     w = WebDriverWait(driver, timeout)
     btn_mais = w.until(EC.element_to_be_clickable((By.ID, "linkUmaConta")))
     click_js(driver, btn_mais)
 
+def aplicar_mais_opcoes_shopee(driver, data_br: str | None, timeout=35):
     selecionar_shopee_conta_contabil(driver, timeout=timeout)
     selecionar_receita_shopee_categoria(driver, timeout=timeout)
     preencher_data(driver, data_br=data_br, timeout=timeout)
 
-def clicar_receber_contas_final(driver, timeout=35):
+# =====================================================
+# PREENCHIMENTO EM LOTE (UM ROUND TRIP + UMA CONFERÊNCIA)
+# =====================================================
+
+JS_PREENCHER_BORDERO = """
+const c = arguments[0];
+const conta = document.getElementById('idContaContabil');
+const categoria = document.getElementById('idCategoria');
+if (!conta || !categoria || conta.options.length <= 1) return { ok: false, motivo: 'selects ainda carregando' };
+
+function setar(el, valor) {
+    const proto = el.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, valor);
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+    el.dispatchEvent(new Event('blur'));
+}
+function opcao(sel, valor, texto) {
+    const ops = Array.from(sel.options);
+    const op = ops.find(o => o.value === valor) || ops.find(o => o.text.trim().toUpperCase() === texto);
+    return op ? op.value : null;
+}
+
+const vConta = opcao(conta, c.conta_valor, c.conta_texto);
+const vCategoria = opcao(categoria, null, c.categoria_texto);
+if (vConta === null || vCategoria === null) return { ok: false, motivo: 'opção não encontrada' };
+setar(conta, vConta);
+setar(categoria, vCategoria);
+
+// mesma ordem do preenchimento tecla a tecla: data, taxa, desconto e por último o valor
+const campos = [['data', c.data], [c.id_taxa, c.taxa], [c.id_desconto, c.desconto], [c.id_valor, c.valor]];
+for (const [id, valor] of campos) {
+    if (valor === null || valor === undefined) continue;
+    const el = document.getElementById(id);
+    if (!el) return { ok: false, motivo: 'campo ' + id + ' não encontrado' };
+    setar(el, valor);
+}
+return { ok: true };
+"""
+
+JS_LER_BORDERO = """
+const ids = arguments[0];
+const out = {};
+for (const id of ids) {
+    const el = document.getElementById(id);
+    if (!el) { out[id] = null; continue; }
+    out[id] = el.tagName === 'SELECT'
+        ? (el.options[el.selectedIndex] ? el.options[el.selectedIndex].text.trim().toUpperCase() : '')
+        : el.value;
+}
+return out;
+"""
+
+stats_preenchimento = Counter()
+
+def preencher_bordero_em_lote(driver, data_br: str | None, taxa_br: str | None, frete_br: str | None,
+                              frete_num: float, valor_br: str | None, timeout=10) -> bool:
+    campos = {
+        "conta_valor": CONTA_SHOPEE_VALUE,
+        "conta_texto": CONTA_SHOPEE_TEXTO,
+        "categoria_texto": CATEGORIA_SHOPEE_TEXTO,
+        "data": data_br or None,
+        "taxa": taxa_br,
+        "desconto": frete_br if (frete_br is not None and frete_num > 0) else None,
+        "valor": valor_br,
+        "id_taxa": INPUT_TAXA_ID,
+        "id_desconto": INPUT_DESCONTO_ID,
+        "id_valor": INPUT_VALOR_ID,
+    }
+
+    motor_espera.aguardar(driver, "mais_opcoes", (By.ID, "idContaContabil"))
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: (d.execute_script(JS_PREENCHER_BORDERO, campos) or {}).get("ok") or None
+        )
+    except TimeoutException:
+        return False
+
+    motor_espera.aguardar(driver, "preencher", silencio_ms=80)
+
+    lido = driver.execute_script(
+        JS_LER_BORDERO, ["idContaContabil", "idCategoria", "data", INPUT_TAXA_ID, INPUT_DESCONTO_ID, INPUT_VALOR_ID]
+    ) or {}
+
+    if CONTA_SHOPEE_TEXTO not in (lido.get("idContaContabil") or ""):
+        return False
+    if (lido.get("idCategoria") or "") != CATEGORIA_SHOPEE_TEXTO.upper():
+        return False
+    if campos["data"] and (lido.get("data") or "").strip() != campos["data"]:
+        return False
+    for id_campo, esperado in ((INPUT_TAXA_ID, campos["taxa"]), (INPUT_DESCONTO_ID, campos["desconto"]),
+                               (INPUT_VALOR_ID, campos["valor"])):
+        if esperado is not None and centavos(lido.get(id_campo)) != centavos(esperado):
+            return False
+    return True
+
+def preencher_bordero(driver, data_br: str | None, taxa_br: str | None, frete_br: str | None,
+                      frete_num: float, valor_br: str | None, timeout=35):
+    if PREENCHIMENTO_EM_LOTE:
+        if preencher_bordero_em_lote(driver, data_br, taxa_br, frete_br, frete_num, valor_br):
+            stats_preenchimento["lote"] += 1
+            return
+        stats_preenchimento["fallback_teclado"] += 1
+
+    aplicar_mais_opcoes_shopee(driver, data_br=data_br, timeout=timeout)
+    preencher_taxas_e_frete(driver, taxa_br=taxa_br, frete_br=frete_br, frete_num=frete_num, timeout=timeout)
+    preencher_valor_liquido(driver, valor_br=valor_br, timeout=timeout)
+
+def clicar_receber_contas_final(driver, timeout=35, esperar: bool = True):
     w = WebDriverWait(driver, timeout)
     btn = w.until(EC.element_to_be_clickable((By.ID, BTN_SALVAR_BORDERO_ID)))
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-    time.sleep(0.2)
     click_js(driver, btn)
-    time.sleep(0.8)
+    if esperar:
+        concluir_salvar(driver)
+
+def concluir_salvar(driver):
+    motor_espera.aguardar(driver, "salvar_bordero")
     fechar_alerta_se_existir(driver)
 
 # =====================================================
-# START
+# CHROME / WORKERS
 # =====================================================
 
-print("⚠️ Feche TODAS as janelas do Chrome antes de continuar.")
-input("Quando tiver fechado, aperte ENTER... ")
+def pasta_perfil_worker(n: int) -> str:
+    # worker 0 usa o clone principal; os demais, uma cópia dele
+    if n == 0:
+        return CHROME_USER_DATA_CLONE
+    return f"{CHROME_USER_DATA_CLONE}_w{n}"
 
-clonar_perfil()
+def clonar_perfis_workers(n_workers: int):
+    destinos = [pasta_perfil_worker(n) for n in range(1, n_workers)]
 
-options = webdriver.ChromeOptions()
-options.add_argument("--start-maximized")
-options.add_argument(f"--user-data-dir={CHROME_USER_DATA_CLONE}")
-options.add_argument(f"--profile-directory={CHROME_PROFILE_CLONE}")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_experimental_option("excludeSwitches", ["enable-automation"])
-options.add_experimental_option("useAutomationExtension", False)
+    if not CLONE_COMPLETO:
+        for dst, st in zip(destinos, clonar_workers(CHROME_USER_DATA_CLONE, CHROME_PROFILE_CLONE, destinos)):
+            print(f"🔁 Worker clonado em: {dst} ({st['copiados']} copiados, {st['pulados']} iguais)")
+        return
 
-prefs = {"profile.default_content_setting_values.notifications": 2}
-options.add_experimental_option("prefs", prefs)
+    for dst in destinos:
+        print(f"🔁 Clonando perfil do worker em: {dst}")
+        if os.path.exists(dst):
+            shutil.rmtree(dst, ignore_errors=True)
+        shutil.copytree(CHROME_USER_DATA_CLONE, dst)
+
+def criar_driver(user_data_dir: str):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--start-maximized")
+    configurar_opcoes(options, BLOQUEIO_RECURSOS, MODO_ENXUTO, MEDIR_REDE)
+    if CHROME_HEADLESS and not MODO_ENXUTO:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    options.add_argument(f"--profile-directory={CHROME_PROFILE_CLONE}")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    prefs = {"profile.default_content_setting_values.notifications": 2}
+    options.add_experimental_option("prefs", prefs)
+
+    # alerta inesperado é aceito (igual fechar_alerta_se_existir) e o texto vem na exceção
+    options.set_capability("unhandledPromptBehavior", "accept and notify")
+
+    drv = webdriver.Chrome(options=options)
+    if MODO_ENXUTO:
+        aplicar_bloqueio(drv, BLOQUEIO_RECURSOS)
+    return drv
+
+def abrir_contas_receber(driver):
+    driver.get(URL)
+    motor_espera.aguardar(driver, "contas_receber", (By.ID, SEARCH_INPUT_ID))
 
-driver = webdriver.Chrome(options=options)
-wait = WebDriverWait(driver, WAIT_TIMEOUT)
+    txt = fechar_alerta_se_existir(driver)
+    if txt:
+        screenshot(driver, "alerta_inicial.png")
+        print("\n⚠️ Alerta fechado:", txt)
+        if sessao_expirada(txt):
+            relogar(driver, "ao abrir Contas a Receber")
 
-driver.get(URL)
-time.sleep(2)
+    garantir_na_tela_contas_receber(driver)
 
-txt = fechar_alerta_se_existir(driver)
-if txt:
-    screenshot(driver, "alerta_inicial.png")
-    print("\n⚠️ Alerta fechado:", txt)
-    if sessao_expirada(txt):
-        input("\n👉 Faça login novamente no Olist e volte para Contas a Receber. ENTER... ")
-        garantir_na_tela_contas_receber(driver)
+reciclagem = ReciclagemNavegador(URL, **RECICLAGEM)
 
-garantir_na_tela_contas_receber(driver)
+def preparar_aba(drv):
+    # aba/Chrome recém-aberto: bloqueio de recursos, cache de seletores e vigia são por aba
+    if MODO_ENXUTO:
+        aplicar_bloqueio(drv, BLOQUEIO_RECURSOS)
+    cache_seletores.invalidar(drv)
+    vigia_sessao.limpar(drv)
+    garantir_na_tela_contas_receber(drv)
+
+def reciclar_se_preciso(drv, n: int, segundos: float, status: str):
+    """
+    Chamar entre pedidos (nenhum borderô aberto). Se a memória ou a lentidão do Chrome passaram do
+    limite, troca a aba ou o Chrome do worker `n` e devolve o driver a usar daqui em diante.
+    """
+    global driver
+    if not RECICLAR_NAVEGADOR:
+        return drv
+    motivo = reciclagem.observar(drv, segundos, status)
+    if not motivo:
+        return drv
+    with medidor.span("reciclar_navegador"):
+        novo = reciclagem.reciclar(drv, motivo, lambda: criar_driver(pasta_perfil_worker(n)), preparar_aba)
+    cache_seletores.invalidar(drv)   # aba nova ou Chrome novo: os elementos guardados morreram
+    if MEDIR_REDE:
+        medidor_rede.coletar(novo, pedido=False)
+    if n == 0:
+        driver = novo   # worker 0 usa o driver principal (retentativas e reconciliação no fim)
+    return novo
 
 # =====================================================
 # EXCEL
 # =====================================================
 
 print("\nAbrindo Excel...")
-df = pd.read_excel(ARQUIVO_ENTRADA)
+df = ler_entrada(
+    ARQUIVO_ENTRADA,
+    [COLUNA_CODIGO, COLUNA_DATA, COLUNA_TOTAL_TAXAS, COLUNA_FRETE_COBRADO,
+     COLUNA_VALOR_LIQUIDO, COLUNA_VALIDACAO, COLUNA_STATUS, COLUNA_VALOR_BRUTO],
+    COLUNA_CODIGO, COLUNA_DATA, aba=ABA_ENTRADA, pasta_cache=PASTA_CACHE_ENTRADA,
+)
 
 df[COLUNA_CODIGO] = df[COLUNA_CODIGO].astype(str).str.strip()
 
@@ -535,113 +927,215 @@ df[COLUNA_STATUS] = df[COLUNA_STATUS].astype("string")
 if COLUNA_VALIDACAO in df.columns:
     df[COLUNA_VALIDACAO] = df[COLUNA_VALIDACAO].astype("string")
 
-df["_DATA_BR"] = df[COLUNA_DATA].apply(formatar_data_br)
+# ✅ um item de trabalho por pedido: linhas do mesmo ID combinadas pelas REGRAS_AGREGACAO
+df_pedidos, conflitos, bloqueados = agregar_por_pedido(
+    df, COLUNA_CODIGO, COLUNA_DATA, COLUNA_TOTAL_TAXAS, COLUNA_FRETE_COBRADO,
+    COLUNA_VALOR_LIQUIDO, COLUNA_VALIDACAO, REGRAS_AGREGACAO, bloquear_conflitos=BLOQUEAR_CONFLITOS,
+)
+if len(conflitos):
+    conflitos.to_csv(ARQUIVO_CONFLITOS, index=False, encoding="utf-8-sig")
+    print(f"⚠️ {len(conflitos)} pedidos com linhas em conflito ({int(conflitos['bloqueado'].sum())} serão pulados) → {ARQUIVO_CONFLITOS}")
+
+# ✅ tudo conferido aqui, em lote: o navegador só vê pedidos prontos para baixar
+if COLUNA_VALOR_BRUTO not in df_pedidos.columns:
+    print(f"⚠️ Sem a coluna '{COLUNA_VALOR_BRUTO}': bruto − taxas − frete não é conferido (só datas/valores)")
+prontos, rejeitados = validar_pedidos(
+    df_pedidos, COLUNA_CODIGO, COLUNA_DATA, COLUNA_VALOR_BRUTO, COLUNA_TOTAL_TAXAS, COLUNA_FRETE_COBRADO,
+    COLUNA_VALOR_LIQUIDO, COLUNA_VALIDACAO, tolerancia_centavos=TOLERANCIA_CENTAVOS,
+    confiar_validacao=CONFIAR_VALIDACAO_PLANILHA, bloqueados=bloqueados,
+)
+if len(rejeitados):
+    rejeitados.to_csv(ARQUIVO_REJEITADOS, index=False, encoding="utf-8-sig")
+    print(f"🚫 {len(rejeitados)} pedidos rejeitados na validação prévia → {ARQUIVO_REJEITADOS}")
+    for motivo, qtd in resumo_rejeicoes(rejeitados).items():
+        print(f"   {qtd:>6}  {motivo}")
+df_prontos = df_pedidos[prontos]
+
+# ✅ uma passada por coluna (sem iterrows); ver preprocessamento.preprocessar_legado
+registros = preprocessar(
+    df_prontos, COLUNA_CODIGO, COLUNA_DATA, COLUNA_TOTAL_TAXAS,
+    COLUNA_FRETE_COBRADO, COLUNA_VALOR_LIQUIDO, COLUNA_VALIDACAO,
+)
 
-mapa_data = {}
-mapa_taxas = {}
-mapa_frete = {}
-mapa_valor = {}
-mapa_validacao = {}
-mapa_frete_num = {}
+pedidos = df_prontos[COLUNA_CODIGO].tolist()
+print(f"Total de pedidos: {len(pedidos)} prontos para baixar, {len(rejeitados)} rejeitados "
+      f"({len(df_pedidos)} pedidos, {len(df)} linhas na planilha)")
+
+# ✅ status por pedido em O(1); o df só é atualizado no checkpoint
+ledger = LedgerStatus.do_dataframe(df, COLUNA_CODIGO, COLUNA_STATUS, ja_baixado_como_sim=JA_BAIXADO_COMO_SIM)
+
+# ✅ diário por planilha de entrada (hash do arquivo): só retoma o que foi feito com este mesmo arquivo
+diario = DiarioExecucao(ARQUIVO_DIARIO, entrada=hash_arquivo(ARQUIVO_ENTRADA))
+n_eventos = diario.reaplicar(ledger)
+if n_eventos:
+    ja_baixados = sum(1 for p in set(pedidos) if ledger.ja_baixado(p))
+    print(f"🔁 Diário reaplicado: {n_eventos} eventos, {ja_baixados} pedidos já baixados serão pulados")
+
+# ✅ grava o status numa cópia da planilha original (formatação/fórmulas intactas), numa thread própria
+escritor = EscritorStatus(ARQUIVO_ENTRADA, ARQUIVO_SAIDA, COLUNA_CODIGO, COLUNA_STATUS, aba=ABA_ENTRADA)
+
+# rejeitado sai na planilha como antes (PULADO_VALIDACAO), só que sem abrir a conta no ERP.
+# Quem já tem resultado de uma execução anterior (SIM, TIMEOUT...) fica como está.
+eventos_rejeitados = []
+for codigo in rejeitados["codigo"]:
+    if ledger.status(codigo).strip() in ("", "PULADO_VALIDACAO"):
+        ledger.registrar(codigo, "PULADO_VALIDACAO")
+        eventos_rejeitados.append((codigo, "PULADO_VALIDACAO", ledger.tentativas(codigo)))
+diario.registrar_lote(eventos_rejeitados)
+
+if not any(not ledger.ja_baixado(p) for p in pedidos):
+    # ✅ nada pronto para baixar: nem abre o Chrome
+    escritor.agendar(ledger.retirar_alterados())
+    escritor.fechar()
+    diario.fechar()
+    print("\n✅ Nenhum pedido pronto para baixar. Arquivo salvo:", escritor.destino)
+    raise SystemExit(0)
 
-for _, row in df.iterrows():
-    pid = str(row.get(COLUNA_CODIGO, "")).strip()
-    if not pid or pid.lower() == "nan":
-        continue
+# =====================================================
+# START
+# =====================================================
+
+print("⚠️ Feche TODAS as janelas do Chrome antes de continuar.")
+input("Quando tiver fechado, aperte ENTER... ")
 
-    mapa_data[pid] = row.get("_DATA_BR")
-    mapa_taxas[pid] = br_money(row.get(COLUNA_TOTAL_TAXAS, None))
-    mapa_frete[pid] = br_money(row.get(COLUNA_FRETE_COBRADO, None))
-    mapa_frete_num[pid] = valor_num(row.get(COLUNA_FRETE_COBRADO, None))
-    mapa_valor[pid] = br_money(row.get(COLUNA_VALOR_LIQUIDO, None))
+clonar_perfil()
+if N_WORKERS > 1:
+    # ✅ clona antes de abrir o Chrome principal (perfil em uso fica travado)
+    clonar_perfis_workers(N_WORKERS)
 
-    v = str(row.get(COLUNA_VALIDACAO, "")).strip().lower()
-    mapa_validacao[pid] = v
+driver = criar_driver(CHROME_USER_DATA_CLONE)
+wait = WebDriverWait(driver, WAIT_TIMEOUT)
 
-pedidos = df[COLUNA_CODIGO].dropna().astype(str).str.strip().tolist()
-print(f"Total de pedidos: {len(pedidos)}")
+abrir_contas_receber(driver)
 
 # =====================================================
 # PROCESSO
 # =====================================================
 
-def processar_pedido(codigo: str) -> str:
-    alerta = fechar_alerta_se_existir(driver)
-    if alerta and sessao_expirada(alerta):
+def abrir_conta_do_pedido(driver, codigo: str) -> str:
+    """
+    Primeira metade do pedido: validação, atalhos (ledger/índice) e navegação até a conta.
+    "OK" = tela da conta aberta (com "Receber/baixar"); senão, o status do pedido.
+    """
+    fechar_alerta_se_existir(driver)
+    if vigia_sessao.caiu(driver):
         return "RELOGAR"
 
-    codigo = str(codigo).strip()
-
-    if mapa_validacao.get(codigo, "") != "ok":
+    # registros só tem quem passou na validação prévia
+    if codigo not in registros:
         return "PULADO_VALIDACAO"
 
-    try:
-        atual = df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS].iloc[0]
-        if str(atual).strip().upper() == "SIM":
-            return "JA_BAIXADO"
-    except Exception:
-        pass
+    if ledger.ja_baixado(codigo):
+        return "JA_BAIXADO"
 
-    data_br = mapa_data.get(codigo)
-    taxa_br = mapa_taxas.get(codigo)
-    frete_br = mapa_frete.get(codigo)
-    frete_num = mapa_frete_num.get(codigo, 0.0)
-    valor_br = mapa_valor.get(codigo)
+    item = indice.get(codigo) if indice else None
+    if item and item["estado"] == "baixado":
+        return "JA_BAIXADO"
 
-    busca = achar_input_busca(driver, timeout=25)
-    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", busca)
-    time.sleep(0.1)
-
-    busca.click()
-    busca.send_keys(Keys.CONTROL, "a")
-    busca.send_keys(Keys.DELETE)
-    time.sleep(0.05)
-    busca.send_keys(codigo)
+    if item and item["destino"]:
+        # ✅ índice já sabe a URL da conta: vai direto, sem digitar/buscar na listagem
+        with medidor.span("navigate", codigo):
+            driver.get(item["destino"])
+            cache_seletores.invalidar(driver)
+            motor_espera.aguardar(driver, "navigate", (By.XPATH, RECEBER_BAIXAR_XPATH))
+        if vigia_sessao.checar(driver):
+            return "RELOGAR"
+    else:
+        with medidor.span("busca", codigo):
+            buscar_pedido(driver, codigo, timeout=25)
+
+        with medidor.span("esperar_resultado", codigo):
+            resp = esperar_resultado_da_busca(driver, codigo, timeout=35)
+        if resp != "OK":
+            return resp
+
+        with medidor.span("navigate", codigo):
+            clicar_navigate_da_linha(driver, codigo)
+            motor_espera.aguardar(driver, "navigate", (By.XPATH, RECEBER_BAIXAR_XPATH))
+        if vigia_sessao.checar(driver):
+            return "RELOGAR"
 
-    lupa = achar_botao_lupa(driver, timeout=20)
-    click_js(driver, lupa)
+    return "OK"
 
-    resp = esperar_resultado_da_busca(driver, codigo, timeout=35)
-    if resp != "OK":
-        return resp
+def baixar_conta_aberta(driver, codigo: str, esperar_salvar: bool = True) -> str:
+    """
+    Segunda metade: Receber/baixar, preenche o borderô e salva. esperar_salvar=False só clica em
+    salvar (o pipeline de abas espera depois, com concluir_salvar).
+    """
+    reg = registros.get(codigo)
 
-    clicar_navigate_da_linha(driver, codigo)
-    time.sleep(1.2)
+    with medidor.span("receber_baixar", codigo):
+        clicar_receber_baixar(driver, timeout=35)
+        motor_espera.aguardar(driver, "receber_baixar", (By.ID, "linkUmaConta"))
 
-    clicar_receber_baixar(driver, timeout=35)
-    time.sleep(0.8)
+    with medidor.span("mais_opcoes", codigo):
+        abrir_mais_opcoes(driver, timeout=35)
 
-    aplicar_mais_opcoes_shopee(driver, data_br=data_br, timeout=35)
+    with medidor.span("preencher", codigo):
+        preencher_bordero(driver, reg.data_br, reg.taxa_br, reg.frete_br, reg.frete_num, reg.valor_br, timeout=35)
 
-    preencher_taxas_e_frete(driver, taxa_br=taxa_br, frete_br=frete_br, frete_num=frete_num, timeout=35)
-    preencher_valor_liquido(driver, valor_br=valor_br, timeout=35)
+    # ✅ nunca clica em salvar com a sessão caída (o borderô não gravaria)
+    if vigia_sessao.checar(driver):
+        return "RELOGAR"
 
-    clicar_receber_contas_final(driver, timeout=40)
+    with medidor.span("salvar" if esperar_salvar else "salvar_clique", codigo):
+        clicar_receber_contas_final(driver, timeout=40, esperar=esperar_salvar)
 
     return "BAIXADO_OK"
 
-def processar_com_tentativas(codigo: str) -> str:
+def processar_pedido(driver, codigo: str) -> str:
     codigo = str(codigo).strip()
+    status = abrir_conta_do_pedido(driver, codigo)
+    if status != "OK":
+        return status
+    return baixar_conta_aberta(driver, codigo)
+
+STATUS_ADIAVEIS = ("TIMEOUT", "ERRO")
 
-    for t in range(1, TENTATIVAS_POR_PEDIDO + 1):
+def processar_com_tentativas(driver, codigo: str) -> str:
+    codigo = str(codigo).strip()
+
+    t = 0
+    relogins = 0
+    ultimo = "ERRO"
+    while t < TENTATIVAS_POR_PEDIDO:
+        t += 1
+        disjuntor.aguardar()
+        # ✅ a confirmação (volta à lista + nova busca) só roda aqui se ainda houver tentativa;
+        # na última, o pedido vai para a fila de retentativas e é confirmado lá, fora do caminho quente
+        confirmar_agora = t < TENTATIVAS_POR_PEDIDO or not ADIAR_FALHAS
+        with lock_status:
+            ledger.iniciar_tentativa(codigo)
         try:
-            status = processar_pedido(codigo)
+            with medidor.span("processar_pedido", codigo, t):
+                status = processar_pedido(driver, codigo)
 
             if status in ("BAIXADO_OK", "NAO_ENCONTRADO", "PULADO_VALIDACAO", "JA_BAIXADO"):
+                disjuntor.registrar(False)
                 return status
 
             if status == "RELOGAR":
-                screenshot(driver, f"relogar_{codigo}_t{t}.png")
-                input("\n👉 Sessão expirou. Faça login novamente e volte para Contas a Receber. ENTER... ")
-                garantir_na_tela_contas_receber(driver)
+                screenshot(driver, f"relogar_{codigo}_t{t}.png", codigo, "sessao")
+                with medidor.span("relogar", codigo, t):
+                    relogar(driver, f"pedido {codigo}")
+                # ✅ o pedido interrompido volta para a fila sem gastar tentativa
+                if relogins < RELOGINS_POR_PEDIDO:
+                    relogins += 1
+                    t -= 1
                 continue
 
             if status == "TIMEOUT":
-                screenshot(driver, f"timeout_{codigo}_t{t}.png")
+                disjuntor.registrar(True)
+                ultimo = "TIMEOUT"
+                screenshot(driver, f"timeout_{codigo}_t{t}.png", codigo, "esperar_resultado")
+                if not confirmar_agora:
+                    continue
 
                 # ✅ antes de dar TIMEOUT, confirma se baixou mesmo
                 try:
-                    if confirmar_se_baixou(driver, codigo, timeout=20):
+                    with medidor.span("confirmar_se_baixou", codigo, t):
+                        confirmado = confirmar_se_baixou(driver, codigo, timeout=20)
+                    if confirmado:
                         return "BAIXADO_OK"
                 except Exception:
                     pass
@@ -649,69 +1143,537 @@ def processar_com_tentativas(codigo: str) -> str:
                 time.sleep(0.5)
                 continue
 
-            screenshot(driver, f"outro_{codigo}_{status}_t{t}.png")
+            screenshot(driver, f"outro_{codigo}_{status}_t{t}.png", codigo, status)
             time.sleep(0.5)
 
-        except UnexpectedAlertPresentException:
-            txt = fechar_alerta_se_existir(driver)
-            screenshot(driver, f"unexpected_alert_{codigo}_t{t}.png")
-            if txt and sessao_expirada(txt):
-                input("\n👉 Sessão expirou. Faça login novamente e volte para Contas a Receber. ENTER... ")
-                garantir_na_tela_contas_receber(driver)
+        except UnexpectedAlertPresentException as e:
+            txt = fechar_alerta_se_existir(driver) or e.alert_text
+            screenshot(driver, f"unexpected_alert_{codigo}_t{t}.png", codigo, medidor.etapa_da_falha())
+            if (txt and sessao_expirada(txt)) or vigia_sessao.caiu(driver):
+                with medidor.span("relogar", codigo, t):
+                    relogar(driver, f"pedido {codigo}")
+                if relogins < RELOGINS_POR_PEDIDO:
+                    relogins += 1
+                    t -= 1
+                continue
+            ultimo = "ERRO"
+
+        except Exception as e:
+            screenshot(driver, f"erro_{codigo}_t{t}.png", codigo, medidor.etapa_da_falha(), html=True)
+
+            # etapa quebrou porque a sessão caiu no meio: re-login e o pedido volta
+            if vigia_sessao.checar(driver):
+                with medidor.span("relogar", codigo, t):
+                    relogar(driver, f"pedido {codigo}")
+                if relogins < RELOGINS_POR_PEDIDO:
+                    relogins += 1
+                    t -= 1
                 continue
 
-        except Exception:
-            screenshot(driver, f"erro_{codigo}_t{t}.png")
+            lento = isinstance(e, TimeoutException)
+            disjuntor.registrar(lento)
+            ultimo = "TIMEOUT" if lento else "ERRO"
+            if not confirmar_agora:
+                continue
 
             # ✅ antes de dizer que deu ERRO, tenta confirmar se baixou mesmo
             try:
-                if confirmar_se_baixou(driver, codigo, timeout=20):
+                with medidor.span("confirmar_se_baixou", codigo, t):
+                    confirmado = confirmar_se_baixou(driver, codigo, timeout=20)
+                if confirmado:
                     return "BAIXADO_OK"
             except Exception:
                 pass
 
             time.sleep(0.5)
 
-    return "ERRO"
+        finally:
+            # RELOGAR, alerta que não é de sessão, status fora da conta: o teste não teve veredito
+            disjuntor.liberar_sonda()
+
+    return ultimo
 
 # =====================================================
 # TESTE + LOOP
 # =====================================================
 
-if pedidos:
-    teste = str(pedidos[0]).strip()
+lock_status = threading.Lock()
+n_registrados = 0
+
+def salvar_checkpoint():
+    # só entrega o que mudou; a gravação roda no EscritorStatus sem travar o loop
+    escritor.agendar(ledger.retirar_alterados())
+    print(f"💾 Checkpoint agendado: {escritor.destino}\n")
+
+def registrar_resultado(codigo: str, status: str):
+    global n_registrados
+    with lock_status:
+        ledger.registrar(codigo, status)
+        if indice and status == "BAIXADO_OK":
+            indice.marcar_baixado(codigo)
+        diario.registrar(codigo, status, ledger.tentativas(codigo))
+        n_registrados += 1
+        if n_registrados % SALVAR_A_CADA == 0:
+            salvar_checkpoint()
+    if ADIAR_FALHAS and status in STATUS_ADIAVEIS:
+        fila_retentativas.adiar(codigo, status)
+
+def reconciliar(driver, codigos: list[str], relatorio: str | None = None) -> dict[str, str]:
+    """
+    Confere de uma vez, na listagem, pedidos com resultado ambíguo (TIMEOUT/ERRO). Quem o ERP
+    mostra baixado vira SIM no ledger e no diário numa passada só (uma transação).
+    Com `relatorio`, grava o CSV de discrepâncias planilha x ERP.
+    """
+    codigos = [c for c in dict.fromkeys(codigos) if not ledger.ja_baixado(c)]
+    if not codigos:
+        return {}
+
+    print(f"\n🧾 Reconciliação: conferindo {len(codigos)} pedidos de uma vez na listagem...")
+    url = URL
+    if URL_RECONCILIACAO:
+        ini, fim = intervalo_datas(registros, codigos)
+        url = URL_RECONCILIACAO.format(data_ini=ini or "", data_fim=fim or "")
+
+    linhas, paginas = {}, 0
+    with medidor.span("reconciliacao"):
+        for _ in (1, 2):
+            driver.get(url)
+            cache_seletores.invalidar(driver)
+            motor_espera.aguardar(driver, "listagem", (By.CSS_SELECTOR, RESULT_ROW_SELECTOR))
+            fechar_alerta_se_existir(driver)
+            if vigia_sessao.checar(driver):
+                relogar(driver, "na reconciliação")
+                continue
+            linhas, paginas = ler_linhas(
+                driver, codigos, RESULT_ROW_SELECTOR,
+                aguardar_pagina=lambda d: motor_espera.aguardar(d, "listagem", (By.CSS_SELECTOR, RESULT_ROW_SELECTOR)),
+                max_paginas=MAX_PAGINAS_INDICE, titulos=TITULOS_LISTAGEM,
+            )
+            break
+
+    situacoes = conciliar(codigos, linhas, SITUACOES_BAIXADO, so_baixados=bool(URL_RECONCILIACAO) and LISTAGEM_SO_BAIXADOS)
+    baixados = [c for c, st in situacoes.items() if st == "baixado"]
+    with lock_status:
+        antes = {c: ledger.status(c) for c in codigos}
+        for c in baixados:
+            ledger.registrar(c, "BAIXADO_OK")
+            if indice:
+                indice.marcar_baixado(c)
+        diario.registrar_lote((c, "BAIXADO_OK", ledger.tentativas(c)) for c in baixados)
+        depois = {c: ledger.status(c) for c in codigos}
+
+    n = Counter(situacoes.values())
+    print(f"✅ Reconciliação: {paginas} páginas lidas | {n['baixado']} já estavam baixados no ERP, "
+          f"{n['aberto']} em aberto, {n['ausente']} não apareceram")
+
+    if relatorio:
+        rel = relatorio_discrepancias(situacoes, antes, depois, linhas, registros)
+        rel.to_csv(relatorio, index=False, encoding="utf-8")
+        print(f"🧾 Discrepâncias: {int((rel['discrepancia'] != '').sum())} de {len(rel)} pedidos → {relatorio}")
+    return situacoes
+
+def rodar_retentativas(driver):
+    """
+    Depois da passada principal, em rodadas: primeiro uma reconciliação em lote tira da fila quem
+    o ERP já mostra baixado (salvar que gravou mas deu timeout); o resto volta na hora dele.
+    """
+    while len(fila_retentativas):
+        reconciliar(driver, fila_retentativas.codigos())
+        fila_retentativas.descartar(c for c in fila_retentativas.codigos() if ledger.ja_baixado(c))
+        if not len(fila_retentativas):
+            break
+        print(f"\n🔁 Retentativas: {len(fila_retentativas)} pedidos adiados (espera exponencial)...")
+        garantir_na_tela_contas_receber(driver)
+        for codigo in fila_retentativas.rodada():
+            if ledger.ja_baixado(codigo):
+                continue
+            print(f"🔁 {codigo} (rodada {fila_retentativas.rodadas[codigo]})")
+            with medidor.span("retentativa", codigo):
+                status = processar_com_tentativas(driver, codigo)
+            registrar_resultado(codigo, status)
+
+def fora_da_passada(codigo: str) -> bool:
+    """
+    Já baixado, ou com resultado ambíguo (TIMEOUT/ERRO: o salvar pode ter gravado). O ambíguo só
+    volta por rodar_retentativas, que reconcilia na listagem antes de refazer; nunca pela passada principal.
+    """
+    return (ledger.ja_baixado(codigo) or codigo in fila_retentativas
+            or ledger.status(codigo).strip().upper() in STATUS_AMBIGUOS)
+
+def worker(n: int, fila: queue.Queue, drv, conclusoes: list, total: int):
+    medidor.definir_worker(n)
+    try:
+        if drv is None:
+            drv = criar_driver(pasta_perfil_worker(n))
+            abrir_contas_receber(drv)
+            if MEDIR_REDE:
+                medidor_rede.coletar(drv, pedido=False)
+
+        while True:
+            try:
+                codigo = fila.get_nowait()
+            except queue.Empty:
+                return
+            print(f"w{n} " + medidor.linha_progresso(len(conclusoes) + 1, total, codigo))
+            t_pedido = time.perf_counter()
+            with medidor.span("pedido", codigo):
+                status = processar_com_tentativas(drv, codigo)
+            registrar_resultado(codigo, status)
+            conclusoes.append((n, time.time()))
+            medidor.pedido_concluido()
+            if MEDIR_REDE:
+                medidor_rede.coletar(drv)
+            drv = reciclar_se_preciso(drv, n, time.perf_counter() - t_pedido, status)
+    except Exception as e:
+        print(f"\n❌ Worker {n} parou: {e}")
+    finally:
+        if n != 0 and drv is not None:
+            reciclagem.esquecer(drv)
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+STATUS_FINAIS_ABRIR = ("NAO_ENCONTRADO", "PULADO_VALIDACAO", "JA_BAIXADO")
+
+def abrir_no_pipeline(codigo: str) -> str:
+    # abrir_conta_do_pedido sem deixar exceção escapar: o que não abriu volta para o caminho sequencial
+    try:
+        with medidor.span("abrir_conta", codigo):
+            return abrir_conta_do_pedido(driver, codigo)
+    except UnexpectedAlertPresentException as e:
+        if not fechar_alerta_se_existir(driver) and e.alert_text:
+            vigia_sessao.marcar(driver, e.alert_text)
+    except Exception:
+        pass
+    return "ERRO"
+
+def rodar_pipeline(abas: PipelineAbas, codigos, conclusoes: list, total: int):
+    """
+    Clica em salvar o borderô numa aba, abre a conta do próximo pedido na outra e só então volta
+    para esperar o salvar; na vez seguinte as abas trocam de papel. Proteções:
+    - fila sem IDs repetidos e ledger conferido de novo antes de preencher (nunca baixa duas vezes);
+    - sessão que caiu com um salvar em voo deixa esse pedido como ERRO: vai para a reconciliação e as
+      retentativas, nunca é dado como baixado nem refeito às cegas;
+    - o que sair do caminho feliz antes do clique em salvar volta para processar_com_tentativas.
+    """
+    global driver
+    fila = deque(c for c in dict.fromkeys(str(p).strip() for p in codigos) if not fora_da_passada(c))
+    sequencial: deque[str] = deque()
+    prontos: deque[tuple[str, str]] = deque()   # (codigo, status) resolvidos sem borderô (JA_BAIXADO...)
+    aberto = None                                 # (codigo, aba) com a conta aberta, esperando a vez
+
+    while fila or sequencial or prontos or aberto:
+        t_pedido = time.perf_counter()
+        if prontos:
+            codigo, status = prontos.popleft()
+
+        elif sequencial:
+            codigo = sequencial.popleft()
+            with medidor.span("pedido", codigo):
+                status = processar_com_tentativas(driver, codigo)
+
+        elif aberto is None:
+            codigo = fila.popleft()
+            st = abrir_no_pipeline(codigo)
+            if st == "OK":
+                aberto = (codigo, abas.atual)
+            elif st in STATUS_FINAIS_ABRIR:
+                prontos.append((codigo, st))
+            else:
+                sequencial.append(codigo)
+            continue
+
+        else:
+            codigo, aba = aberto
+            aberto = None
+            abas.ir(aba)
+            # a conta foi aberta antes do último salvar: confere de novo antes de preencher
+            if ledger.ja_baixado(codigo):
+                prontos.append((codigo, "JA_BAIXADO"))   # conta no progresso como no sequencial
+                continue
+            if vigia_sessao.caiu(driver):
+                sequencial.append(codigo)
+                continue
+
+            disjuntor.aguardar()
+            with lock_status:
+                ledger.iniciar_tentativa(codigo)
+            with medidor.span("pedido", codigo):
+                try:
+                    clicou = baixar_conta_aberta(driver, codigo, esperar_salvar=False) == "BAIXADO_OK"
+                except Exception:
+                    etapa = medidor.etapa_da_falha()
+                    screenshot(driver, f"erro_{codigo}_pipeline.png", codigo, etapa, html=True)
+                    clicou = None if etapa == "salvar_clique" else False
+                if clicou is False:
+                    # nada foi salvo: refaz do zero no caminho sequencial (que vira o pedido de teste)
+                    disjuntor.liberar_sonda()
+                    sequencial.append(codigo)
+                    continue
+
+                # ✅ salvar em voo: o Chrome grava esta conta enquanto a outra aba abre a próxima
+                t_clique = time.perf_counter()
+                adiantou = bool(fila) and bool(clicou) and not vigia_sessao.caiu(driver)
+                if adiantou:
+                    prox = fila.popleft()
+                    abas.ir(abas.outra())
+                    st = abrir_no_pipeline(prox)
+                    if st == "OK":
+                        aberto = (prox, abas.atual)
+                    elif st in STATUS_FINAIS_ABRIR:
+                        prontos.append((prox, st))
+                    else:
+                        sequencial.append(prox)
+                    abas.ir(aba)
+                t_volta = time.perf_counter()
+
+                status = "BAIXADO_OK" if clicou else "ERRO"
+                try:
+                    with medidor.span("salvar_espera", codigo):
+                        concluir_salvar(driver)
+                except UnexpectedAlertPresentException as e:
+                    if not fechar_alerta_se_existir(driver) and e.alert_text:
+                        vigia_sessao.marcar(driver, e.alert_text)
+                except Exception:
+                    status = "ERRO"
+                if adiantou:
+                    abas.registrar(t_volta - t_clique, time.perf_counter() - t_volta)
+                if vigia_sessao.caiu(driver):
+                    print(f"⚠️ {codigo}: sessão caiu com o salvar em voo; fica para a reconciliação")
+                    status = "ERRO"
+                disjuntor.registrar(False)
+
+        print(medidor.linha_progresso(len(conclusoes) + 1, total, codigo))
+        registrar_resultado(codigo, status)
+        conclusoes.append((0, time.time()))
+        medidor.pedido_concluido()
+        if MEDIR_REDE:
+            medidor_rede.coletar(driver)
+
+        n_reciclagens = reciclagem.vezes
+        driver = reciclar_se_preciso(driver, 0, time.perf_counter() - t_pedido, status)
+        if reciclagem.vezes != n_reciclagens:
+            # aba/Chrome novo: a conta que estava aberta na outra aba volta para a fila
+            if aberto:
+                fila.appendleft(aberto[0])
+                aberto = None
+            abas.abrir(driver, preparar_aba)
+
+    abas.fechar()
+
+def relatorio_throughput(n_workers: int, conclusoes: list, t_inicio: float):
+    minutos = max((time.time() - t_inicio) / 60, 1e-9)
+    total = len(conclusoes)
+    ppm = total / minutos
+
+    print(f"\n📈 Throughput: {total} pedidos em {minutos:.1f} min = {ppm:.1f} pedidos/min ({n_workers} workers)")
+    for n in range(n_workers):
+        feitos = sum(1 for w, _ in conclusoes if w == n)
+        print(f"   w{n}: {feitos} pedidos ({feitos / minutos:.1f}/min)")
+
+    # ✅ histórico por nº de workers, para ver o ganho de 1 → N
+    novo = not os.path.exists(ARQUIVO_THROUGHPUT)
+    with open(ARQUIVO_THROUGHPUT, "a", encoding="utf-8") as f:
+        if novo:
+            f.write("data,workers,pedidos,minutos,pedidos_por_minuto\n")
+        f.write(f"{datetime.now():%Y-%m-%d %H:%M:%S},{n_workers},{total},{minutos:.2f},{ppm:.2f}\n")
+
+    hist = pd.read_csv(ARQUIVO_THROUGHPUT)
+    escala = hist[hist["pedidos"] > 0].groupby("workers")["pedidos_por_minuto"].median()
+    if len(escala):
+        base = escala.iloc[0]
+        print("\n   workers | pedidos/min (mediana) | escala")
+        for w, v in escala.items():
+            print(f"   {w:>7} | {v:>21.1f} | {v / base:.2f}x")
+
+def baixar_via_http(pendentes: list[str]) -> tuple[Counter, set[str]]:
+    """
+    Passada rápida pelo backend HTTP para pedidos validados com id de conta conhecido (índice).
+    O que o ERP recusou continua pendente e vai para o fluxo normal pelo navegador. O que ficou
+    ambíguo (POST enviado sem resposta legível) sai como TIMEOUT e é devolvido à parte: não pode
+    ir para o navegador, senão a mesma conta é baixada duas vezes; a reconciliação decide.
+    """
+    trabalhos = []
+    for codigo in dict.fromkeys(pendentes):
+        reg = registros.get(codigo)
+        item = indice.get(codigo) if indice else None
+        id_conta = id_conta_da_url(item["destino"], ID_CONTA_REGEX) if item and item["estado"] == "aberto" else None
+        if reg is not None and id_conta and not ledger.ja_baixado(codigo):
+            trabalhos.append((codigo, id_conta, reg))
+
+    resultado = Counter()
+    ambiguos: set[str] = set()
+    if not trabalhos:
+        return resultado, ambiguos
+
+    cliente = ClienteBorderoHTTP(BORDERO_HTTP, sessao_do_driver(driver), CONEXOES_HTTP, TAXA_HTTP_POR_SEGUNDO)
+    parar = threading.Event()
+
+    def um(trabalho):
+        codigo, id_conta, reg = trabalho
+        if parar.is_set():
+            return "NAO_TENTADO"
+        with lock_status:
+            ledger.iniciar_tentativa(codigo)
+        st = cliente.baixar(id_conta, {
+            "data": reg.data_br,
+            "taxa": reg.taxa_br,
+            "desconto": reg.frete_br if (reg.frete_br is not None and reg.frete_num > 0) else "",
+            "valor": reg.valor_br,
+            "categoria": CATEGORIA_SHOPEE_VALUE,
+        })
+        if st in ("BAIXADO_OK", "TIMEOUT"):
+            registrar_resultado(codigo, st)
+            if st == "TIMEOUT":
+                with lock_status:
+                    ambiguos.add(codigo)
+        elif st == "RELOGAR":
+            # ✅ sessão caiu: para o HTTP e deixa o resto para o navegador (que trata o login)
+            parar.set()
+        return st
+
+    print(f"\n⚡ Backend HTTP: {len(trabalhos)} pedidos, {CONEXOES_HTTP} conexões, até {TAXA_HTTP_POR_SEGUNDO}/s")
+    t0 = time.time()
+    with ThreadPoolExecutor(CONEXOES_HTTP) as ex:
+        for st in ex.map(um, trabalhos):
+            resultado[st] += 1
+    cliente.fechar()
+
+    minutos = max((time.time() - t0) / 60, 1e-9)
+    print(f"✅ HTTP: {resultado['BAIXADO_OK']} baixados ({resultado['BAIXADO_OK'] / minutos:.0f}/min); "
+          f"fallback navegador: {sum(resultado.values()) - resultado['BAIXADO_OK'] - len(ambiguos)}, "
+          f"ambíguos para a reconciliação: {len(ambiguos)} {dict(resultado)}")
+    return resultado, ambiguos
+
+pendentes = [p for p in pedidos if not ledger.ja_baixado(p)]
+
+indice = None
+if USAR_INDICE_LISTAGEM and pendentes:
+    indice = IndiceListagem.carregar(ARQUIVO_INDICE, TTL_INDICE_HORAS)
+    print(f"\n📑 Indexando a listagem de Contas a Receber ({len(indice)} pedidos em cache)...")
+    garantir_na_tela_contas_receber(driver)
+    st_indice = indice.colher(
+        driver, set(pendentes), RESULT_ROW_SELECTOR, SITUACOES_BAIXADO,
+        aguardar_pagina=lambda d: motor_espera.aguardar(d, "listagem", (By.CSS_SELECTOR, RESULT_ROW_SELECTOR)),
+        max_paginas=MAX_PAGINAS_INDICE, titulos=TITULOS_LISTAGEM,
+    )
+    print(f"✅ Índice: {st_indice['paginas']} páginas lidas, {st_indice['indexados']} de "
+          f"{st_indice['faltavam']} pedidos encontrados")
+
+    # ✅ o que o ERP já mostra como baixado nem entra no loop
+    for codigo in dict.fromkeys(pendentes):
+        if indice.baixado(codigo):
+            registrar_resultado(codigo, "JA_BAIXADO")
+    pendentes = [p for p in pedidos if not ledger.ja_baixado(p)]
+    garantir_na_tela_contas_receber(driver)
+
+# ✅ ambíguos de uma execução anterior (TIMEOUT/ERRO na planilha/diário) entram direto na fila de
+# retentativas: são reconciliados antes de qualquer nova tentativa
+for codigo in dict.fromkeys(pendentes):
+    st = ledger.status(codigo).strip().upper()
+    if st in STATUS_AMBIGUOS and codigo not in fila_retentativas:
+        fila_retentativas.adiar(codigo, st)
+pendentes = [p for p in pendentes if not fora_da_passada(p)]
+
+if pendentes:
+    teste = str(pendentes[0]).strip()
     print(f"\n🔎 Teste com: {teste}")
-    print("   VALIDAÇÃO:", mapa_validacao.get(teste))
-    st = processar_com_tentativas(teste)
+    reg_teste = registros.get(teste)
+    print("   VALIDAÇÃO:", reg_teste.validacao if reg_teste else None)
+    st = processar_com_tentativas(driver, teste)
+    registrar_resultado(teste, st)
     print("Resultado teste:", st)
-    screenshot(driver, f"teste_{teste}_{st}.png")
+    screenshot(driver, f"teste_{teste}_{st}.png", teste, forcar=True)
     input("\nSe deu tudo certo, ENTER para iniciar tudo... ")
 
 print("\nIniciando...\n")
 
-for i, codigo in enumerate(pedidos, start=1):
-    codigo = str(codigo).strip()
-    print(f"[{i}/{len(pedidos)}] {codigo}")
-
-    status = processar_com_tentativas(codigo)
-
-    if status == "BAIXADO_OK":
-        df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS] = "SIM"
-    else:
-        atual = ""
-        try:
-            atual = df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS].iloc[0]
-        except Exception:
-            pass
-        if str(atual).strip().upper() != "SIM":
-            df.loc[df[COLUNA_CODIGO] == codigo, COLUNA_STATUS] = status
-
-    if i % SALVAR_A_CADA == 0:
-        df.to_excel(ARQUIVO_SAIDA, index=False)
-        print(f"💾 Checkpoint salvo: {ARQUIVO_SAIDA}\n")
+t_inicio = time.time()
+conclusoes = []
+if MEDIR_REDE:
+    # tráfego do login/índice/teste não entra na conta por pedido
+    medidor_rede.coletar(driver, pedido=False)
+
+if BACKEND_HTTP:
+    _, ambiguos_http = baixar_via_http(pendentes)
+    # ✅ POST enviado sem resposta: nem o loop nem o pipeline refazem; fila de retentativas/reconciliação decide
+    pedidos = [p for p in pedidos if p not in ambiguos_http]
+
+pipeline_abas = None
+# ✅ pedido de teste/HTTP que ficou ambíguo já está na fila de retentativas: não volta pela passada
+n_pendentes = sum(1 for p in dict.fromkeys(str(p).strip() for p in pedidos) if not fora_da_passada(p))
+
+if N_WORKERS > 1:
+    # ✅ IDs únicos na fila: dois workers nunca pegam o mesmo pedido
+    fila = queue.Queue()
+    for codigo in dict.fromkeys(str(p).strip() for p in pedidos):
+        if not fora_da_passada(codigo):
+            fila.put(codigo)
+
+    threads = [
+        threading.Thread(target=worker, args=(n, fila, driver if n == 0 else None, conclusoes, n_pendentes), daemon=True)
+        for n in range(N_WORKERS)
+    ]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+elif PIPELINE_ABAS:
+    pipeline_abas = PipelineAbas(driver, preparar_aba)
+    rodar_pipeline(pipeline_abas, pedidos, conclusoes, n_pendentes)
+else:
+    for i, codigo in enumerate(pedidos, start=1):
+        codigo = str(codigo).strip()
+
+        # ✅ já baixado (planilha ou diário) ou ambíguo (fica para as retentativas): pula sem tocar no navegador
+        if fora_da_passada(codigo):
+            continue
 
-df.to_excel(ARQUIVO_SAIDA, index=False)
+        print(medidor.linha_progresso(len(conclusoes) + 1, n_pendentes, codigo))
+
+        t_pedido = time.perf_counter()
+        with medidor.span("pedido", codigo):
+            status = processar_com_tentativas(driver, codigo)
+        registrar_resultado(codigo, status)
+        conclusoes.append((0, time.time()))
+        medidor.pedido_concluido()
+        if MEDIR_REDE:
+            medidor_rede.coletar(driver)
+        # ✅ Chrome inchado/lento ou caído é trocado aqui, entre pedidos, sem operador
+        driver = reciclar_se_preciso(driver, 0, time.perf_counter() - t_pedido, status)
+
+rodar_retentativas(driver)
+# ✅ o que sobrou ambíguo (inclusive de rodadas anteriores) é conferido de uma vez, com relatório
+reconciliar(driver, pedidos_ambiguos(ledger, df_pedidos[COLUNA_CODIGO]), relatorio=ARQUIVO_DISCREPANCIAS)
+
+with lock_status:
+    escritor.agendar(ledger.retirar_alterados())
+escritor.fechar()
 print("\n✅ Finalizado!")
-print("Arquivo salvo:", ARQUIVO_SAIDA)
-
-driver.quit()
+print("Arquivo salvo:", escritor.destino)
+
+if indice:
+    indice.salvar()
+
+relatorio_throughput(N_WORKERS, conclusoes, t_inicio)
+medidor.imprimir_resumo()
+medidor.fechar()
+if MEDIR_REDE:
+    medidor_rede.imprimir_resumo(ARQUIVO_REDE)
+motor_espera.imprimir_resumo()
+cache_seletores.imprimir_resumo()
+recuperador_sessao.imprimir_resumo()
+fila_retentativas.imprimir_resumo()
+disjuntor.imprimir_resumo()
+reciclagem.imprimir_resumo()
+if pipeline_abas:
+    pipeline_abas.imprimir_resumo()
+gravador_debug.fechar()
+if stats_preenchimento:
+    print(f"\n📝 Preenchimento: {stats_preenchimento['lote']} em lote, "
+          f"{stats_preenchimento['fallback_teclado']} tecla a tecla (conferência falhou)")
+
+diario.fechar()
+reciclagem.esquecer(driver)
+driver.quit()
\ No newline at end of file
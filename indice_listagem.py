@@ -0,0 +1,237 @@
+import json
+import os
+import time
+import unicodedata
+
+from selenium.webdriver.common.by import By
+
+# =====================================================
+# ÍNDICE DA LISTAGEM DE CONTAS A RECEBER (CACHE EM DISCO)
+# =====================================================
+
+# Títulos do cabeçalho da listagem: coluna do nº do pedido e coluna da situação da conta
+TITULOS_LISTAGEM = ("Pedido", "Situação")
+# Situações (texto exato da célula, sem acento/maiúscula importar) que contam como conta já baixada.
+# Nada de substring: "Não liquidado" não é "liquidado".
+SITUACOES_BAIXADO = ("recebida", "recebido", "baixada", "baixado", "paga", "pago", "liquidada", "liquidado")
+
+# Índice das colunas pelo título do <th> da tabela da linha (-1 = listagem sem essa coluna)
+JS_COLUNAS_PELO_TITULO = """
+function colunasPeloTitulo(tr, titulos) {
+    const tabela = tr && tr.closest('table');
+    const ths = tabela ? Array.from(tabela.querySelectorAll('thead th')) : [];
+    const norm = s => (s || '').trim().toLowerCase();
+    const nomes = ths.map(th => norm(th.innerText));
+    return titulos.map(t => nomes.indexOf(norm(t)));
+}
+"""
+
+# Uma chamada por página: texto das células, texto da linha, o destino do button-navigate e as
+# células do pedido/situação (null se a listagem não tiver a coluna)
+JS_COLHER_LINHAS = JS_COLUNAS_PELO_TITULO + """
+const [seletorLinhas, titulos] = arguments;
+function destino(tr) {
+    const btn = tr.querySelector('button.button-navigate');
+    const cands = [];
+    if (btn) {
+        cands.push(btn.getAttribute('data-href'), btn.getAttribute('data-url'), btn.getAttribute('href'));
+        const oc = btn.getAttribute('onclick') || '';
+        const m = oc.match(/['"]((?:https?:\\/\\/|\\/)[^'"]+)['"]/);
+        if (m) cands.push(m[1]);
+        const a = btn.closest('a');
+        if (a) cands.push(a.getAttribute('href'));
+    }
+    for (const c of cands) {
+        if (c && c !== '#' && !c.startsWith('javascript:')) {
+            try { return new URL(c, location.href).href; } catch (e) {}
+        }
+    }
+    return null;
+}
+const trs = Array.from(document.querySelectorAll(seletorLinhas));
+const [iCodigo, iSituacao] = colunasPeloTitulo(trs[0], titulos);
+return trs.map(tr => {
+    const celulas = Array.from(tr.querySelectorAll('td')).map(td => (td.innerText || '').trim());
+    return {
+        celulas: celulas,
+        texto: tr.innerText || '',
+        destino: destino(tr),
+        codigo: iCodigo >= 0 ? (celulas[iCodigo] ?? null) : null,
+        situacao: iSituacao >= 0 ? (celulas[iSituacao] ?? null) : null,
+    };
+});
+"""
+
+PROXIMA_PAGINA_SELECTORS = [
+    "ul.pagination li.next:not(.disabled) a",
+    "ul.pagination li:not(.disabled) a[rel='next']",
+    "a[rel='next']",
+    "button[aria-label*='Próxima']:not([disabled])",
+]
+
+
+class IndiceListagem:
+    """
+    ID do pedido -> {"estado": "aberto"/"baixado", "destino": url|None, "visto_em": epoch}.
+    "baixado" é definitivo; "aberto" vence depois de `ttl_horas` e volta a ser procurado.
+    """
+
+    def __init__(self, caminho: str, ttl_horas: float):
+        self.caminho = caminho
+        self.ttl = ttl_horas * 3600
+        self.itens: dict[str, dict] = {}
+
+    @classmethod
+    def carregar(cls, caminho: str, ttl_horas: float) -> "IndiceListagem":
+        indice = cls(caminho, ttl_horas)
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                indice.itens = json.load(f).get("itens", {})
+        except Exception:
+            pass
+        return indice
+
+    def salvar(self):
+        tmp = self.caminho + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"gerado_em": time.time(), "itens": self.itens}, f)
+        os.replace(tmp, self.caminho)
+
+    def __len__(self) -> int:
+        return len(self.itens)
+
+    def get(self, codigo: str) -> dict | None:
+        item = self.itens.get(codigo)
+        if item is None:
+            return None
+        if item["estado"] != "baixado" and time.time() - item["visto_em"] > self.ttl:
+            return None
+        return item
+
+    def baixado(self, codigo: str) -> bool:
+        item = self.get(codigo)
+        return bool(item) and item["estado"] == "baixado"
+
+    def marcar_baixado(self, codigo: str):
+        item = self.itens.get(codigo)
+        if item is not None:
+            item["estado"] = "baixado"
+            item["visto_em"] = time.time()
+
+    def faltando(self, codigos) -> set[str]:
+        return {c for c in codigos if self.get(c) is None}
+
+    def _registrar_linhas(self, linhas: list[dict], alvos: set[str], situacoes_baixado) -> int:
+        agora = time.time()
+        novos = 0
+        for ln in linhas:
+            codigo = _codigo_da_linha(ln, alvos)
+            if codigo is None:
+                continue
+            # situação desconhecida (listagem sem a coluna) fica "aberto": o pedido segue o fluxo normal
+            estado = "baixado" if situacao_da_linha(ln, situacoes_baixado) == "baixado" else "aberto"
+            if codigo not in self.itens or self.get(codigo) is None:
+                novos += 1
+            self.itens[codigo] = {"estado": estado, "destino": ln["destino"], "visto_em": agora}
+        return novos
+
+    def colher(self, driver, codigos, seletor_linhas: str, situacoes_baixado,
+               aguardar_pagina, max_paginas: int = 1000, salvar_a_cada: int = 50,
+               titulos: tuple[str, str] = TITULOS_LISTAGEM) -> dict:
+        """
+        Pagina a listagem já aberta e indexa as linhas dos pedidos em `codigos`.
+        Incremental: só procura o que falta/venceu e para assim que achar tudo.
+        aguardar_pagina(driver) é chamado depois de cada clique em "próxima".
+        "baixado" só quando a célula de situação (`titulos[1]`) é uma das `situacoes_baixado`.
+        """
+        alvos = self.faltando(codigos)
+        stats = {"paginas": 0, "indexados": 0, "faltavam": len(alvos)}
+        if not alvos:
+            return stats
+
+        for pagina, linhas in _paginas(driver, seletor_linhas, aguardar_pagina, max_paginas, titulos):
+            stats["indexados"] += self._registrar_linhas(linhas, alvos, situacoes_baixado)
+            stats["paginas"] = pagina
+
+            alvos = {c for c in alvos if self.get(c) is None}
+            if not alvos:
+                break
+
+            if pagina % salvar_a_cada == 0:
+                self.salvar()
+                print(f"   📑 {pagina} páginas lidas, faltam {len(alvos)} pedidos")
+
+        self.salvar()
+        return stats
+
+
+def ler_linhas(driver, codigos, seletor_linhas: str, aguardar_pagina, max_paginas: int = 1000,
+               titulos: tuple[str, str] = TITULOS_LISTAGEM) -> tuple[dict, int]:
+    """
+    Pagina a listagem já aberta sem olhar o cache e devolve ({codigo: linha}, páginas lidas) para os
+    `codigos` que aparecerem (células, texto e destino de cada linha). Para assim que achar todos.
+    """
+    alvos = set(codigos)
+    achados: dict[str, dict] = {}
+    paginas = 0
+    for paginas, linhas in _paginas(driver, seletor_linhas, aguardar_pagina, max_paginas, titulos):
+        for ln in linhas:
+            codigo = _codigo_da_linha(ln, alvos)
+            if codigo is not None:
+                achados[codigo] = ln
+                alvos.discard(codigo)
+        if not alvos:
+            break
+    return achados, paginas
+
+
+def _codigo_da_linha(ln: dict, alvos: set[str]) -> str | None:
+    # ✅ célula exatamente igual ao ID: a da coluna do pedido, se a listagem tiver esse título;
+    # senão qualquer célula inteira. Nunca token/substring do texto da linha.
+    if ln.get("codigo") is not None:
+        return ln["codigo"] if ln["codigo"] in alvos else None
+    return next((c for c in ln["celulas"] if c in alvos), None)
+
+
+def _sem_acento(s: str) -> str:
+    return unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+
+
+def situacao_da_linha(ln: dict, situacoes_baixado) -> str:
+    """
+    "baixado" / "aberto" pela célula de situação (texto exato, sem acento/maiúscula);
+    "desconhecido" se a listagem não tem a coluna de situação.
+    """
+    s = ln.get("situacao")
+    if s is None:
+        return "desconhecido"
+    baixado = {_sem_acento(x).strip().lower() for x in situacoes_baixado}
+    return "baixado" if _sem_acento(s).strip().lower() in baixado else "aberto"
+
+
+def _paginas(driver, seletor_linhas: str, aguardar_pagina, max_paginas: int,
+             titulos: tuple[str, str] = TITULOS_LISTAGEM):
+    # (página, linhas) até a última página ou até a listagem parar de mudar
+    assinatura_anterior = None
+    for pagina in range(1, max_paginas + 1):
+        linhas = driver.execute_script(JS_COLHER_LINHAS, seletor_linhas, list(titulos)) or []
+        assinatura = tuple(tuple(ln["celulas"]) for ln in linhas[:3])
+        if not linhas or assinatura == assinatura_anterior:
+            return
+        assinatura_anterior = assinatura
+        yield pagina, linhas
+        if not _ir_para_proxima_pagina(driver):
+            return
+        aguardar_pagina(driver)
+
+
+def _ir_para_proxima_pagina(driver) -> bool:
+    for css in PROXIMA_PAGINA_SELECTORS:
+        try:
+            for e in driver.find_elements(By.CSS_SELECTOR, css):
+                if e.is_displayed():
+                    driver.execute_script("arguments[0].click();", e)
+                    return True
+        except Exception:
+            continue
+    return False
@@ -0,0 +1,109 @@
+import time
+
+import pandas as pd
+
+# =====================================================
+# LEDGER DE STATUS (O(1) POR PEDIDO)
+# =====================================================
+
+STATUS_BAIXADO = "SIM"
+STATUS_JA_BAIXADO = "JA_BAIXADO"   # já estava baixado no ERP quando o robô chegou (não foi ele que baixou)
+STATUS_RESOLVIDOS = (STATUS_BAIXADO, STATUS_JA_BAIXADO)
+
+
+class EntradaLedger:
+    __slots__ = ("status", "tentativas", "primeira_tentativa_em", "atualizado_em")
+
+    def __init__(self, status: str = ""):
+        self.status = status
+        self.tentativas = 0
+        self.primeira_tentativa_em: float | None = None
+        self.atualizado_em: float | None = None
+
+
+class LedgerStatus:
+    """
+    Guarda o status de cada pedido num dict (ID do pedido -> EntradaLedger).
+    Quem muda fica marcado como alterado; no checkpoint retirar_alterados() entrega só esses
+    para o EscritorStatus gravar na planilha (o DataFrame de entrada não é tocado).
+    ja_baixado_como_sim=True grava "SIM" também para conta achada já baixada (padrão: "JA_BAIXADO").
+    """
+
+    def __init__(self, ja_baixado_como_sim: bool = False):
+        self._entradas: dict[str, EntradaLedger] = {}
+        self._sujos: set[str] = set()
+        self.ja_baixado_como_sim = ja_baixado_como_sim
+
+    @classmethod
+    def do_dataframe(cls, df: pd.DataFrame, coluna_codigo: str, coluna_status: str,
+                     ja_baixado_como_sim: bool = False) -> "LedgerStatus":
+        ledger = cls(ja_baixado_como_sim)
+        base = df[[coluna_codigo, coluna_status]].drop_duplicates(subset=coluna_codigo, keep="first")
+        codigos = base[coluna_codigo].astype(str).str.strip().tolist()
+        status = base[coluna_status].fillna("").astype(str).str.strip().tolist()
+        for codigo, st in zip(codigos, status):
+            if codigo and codigo.lower() != "nan":
+                ledger._entradas[codigo] = EntradaLedger(st)
+        return ledger
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def __contains__(self, codigo: str) -> bool:
+        return codigo in self._entradas
+
+    def _entrada(self, codigo: str) -> EntradaLedger:
+        e = self._entradas.get(codigo)
+        if e is None:
+            e = EntradaLedger()
+            self._entradas[codigo] = e
+        return e
+
+    def status(self, codigo: str) -> str:
+        e = self._entradas.get(codigo)
+        return e.status if e is not None else ""
+
+    def tentativas(self, codigo: str) -> int:
+        e = self._entradas.get(codigo)
+        return e.tentativas if e is not None else 0
+
+    def ja_baixado(self, codigo: str) -> bool:
+        # "SIM" ou "JA_BAIXADO": nos dois casos o pedido não volta para o ERP
+        return self.status(codigo).strip().upper() in STATUS_RESOLVIDOS
+
+    def iniciar_tentativa(self, codigo: str):
+        e = self._entrada(codigo)
+        agora = time.time()
+        e.tentativas += 1
+        if e.primeira_tentativa_em is None:
+            e.primeira_tentativa_em = agora
+        e.atualizado_em = agora
+
+    def registrar(self, codigo: str, resultado: str):
+        # ✅ "SIM" nunca é sobrescrito; "JA_BAIXADO" só por "SIM"
+        e = self._entrada(codigo)
+        atual = e.status.strip().upper()
+        if resultado == "BAIXADO_OK" or (resultado == "JA_BAIXADO" and self.ja_baixado_como_sim):
+            e.status = STATUS_BAIXADO
+        elif resultado == "JA_BAIXADO":
+            if atual != STATUS_BAIXADO:
+                e.status = STATUS_JA_BAIXADO
+        elif atual not in STATUS_RESOLVIDOS:
+            e.status = resultado
+        e.atualizado_em = time.time()
+        self._sujos.add(codigo)
+
+    def restaurar(self, codigo: str, resultado: str, tentativas: int, quando: float):
+        # usado ao reaplicar o diário de execução de uma rodada anterior
+        self.registrar(codigo, resultado)
+        e = self._entradas[codigo]
+        e.tentativas = max(e.tentativas, tentativas)
+        if e.primeira_tentativa_em is None:
+            e.primeira_tentativa_em = quando
+        e.atualizado_em = quando
+
+    def retirar_alterados(self) -> dict[str, str]:
+        # código -> status de quem mudou desde a última chamada (para o EscritorStatus)
+        alterados = {c: self._entradas[c].status for c in self._sujos}
+        self._sujos.clear()
+        return alterados
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import re
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from valores_br import EXCEL_EPOCA
+
+# =====================================================
+# LEITURA DA PLANILHA DE ENTRADA (SÓ AS COLUNAS USADAS + CACHE PARQUET)
+# =====================================================
+
+VERSAO_CACHE = 3   # 2: números de coluna misturada com vírgula decimal; 3: data serial em ISO
+RE_DATA_BR = re.compile(r"^\s*\d{1,2}/\d{1,2}/\d{4}")
+
+
+def hash_arquivo(caminho: str, bloco: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def _texto_codigo(v) -> str:
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return "" if v is None else str(v).strip()
+
+
+def _texto_numero(v) -> str:
+    # número de coluna misturada -> "1,845": vírgula decimal, sem milhar e sem expoente. Com ponto
+    # ("1.845") o valores_br leria milhar (R$ 1.845,00) em vez de R$ 1,85.
+    return format(Decimal(repr(float(v))), "f").replace(".", ",")
+
+
+def _texto_data_serial(v) -> str:
+    # data serial do Excel numa coluna de data misturada -> ISO (o texto "45321.0" não é data)
+    if 1 <= v < 2958466:
+        return (EXCEL_EPOCA + timedelta(days=float(v))).isoformat()
+    return str(v)
+
+
+def _tipar_coluna(valores: list, nome: str, coluna_codigo: str, coluna_data: str | None):
+    """
+    Coluna homogênea vira dtype nativo (float64 / datetime64). Coluna misturada vira texto num
+    formato que o preprocessamento lê igual ao valor original (datas em ISO, números com vírgula decimal).
+    """
+    if nome == coluna_codigo:
+        return pd.array([_texto_codigo(v) for v in valores], dtype="string")
+
+    tipos = {type(v) for v in valores if v is not None and not (isinstance(v, float) and np.isnan(v))}
+    if not tipos:
+        return pd.array([None] * len(valores), dtype=object)
+    # mesmos dtypes que o pd.read_excel daria: int64 só sem vazios, senão float64
+    if tipos == {int} and None not in valores:
+        return np.array(valores, dtype=np.int64)
+    if tipos <= {int, float}:
+        return np.array([np.nan if v is None else float(v) for v in valores], dtype=np.float64)
+    if all(issubclass(t, (date, np.datetime64)) for t in tipos):
+        return pd.to_datetime(pd.Series(valores, dtype=object)).to_numpy()
+
+    out = np.empty(len(valores), dtype=object)
+    for i, v in enumerate(valores):
+        if v is None or (isinstance(v, float) and np.isnan(v)):
+            out[i] = None
+        elif hasattr(v, "isoformat") and not isinstance(v, str):
+            out[i] = v.isoformat()
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[i] = _texto_data_serial(v) if nome == coluna_data else _texto_numero(v)
+        else:
+            out[i] = str(v)
+    return out
+
+
+def _montar_df(colunas: dict[str, list], coluna_codigo: str, coluna_data: str | None) -> pd.DataFrame:
+    return pd.DataFrame({
+        nome: _tipar_coluna(valores, nome, coluna_codigo, coluna_data) for nome, valores in colunas.items()
+    })
+
+
+def _ler_xlsx(caminho: str, colunas: list[str], coluna_codigo: str, aba) -> dict[str, list]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        if aba == "*":
+            abas = wb.worksheets
+        elif aba is None:
+            abas = [wb.worksheets[0]]
+        else:
+            abas = [wb[aba]]
+
+        saida = {c: [] for c in colunas}
+        presentes = set()
+        for ws in abas:
+            linhas = ws.iter_rows(values_only=True)
+            cabecalho = next(linhas, None)
+            if not cabecalho:
+                continue
+            pos = {str(h).strip(): i for i, h in enumerate(cabecalho) if h is not None}
+            if coluna_codigo not in pos:
+                if aba == "*":
+                    continue   # aba de resumo/outra coisa
+                raise ValueError(f"Coluna '{coluna_codigo}' não encontrada na aba '{ws.title}'")
+
+            usados = [(c, pos[c]) for c in colunas if c in pos]
+            presentes.update(c for c, _ in usados)
+            faltando = [c for c in colunas if c not in pos]
+            # ✅ só até a última coluna usada: o resto da linha nem vira objeto Python
+            ultimo = max(i for _, i in usados)
+            linhas = ws.iter_rows(min_row=2, max_col=ultimo + 1, values_only=True)
+            n = 0
+            for linha in linhas:
+                if not any(v is not None for v in linha):
+                    continue
+                for c, i in usados:
+                    saida[c].append(linha[i] if i < len(linha) else None)
+                n += 1
+            for c in faltando:
+                saida[c].extend([None] * n)
+        return {c: v for c, v in saida.items() if c in presentes}
+    finally:
+        wb.close()
+
+
+def _separador_csv(caminho: str) -> str:
+    with open(caminho, "r", encoding="utf-8-sig", errors="ignore") as f:
+        primeira = f.readline()
+    return ";" if primeira.count(";") > primeira.count(",") else ","
+
+
+def _ler_csv(caminho: str, colunas: list[str], coluna_data: str | None, chunk: int) -> dict[str, list]:
+    sep = _separador_csv(caminho)
+    partes = pd.read_csv(
+        caminho, sep=sep, usecols=lambda c: c.strip() in colunas, dtype=str,
+        encoding="utf-8-sig", chunksize=chunk, keep_default_na=False, na_values=[""],
+    )
+    df = pd.concat(list(partes), ignore_index=True)
+    df.columns = [c.strip() for c in df.columns]
+    saida = {c: df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns}
+
+    # CSV traz tudo como texto: "05/11/2025" é dia/mês (o Excel já entregaria datetime)
+    if coluna_data in saida:
+        saida[coluna_data] = [
+            pd.to_datetime(v, dayfirst=True, errors="coerce").to_pydatetime()
+            if isinstance(v, str) and RE_DATA_BR.match(v) else v
+            for v in saida[coluna_data]
+        ]
+        saida[coluna_data] = [None if v is pd.NaT else v for v in saida[coluna_data]]
+    return saida
+
+
+def ler_entrada(caminho: str, colunas: list[str], coluna_codigo: str, coluna_data: str | None = None,
+                aba=None, pasta_cache: str | None = ".cache_entrada", chunk: int = 100_000) -> pd.DataFrame:
+    """
+    Lê só `colunas` de .xlsx/.xlsm (openpyxl read-only), .csv (em blocos) ou .parquet.
+    `aba`: None = primeira, nome = essa, "*" = todas que tiverem a coluna do código (uma por mês).
+    Com `pasta_cache`, guarda um .parquet já tipado com nome = hash do arquivo + colunas/aba;
+    na próxima execução com o mesmo arquivo a leitura vem direto dele.
+    """
+    t0 = time.time()
+    ext = os.path.splitext(caminho)[1].lower()
+    colunas = list(dict.fromkeys(colunas))
+
+    if ext == ".parquet":
+        df = pd.read_parquet(caminho, columns=[c for c in colunas if c in _colunas_parquet(caminho)])
+        df[coluna_codigo] = df[coluna_codigo].map(_texto_codigo).astype("string")
+        print(f"📥 Entrada: {len(df)} linhas (parquet) em {time.time() - t0:.1f}s")
+        return df
+
+    cache = None
+    if pasta_cache:
+        chave = hashlib.sha256(
+            f"{VERSAO_CACHE}|{hash_arquivo(caminho)}|{aba}|{'|'.join(colunas)}".encode("utf-8")
+        ).hexdigest()[:32]
+        cache = os.path.join(pasta_cache, f"{chave}.parquet")
+        if os.path.exists(cache):
+            try:
+                df = pd.read_parquet(cache)
+                print(f"📥 Entrada: {len(df)} linhas (cache {os.path.basename(cache)}) em {time.time() - t0:.1f}s")
+                return df
+            except Exception:
+                pass
+
+    if ext == ".csv":
+        brutos = _ler_csv(caminho, colunas, coluna_data, chunk)
+    else:
+        brutos = _ler_xlsx(caminho, colunas, coluna_codigo, aba)
+    df = _montar_df(brutos, coluna_codigo, coluna_data)
+    print(f"📥 Entrada: {len(df)} linhas, {len(df.columns)} colunas ({ext[1:]}) em {time.time() - t0:.1f}s")
+
+    if cache:
+        try:
+            os.makedirs(pasta_cache, exist_ok=True)
+            tmp = cache + ".tmp"
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, cache)
+        except ImportError:
+            print("   (sem pyarrow/fastparquet: cache parquet desligado)")
+        except Exception as e:
+            print(f"   (não consegui gravar o cache parquet: {e})")
+    return df
+
+
+def _colunas_parquet(caminho: str) -> set[str]:
+    try:
+        import pyarrow.parquet as pq
+        return set(pq.ParquetFile(caminho).schema.names)
+    except ImportError:
+        return set(pd.read_parquet(caminho).columns)
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# =====================================================
+# MÉTRICAS: SPANS POR ETAPA, RESUMO E ETA
+# =====================================================
+
+def percentil(valores: list[float], p: float) -> float:
+    # p em 0..100, interpolação linear (igual ao np.percentile padrão); o único percentil do projeto
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p / 100
+    i = int(k)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (k - i)
+
+def _fmt_duracao(seg: float) -> str:
+    seg = int(seg)
+    h, m = divmod(seg // 60, 60)
+    return f"{h}h{m:02d}m" if h else f"{m}m{seg % 60:02d}s"
+
+
+class Medidor:
+    """
+    Cada span vira uma linha JSONL: {"etapa", "codigo", "tentativa", "inicio", "ms", "ok", "worker"}.
+    Opcionalmente mantém um textfile do Prometheus (node_exporter) atualizado.
+    """
+
+    def __init__(self, arquivo_jsonl: str | None, arquivo_prometheus: str | None = None,
+                 intervalo_prometheus: float = 30, janela_eta: int = 50):
+        self.arquivo_prometheus = arquivo_prometheus
+        self.intervalo_prometheus = intervalo_prometheus
+        self.duracoes: dict[str, list[float]] = defaultdict(list)
+        self.erros: dict[str, int] = defaultdict(int)
+        self.conclusoes: list[float] = []
+        self._recentes: deque = deque(maxlen=janela_eta)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._t0 = time.time()
+        self._ultimo_prom = 0.0
+        self._arq = open(arquivo_jsonl, "a", encoding="utf-8", buffering=1 << 16) if arquivo_jsonl else None
+
+    def definir_worker(self, worker: int):
+        self._local.worker = worker
+
+    @contextmanager
+    def span(self, etapa: str, codigo: str | None = None, tentativa: int | None = None):
+        inicio = time.time()
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException as e:
+            ok = False
+            if getattr(self._local, "excecao", None) is not e:
+                # a exceção passa por todos os spans abertos: guarda só o mais interno (onde nasceu)
+                self._local.excecao = e
+                self._local.etapa_falha = etapa
+            raise
+        finally:
+            self.registrar(etapa, (time.perf_counter() - t0), codigo, tentativa, ok, inicio)
+
+    def etapa_da_falha(self) -> str | None:
+        # etapa em que nasceu a última exceção desta thread (para o índice do debug)
+        return getattr(self._local, "etapa_falha", None)
+
+    def registrar(self, etapa: str, segundos: float, codigo: str | None = None, tentativa: int | None = None,
+                  ok: bool = True, inicio: float | None = None):
+        linha = {
+            "etapa": etapa,
+            "codigo": codigo,
+            "tentativa": tentativa,
+            "inicio": round(inicio if inicio is not None else time.time() - segundos, 3),
+            "ms": round(segundos * 1000, 1),
+            "ok": ok,
+            "worker": getattr(self._local, "worker", 0),
+        }
+        with self._lock:
+            self.duracoes[etapa].append(segundos)
+            if not ok:
+                self.erros[etapa] += 1
+            if self._arq:
+                self._arq.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        self._talvez_prometheus()
+
+    def pedido_concluido(self):
+        agora = time.time()
+        with self._lock:
+            self.conclusoes.append(agora)
+            self._recentes.append(agora)
+
+    def linha_progresso(self, feitos: int, total: int, codigo: str) -> str:
+        with self._lock:
+            recentes = list(self._recentes)
+        taxa = 0.0
+        if len(recentes) >= 2 and recentes[-1] > recentes[0]:
+            taxa = (len(recentes) - 1) / (recentes[-1] - recentes[0]) * 60
+        eta = _fmt_duracao((total - feitos) / taxa * 60) if taxa else "--"
+        return f"[{feitos}/{total}] {codigo} | {taxa:.1f}/min | ETA {eta}"
+
+    def _talvez_prometheus(self, forcar: bool = False):
+        if not self.arquivo_prometheus:
+            return
+        agora = time.time()
+        if not forcar and agora - self._ultimo_prom < self.intervalo_prometheus:
+            return
+        self._ultimo_prom = agora
+
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self.duracoes.items()}
+            erros = dict(self.erros)
+            n_pedidos = len(self.conclusoes)
+
+        linhas = [
+            "# HELP olist_rpa_etapa_segundos Duração das etapas do robô",
+            "# TYPE olist_rpa_etapa_segundos summary",
+        ]
+        for etapa, v in sorted(snapshot.items()):
+            for q in (0.5, 0.95, 0.99):
+                linhas.append(f'olist_rpa_etapa_segundos{{etapa="{etapa}",quantile="{q}"}} {percentil(v, q * 100):.4f}')
+            linhas.append(f'olist_rpa_etapa_segundos_sum{{etapa="{etapa}"}} {sum(v):.4f}')
+            linhas.append(f'olist_rpa_etapa_segundos_count{{etapa="{etapa}"}} {len(v)}')
+        linhas += ["# TYPE olist_rpa_etapa_erros_total counter"]
+        linhas += [f'olist_rpa_etapa_erros_total{{etapa="{e}"}} {n}' for e, n in sorted(erros.items())]
+        linhas += ["# TYPE olist_rpa_pedidos_total counter", f"olist_rpa_pedidos_total {n_pedidos}"]
+
+        tmp = self.arquivo_prometheus + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("\n".join(linhas) + "\n")
+            os.replace(tmp, self.arquivo_prometheus)
+        except OSError:
+            pass
+
+    def imprimir_resumo(self, janela_min: int = 10):
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self.duracoes.items()}
+            conclusoes = list(self.conclusoes)
+
+        if snapshot:
+            print("\n📊 Tempo por etapa (s):")
+            print(f"   {'etapa':<22} {'n':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'total':>9} {'erros':>6}")
+            for etapa, v in sorted(snapshot.items(), key=lambda kv: -sum(kv[1])):
+                print(f"   {etapa:<22} {len(v):>7} {percentil(v, 50):>7.2f} {percentil(v, 95):>7.2f} "
+                      f"{percentil(v, 99):>7.2f} {sum(v):>9.1f} {self.erros.get(etapa, 0):>6}")
+
+        if conclusoes:
+            print(f"\n📈 Pedidos/min a cada {janela_min} min:")
+            baldes = defaultdict(int)
+            for t in conclusoes:
+                baldes[int((t - self._t0) // (janela_min * 60))] += 1
+            for b in range(max(baldes) + 1):
+                n = baldes.get(b, 0)
+                print(f"   {b * janela_min:>4}-{(b + 1) * janela_min:<4} min | {n / janela_min:6.1f}/min | {'█' * min(n // 5, 60)}")
+
+        self._talvez_prometheus(forcar=True)
+
+    def fechar(self):
+        with self._lock:
+            if self._arq:
+                self._arq.close()
+                self._arq = None
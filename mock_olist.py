@@ -0,0 +1,543 @@
+"""
+Mock local do Olist (Contas a Receber) para medir o robô sem tocar em contas reais.
+
+    python mock_olist.py --porta 8765 --latencia 0.05 --pedidos 200
+
+Atende as telas que o gerar_olist.py usa:
+    /contas_receber                 listagem com #pesquisa-mini, lupa, tabela com button-navigate e paginação
+                                    (?situacao=recebida|aberto filtra, como o filtro de situação do ERP)
+    /contas_receber/conta/<id>      conta com "Receber/baixar", #linkUmaConta, selects e #taxa0/#desconto0/#valor0
+    /contas_receber/salvar_bordero/<id>   POST do borderô (o mesmo formato de BORDERO_HTTP)
+    /login                          login (#login, senha, "Entrar"); só com --exigir-login
+
+Injeção de falhas (probabilidades de 0 a 1): --falha-salvar, --busca-lenta, --erro-pagina;
+--expirar-a-cada N derruba a sessão a cada N borderôs salvos (alerta "Sua sessão expirou").
+Sem --exigir-login a página devolve a sessão sozinha depois do alerta (o "ENTER" do operador);
+com ele a sessão só volta por POST /login (usuário/senha) ou pelos cookies de --arquivo-cookies,
+que o mock regrava com um token novo a cada queda (um navegador logado renovando o cookie store).
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+COOKIE_SESSAO = "olist_sessao"
+TOKEN_SESSAO = "sessao-mock"
+
+ROTA_BORDERO = re.compile(r"^/contas_receber/salvar_bordero/(\d+)$")
+ROTA_CONTA = re.compile(r"^/contas_receber/conta/(\d+)$")
+
+ALERTA_SESSAO = "Sua sessão expirou ou foi feito login em outra máquina"
+POR_PAGINA = 50
+PRIMEIRO_ID = 100000
+
+CONTAS_CONTABEIS = [("737401193", "SHOPEE"), ("737401200", "MERCADO LIVRE"), ("737401201", "CAIXA")]
+CATEGORIAS = [("55", "RECEITA SHOPEE"), ("56", "OUTRAS RECEITAS")]
+
+
+class EstadoMock:
+    def __init__(self, latencia: float = 0.0, falha_salvar: float = 0.0, busca_lenta: float = 0.0,
+                 erro_pagina: float = 0.0, expirar_a_cada: int = 0, atraso_lento: float = 40.0, semente=None,
+                 exigir_login: bool = False, usuario: str = "robo", senha: str = "robo123",
+                 arquivo_cookies: str | None = None):
+        self.latencia = latencia
+        self.falha_salvar = falha_salvar
+        self.busca_lenta = busca_lenta
+        self.erro_pagina = erro_pagina
+        self.expirar_a_cada = expirar_a_cada
+        self.atraso_lento = atraso_lento
+        self.rng = random.Random(semente)
+        self.lock = threading.Lock()
+        self.baixados: dict[str, dict] = {}
+        self.requisicoes: list[dict] = []
+        self.contas: dict[str, dict] = {}
+        self.por_codigo: dict[str, str] = {}
+        self.sessao_expirada = False
+        self.salvos_na_sessao = 0
+        self.falhas_injetadas: Counter = Counter()
+        self.exigir_login = exigir_login
+        self.usuario = usuario
+        self.senha = senha
+        self.arquivo_cookies = arquivo_cookies
+        self.tokens: set[str] = set() if exigir_login else {TOKEN_SESSAO}
+        self.logins: Counter = Counter()
+
+    def registrar(self, metodo: str, caminho: str, campos: dict):
+        with self.lock:
+            self.requisicoes.append({"metodo": metodo, "caminho": caminho, "campos": campos, "em": time.time()})
+
+    def carregar_contas(self, pedidos, ja_baixados=()):
+        """
+        `pedidos`: iterável de (codigo, valor). Cada um vira uma conta com id sequencial;
+        os de `ja_baixados` já aparecem como "Recebida".
+        """
+        ja = set(ja_baixados)
+        with self.lock:
+            for codigo, valor in pedidos:
+                id_conta = str(PRIMEIRO_ID + len(self.contas))
+                self.contas[id_conta] = {
+                    "id": id_conta,
+                    "codigo": str(codigo),
+                    "cliente": f"Cliente {len(self.contas) + 1}",
+                    "vencimento": datetime.now().strftime("%d/%m/%Y"),
+                    "valor": float(valor),
+                }
+                self.por_codigo[str(codigo)] = id_conta
+                if codigo in ja:
+                    self.baixados[id_conta] = {}
+
+    def sortear(self, tipo: str, prob: float) -> bool:
+        if prob <= 0:
+            return False
+        with self.lock:
+            sim = self.rng.random() < prob
+            if sim:
+                self.falhas_injetadas[tipo] += 1
+        return sim
+
+    def situacao(self, id_conta: str) -> str:
+        return "Recebida" if id_conta in self.baixados else "Em aberto"
+
+    def codigos_baixados(self) -> set[str]:
+        with self.lock:
+            return {self.contas[i]["codigo"] for i in self.baixados if i in self.contas}
+
+    def novo_token(self) -> str:
+        # chamar com self.lock
+        token = f"sessao-{uuid.uuid4().hex[:12]}"
+        self.tokens.add(token)
+        return token
+
+    def derrubar_sessao(self):
+        # chamar com self.lock
+        self.sessao_expirada = True
+        self.falhas_injetadas["sessao_expirada"] += 1
+        if not self.exigir_login:
+            return
+        self.tokens.clear()
+        if self.arquivo_cookies:
+            cookies = [{"name": COOKIE_SESSAO, "value": self.novo_token(), "path": "/"}]
+            tmp = self.arquivo_cookies + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cookies, f)
+            os.replace(tmp, self.arquivo_cookies)
+
+
+def _br(v: float) -> str:
+    return f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+# A mensagem de "sem resultados" vem da API: nenhum script da página pode conter essa palavra,
+# senão o NO_RESULTS_XPATH (que lê o texto do documento inteiro) casaria sempre.
+PAGINA_LISTAGEM = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Contas a receber</title></head>
+<body>
+__ALERTA__
+<h3>Contas a receber</h3>
+<div class="input-group">
+  <input type="text" id="pesquisa-mini" name="pesquisa-mini" class="form-control" placeholder="Pesquisar">
+  <span class="input-group-btn"><button class="btn btn-default" type="button">Buscar</button></span>
+</div>
+<table class="table">
+  <thead><tr><th>Pedido</th><th>Cliente</th><th>Vencimento</th><th>Valor</th><th>Situação</th><th></th></tr></thead>
+  <tbody id="linhas"></tbody>
+</table>
+<ul class="pagination"><li id="proxima" class="next disabled"><a href="#">Próxima</a></li></ul>
+<script>
+let pagina = 1;
+const tbody = document.getElementById('linhas');
+const proxima = document.getElementById('proxima');
+function celula(tr, texto) {
+  const td = document.createElement('td');
+  td.textContent = texto;
+  tr.appendChild(td);
+  return td;
+}
+function carregar(p) {
+  const termo = document.getElementById('pesquisa-mini').value.trim();
+  tbody.innerHTML = '';
+  const xhr = new XMLHttpRequest();
+  const situacao = new URLSearchParams(location.search).get('situacao') || '';
+  xhr.open('GET', '/api/contas_receber?pesquisa=' + encodeURIComponent(termo) + '&pagina=' + p +
+           '&situacao=' + encodeURIComponent(situacao));
+  xhr.onload = function () {
+    const r = JSON.parse(xhr.responseText);
+    if (xhr.status !== 200) { alert(r.erro); return; }
+    pagina = r.pagina;
+    if (!r.linhas.length) {
+      celula(tbody.appendChild(document.createElement('tr')), r.mensagem).colSpan = 6;
+    }
+    for (const l of r.linhas) {
+      const tr = document.createElement('tr');
+      for (const v of [l.codigo, l.cliente, l.vencimento, l.valor, l.situacao]) celula(tr, v);
+      const b = document.createElement('button');
+      b.type = 'button';
+      b.className = 'btn button-navigate';
+      b.setAttribute('data-href', '/contas_receber/conta/' + l.id);
+      b.textContent = 'Abrir';
+      b.addEventListener('click', function () { location.href = b.getAttribute('data-href'); });
+      celula(tr, '').appendChild(b);
+      tbody.appendChild(tr);
+    }
+    proxima.className = r.pagina < r.paginas ? 'next' : 'next disabled';
+  };
+  xhr.send();
+}
+document.querySelector('span.input-group-btn > button').addEventListener('click', function () { carregar(1); });
+document.getElementById('pesquisa-mini').addEventListener('keydown', function (e) { if (e.key === 'Enter') carregar(1); });
+proxima.querySelector('a').addEventListener('click', function (e) {
+  e.preventDefault();
+  if (!proxima.classList.contains('disabled')) carregar(pagina + 1);
+});
+carregar(1);
+</script>
+</body></html>
+"""
+
+PAGINA_CONTA = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Conta a receber __CODIGO__</title></head>
+<body>
+__ALERTA__
+<h3>Conta a receber do pedido __CODIGO__</h3>
+<p>Situação: <span id="situacao">__SITUACAO__</span> | Valor: R$ __VALOR__</p>
+<a href="#" id="receberBaixar" class="btn btn-success"><i class="fa fa-check"></i> Receber/baixar</a>
+<div id="bordero" style="display:none">
+  <a href="#" id="linkUmaConta">Mais opções</a>
+  <div id="maisOpcoes" style="display:none">
+    <label for="idContaContabil">Conta contábil</label>
+    <select id="idContaContabil" name="idContaContabil"><option value="">Selecione</option></select>
+    <label for="idCategoria">Categoria</label>
+    <select id="idCategoria" name="idCategoria"><option value="">Selecione</option>__CATEGORIAS__</select>
+    <label for="data">Data</label>
+    <input type="text" id="data" name="data" value="__HOJE__">
+  </div>
+  <label>Taxas</label>
+  <input type="text" id="taxa0" name="taxa0" value="0,00">
+  <label>Desconto</label>
+  <input type="text" id="desconto0" name="desconto0" value="0,00">
+  <label>Valor</label>
+  <input type="text" id="valor0" name="valor0" value="__VALOR__">
+  <button type="button" id="salvarBordero" class="btn btn-primary">Salvar</button>
+</div>
+<script>
+const idConta = '__ID__';
+function get(url, ok) {
+  const xhr = new XMLHttpRequest();
+  xhr.open('GET', url);
+  xhr.onload = function () {
+    const r = JSON.parse(xhr.responseText);
+    if (xhr.status !== 200) { alert(r.erro); return; }
+    ok(r);
+  };
+  xhr.send();
+}
+document.getElementById('receberBaixar').addEventListener('click', function (e) {
+  e.preventDefault();
+  setTimeout(function () { document.getElementById('bordero').style.display = ''; }, 120);
+});
+document.getElementById('linkUmaConta').addEventListener('click', function (e) {
+  e.preventDefault();
+  document.getElementById('maisOpcoes').style.display = '';
+  const sel = document.getElementById('idContaContabil');
+  if (sel.options.length > 1) return;
+  get('/api/contas_contabeis', function (r) {
+    for (const [valor, texto] of r.opcoes) sel.add(new Option(texto, valor));
+  });
+});
+document.getElementById('salvarBordero').addEventListener('click', function () {
+  const campos = new URLSearchParams({ idConta: idConta });
+  for (const id of ['idContaContabil', 'idCategoria', 'data', 'taxa0', 'desconto0', 'valor0']) {
+    campos.set(id, document.getElementById(id).value);
+  }
+  const xhr = new XMLHttpRequest();
+  xhr.open('POST', '/contas_receber/salvar_bordero/' + idConta);
+  xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded; charset=UTF-8');
+  xhr.onload = function () {
+    const r = JSON.parse(xhr.responseText);
+    if (xhr.status === 200) { location.href = '/contas_receber'; return; }
+    alert(r.erro);
+  };
+  xhr.send(campos.toString());
+});
+</script>
+</body></html>
+"""
+
+PAGINA_LOGIN = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Login</title></head>
+<body>
+<h3>Entrar no Olist</h3>
+<p id="erro" style="color:red">__ERRO__</p>
+<form method="post" action="/login">
+  <input type="hidden" name="next" value="__NEXT__">
+  <label for="login">E-mail</label>
+  <input type="text" id="login" name="login" autocomplete="username">
+  <label for="senha">Senha</label>
+  <input type="password" id="senha" name="senha" autocomplete="current-password">
+  <button type="submit" id="entrar" class="btn btn-primary">Entrar</button>
+</form>
+</body></html>
+"""
+
+# ERP real: alerta de sessão e, depois do OK, cai na tela de login
+PAGINA_SAIU = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Sessão expirada</title></head>
+<body><script>alert(__ALERTA__); location.href = '/login?next=' + encodeURIComponent(location.pathname);</script></body></html>
+"""
+
+PAGINA_ERRO = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Erro</title></head>
+<body><h3>Erro 500</h3><p>Ocorreu um erro inesperado. Tente novamente.</p></body></html>
+"""
+
+
+class HandlerMock(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, igual ao ERP
+    estado: EstadoMock = None
+
+    def log_message(self, *args):
+        pass
+
+    def _cookies(self) -> dict:
+        out = {}
+        for parte in (self.headers.get("Cookie") or "").split(";"):
+            if "=" in parte:
+                k, v = parte.strip().split("=", 1)
+                out[k] = v
+        return out
+
+    def _sessao_ok(self) -> bool:
+        token = self._cookies().get(COOKIE_SESSAO)
+        with self.estado.lock:
+            if self.estado.exigir_login:
+                return token in self.estado.tokens
+            return token in self.estado.tokens and not self.estado.sessao_expirada
+
+    def _responder(self, status: int, corpo, tipo="application/json; charset=utf-8", headers=None):
+        dados = corpo if isinstance(corpo, bytes) else (
+            json.dumps(corpo).encode("utf-8") if not isinstance(corpo, str) else corpo.encode("utf-8")
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _ler_campos(self) -> dict:
+        n = int(self.headers.get("Content-Length") or 0)
+        bruto = self.rfile.read(n).decode("utf-8") if n else ""
+        if "json" in (self.headers.get("Content-Type") or ""):
+            return json.loads(bruto or "{}")
+        return {k: v[0] for k, v in parse_qs(bruto, keep_blank_values=True).items()}
+
+    def _pagina(self, html: str):
+        if self.estado.exigir_login:
+            return self._pagina_com_login(html)
+
+        # perfil clonado = já logado: a página entrega o cookie. Sessão derrubada pelo
+        # --expirar-a-cada mostra o alerta uma vez e volta logada (o "ENTER" do operador).
+        alerta = ""
+        with self.estado.lock:
+            if self.estado.sessao_expirada:
+                self.estado.sessao_expirada = False
+                alerta = f"<script>alert({json.dumps(ALERTA_SESSAO)});</script>"
+        cookie = {"Set-Cookie": f"{COOKIE_SESSAO}={TOKEN_SESSAO}; Path=/"}
+        self._responder(200, html.replace("__ALERTA__", alerta), "text/html; charset=utf-8", cookie)
+
+    def _pagina_com_login(self, html: str):
+        if self._sessao_ok():
+            return self._responder(200, html.replace("__ALERTA__", ""), "text/html; charset=utf-8")
+        with self.estado.lock:
+            avisar = self.estado.sessao_expirada
+            self.estado.sessao_expirada = False
+        if avisar:
+            return self._responder(200, PAGINA_SAIU.replace("__ALERTA__", json.dumps(ALERTA_SESSAO)),
+                                   "text/html; charset=utf-8")
+        destino = quote(urlsplit(self.path).path)
+        return self._responder(302, b"", "text/html; charset=utf-8", {"Location": f"/login?next={destino}"})
+
+    def _tela_login(self, proximo: str, erro: str = ""):
+        html = PAGINA_LOGIN.replace("__NEXT__", escape(proximo)).replace("__ERRO__", escape(erro))
+        return self._responder(200, html, "text/html; charset=utf-8")
+
+    def _login(self, campos: dict):
+        proximo = campos.get("next") or "/contas_receber"
+        if not proximo.startswith("/"):
+            proximo = "/contas_receber"
+        if campos.get("login") != self.estado.usuario or campos.get("senha") != self.estado.senha:
+            with self.estado.lock:
+                self.estado.logins["recusado"] += 1
+            return self._tela_login(proximo, "Usuário ou senha inválidos")
+        with self.estado.lock:
+            token = self.estado.novo_token()
+            self.estado.logins["ok"] += 1
+        return self._responder(302, b"", "text/html; charset=utf-8", {
+            "Location": proximo,
+            "Set-Cookie": f"{COOKIE_SESSAO}={token}; Path=/",
+        })
+
+    def do_GET(self):
+        if self.estado.latencia:
+            time.sleep(self.estado.latencia)
+
+        partes = urlsplit(self.path)
+        caminho = partes.path
+        qs = {k: v[0] for k, v in parse_qs(partes.query).items()}
+
+        if caminho in ("/", "/contas_receber"):
+            return self._pagina(PAGINA_LISTAGEM)
+
+        if caminho == "/login":
+            if self.estado.exigir_login and self._sessao_ok():
+                return self._responder(302, b"", "text/html; charset=utf-8", {"Location": "/contas_receber"})
+            return self._tela_login(qs.get("next", "/contas_receber"))
+
+        m = ROTA_CONTA.match(caminho)
+        if m:
+            conta = self.estado.contas.get(m.group(1))
+            if conta is None:
+                return self._responder(404, PAGINA_ERRO, "text/html; charset=utf-8")
+            if self.estado.sortear("erro_pagina", self.estado.erro_pagina):
+                return self._responder(500, PAGINA_ERRO, "text/html; charset=utf-8")
+            html = (PAGINA_CONTA
+                    .replace("__ID__", conta["id"])
+                    .replace("__CODIGO__", escape(conta["codigo"]))
+                    .replace("__SITUACAO__", self.estado.situacao(conta["id"]))
+                    .replace("__VALOR__", _br(conta["valor"]))
+                    .replace("__HOJE__", datetime.now().strftime("%d/%m/%Y"))
+                    .replace("__CATEGORIAS__", "".join(
+                        f'<option value="{v}">{t}</option>' for v, t in CATEGORIAS
+                    )))
+            return self._pagina(html)
+
+        if caminho == "/api/contas_receber":
+            if not self._sessao_ok():
+                return self._responder(401, {"erro": ALERTA_SESSAO})
+            if self.estado.sortear("busca_lenta", self.estado.busca_lenta):
+                time.sleep(self.estado.atraso_lento)
+            return self._responder(200, self._listar(qs.get("pesquisa", ""), int(qs.get("pagina") or 1),
+                                                     qs.get("situacao", "")))
+
+        if caminho == "/api/contas_contabeis":
+            if not self._sessao_ok():
+                return self._responder(401, {"erro": ALERTA_SESSAO})
+            return self._responder(200, {"opcoes": CONTAS_CONTABEIS})
+
+        if caminho == "/favicon.ico":
+            return self._responder(204, b"", "image/x-icon")
+
+        return self._responder(404, PAGINA_ERRO, "text/html; charset=utf-8")
+
+    def _listar(self, pesquisa: str, pagina: int, situacao: str = "") -> dict:
+        # ?situacao=recebida / ?situacao=aberto na URL da listagem filtra (como o filtro do ERP)
+        termo = pesquisa.strip()
+        filtro = {"recebida": "Recebida", "aberto": "Em aberto"}.get(situacao.strip().lower())
+        with self.estado.lock:
+            contas = [c for c in self.estado.contas.values()
+                      if (not termo or termo in c["codigo"])
+                      and (not filtro or self.estado.situacao(c["id"]) == filtro)]
+            paginas = max(1, -(-len(contas) // POR_PAGINA))
+            pagina = min(max(pagina, 1), paginas)
+            fatia = contas[(pagina - 1) * POR_PAGINA: pagina * POR_PAGINA]
+            linhas = [{
+                "id": c["id"],
+                "codigo": c["codigo"],
+                "cliente": c["cliente"],
+                "vencimento": c["vencimento"],
+                "valor": "R$ " + _br(c["valor"]),
+                "situacao": self.estado.situacao(c["id"]),
+            } for c in fatia]
+        return {
+            "linhas": linhas,
+            "pagina": pagina,
+            "paginas": paginas,
+            "mensagem": "" if linhas else "Nenhum registro encontrado",
+        }
+
+    def do_POST(self):
+        if self.estado.latencia:
+            time.sleep(self.estado.latencia)
+
+        caminho = urlsplit(self.path).path
+        campos = self._ler_campos()
+        if caminho == "/login":
+            return self._login(campos)
+        self.estado.registrar("POST", caminho, campos)
+
+        m = ROTA_BORDERO.match(caminho)
+        if not m:
+            return self._responder(404, {"ok": False, "erro": "rota desconhecida"})
+        if not self._sessao_ok():
+            return self._responder(401, {"ok": False, "erro": ALERTA_SESSAO})
+
+        id_conta = m.group(1)
+        if self.estado.contas and id_conta not in self.estado.contas:
+            return self._responder(404, {"ok": False, "erro": "conta não encontrada"})
+        if self.estado.sortear("falha_salvar", self.estado.falha_salvar):
+            return self._responder(500, {"ok": False, "erro": "Erro ao salvar o borderô. Tente novamente."})
+
+        with self.estado.lock:
+            if id_conta in self.estado.baixados:
+                return self._responder(409, {"ok": False, "erro": "conta já baixada"})
+            self.estado.baixados[id_conta] = campos
+            self.estado.salvos_na_sessao += 1
+            if self.estado.expirar_a_cada and self.estado.salvos_na_sessao >= self.estado.expirar_a_cada:
+                self.estado.salvos_na_sessao = 0
+                self.estado.derrubar_sessao()
+        return self._responder(200, {"ok": True, "mensagem": "Borderô salvo com sucesso"})
+
+
+def iniciar_mock(porta: int = 0, latencia: float = 0.0, **falhas):
+    """
+    Sobe o mock numa thread. Retorna (servidor, estado, url_base).
+    `falhas` vai para EstadoMock (falha_salvar, busca_lenta, erro_pagina, expirar_a_cada...).
+    """
+    estado = EstadoMock(latencia=latencia, **falhas)
+    handler = type("HandlerMockLigado", (HandlerMock,), {"estado": estado})
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Mock local do Olist (Contas a Receber)")
+    ap.add_argument("--porta", type=int, default=8765)
+    ap.add_argument("--latencia", type=float, default=0.0, help="segundos por requisição")
+    ap.add_argument("--pedidos", type=int, default=100, help="contas geradas (códigos 900000...)")
+    ap.add_argument("--falha-salvar", type=float, default=0.0, help="prob. do borderô voltar erro 500")
+    ap.add_argument("--busca-lenta", type=float, default=0.0, help="prob. da busca demorar --atraso-lento")
+    ap.add_argument("--atraso-lento", type=float, default=40.0)
+    ap.add_argument("--erro-pagina", type=float, default=0.0, help="prob. da conta abrir numa página de erro")
+    ap.add_argument("--expirar-a-cada", type=int, default=0, help="derruba a sessão a cada N borderôs")
+    ap.add_argument("--exigir-login", action="store_true", help="sessão só volta por /login ou cookies")
+    ap.add_argument("--usuario", default="robo")
+    ap.add_argument("--senha", default="robo123")
+    ap.add_argument("--arquivo-cookies", default=None, help="JSON de cookies regravado a cada queda de sessão")
+    args = ap.parse_args()
+
+    servidor, estado, url = iniciar_mock(
+        args.porta, args.latencia, falha_salvar=args.falha_salvar, busca_lenta=args.busca_lenta,
+        atraso_lento=args.atraso_lento, erro_pagina=args.erro_pagina, expirar_a_cada=args.expirar_a_cada,
+        exigir_login=args.exigir_login, usuario=args.usuario, senha=args.senha, arquivo_cookies=args.arquivo_cookies,
+    )
+    estado.carregar_contas((str(900000 + i), 100 + i % 50) for i in range(args.pedidos))
+    acesso = (f"login {args.usuario}/{args.senha}" if args.exigir_login
+              else f"cookie {COOKIE_SESSAO}={TOKEN_SESSAO}")
+    print(f"🧪 Mock Olist em {url}/contas_receber ({args.pedidos} contas, {acesso}). CTRL+C para sair.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
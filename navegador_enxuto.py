@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import psutil   # opcional: memória do Chrome no Windows/macOS
+except ImportError:
+    psutil = None
+
+# =====================================================
+# NAVEGADOR ENXUTO: HEADLESS + BLOQUEIO DE RECURSOS (CDP)
+# =====================================================
+
+FLAGS_ENXUTAS = [
+    "--headless=new",
+    "--window-size=1920,1080",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--mute-audio",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+]
+
+
+def regras_host(hosts_permitidos: list[str]) -> str | None:
+    # só os hosts da lista resolvem DNS; o resto vira NOTFOUND antes de abrir conexão
+    if not hosts_permitidos:
+        return None
+    return ", ".join(["MAP * ~NOTFOUND"] + [f"EXCLUDE {h}" for h in hosts_permitidos])
+
+
+def configurar_opcoes(options, config: dict, enxuto: bool, medir_rede: bool):
+    """
+    Flags/prefs do ChromeOptions. `config` é o BLOQUEIO_RECURSOS do gerar_olist.py.
+    """
+    if enxuto:
+        for flag in FLAGS_ENXUTAS:
+            options.add_argument(flag)
+        regras = regras_host(config.get("hosts_permitidos") or [])
+        if regras:
+            options.add_argument(f"--host-resolver-rules={regras}")
+
+    if medir_rede:
+        # eventos Network.* do DevTools lidos com driver.get_log("performance")
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def aplicar_bloqueio(driver, config: dict):
+    # Network.setBlockedURLs vale por aba: chamar de novo em abas novas
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(config.get("urls_bloqueadas") or [])})
+
+
+def _pids_linux(raiz: int) -> list[int]:
+    filhos: dict[int, list[int]] = {}
+    for nome in os.listdir("/proc"):
+        if not nome.isdigit():
+            continue
+        try:
+            with open(f"/proc/{nome}/stat", "rb") as f:
+                ppid = int(f.read().rsplit(b")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        filhos.setdefault(ppid, []).append(int(nome))
+    pids, pilha = [], [raiz]
+    while pilha:
+        pid = pilha.pop()
+        pids.append(pid)
+        pilha.extend(filhos.get(pid, []))
+    return pids
+
+
+def _mem_linux_kb(pid: int) -> int:
+    # PSS (divide páginas compartilhadas entre os processos) quando o kernel expõe; senão RSS
+    for arquivo, campo in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            with open(arquivo, encoding="ascii", errors="ignore") as f:
+                for linha in f:
+                    if linha.startswith(campo):
+                        return int(linha.split()[1])
+        except OSError:
+            continue
+    return 0
+
+
+def memoria_mb(driver) -> float | None:
+    """
+    Memória do chromedriver + Chrome + renderers desse driver, em MB. None se não der para medir.
+    """
+    try:
+        raiz = driver.service.process.pid
+    except AttributeError:
+        return None
+
+    if psutil is not None:
+        try:
+            p = psutil.Process(raiz)
+            procs = [p] + p.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / 1e6
+
+    if os.path.isdir("/proc"):
+        return sum(_mem_linux_kb(pid) for pid in _pids_linux(raiz)) * 1024 / 1e6
+    return None
+
+
+class MedidorRede:
+    """
+    Requisições, bytes e bloqueios por pedido (a partir do log de performance do chromedriver)
+    e amostras de memória do Chrome. Guarda um histórico por modo para comparar normal x enxuto.
+    """
+
+    def __init__(self, modo: str, amostrar_memoria_a_cada: int = 20):
+        self.modo = modo
+        self.amostrar_memoria_a_cada = amostrar_memoria_a_cada
+        self.requisicoes = 0
+        self.bytes = 0
+        self.bloqueadas = 0
+        self.pedidos = 0
+        self.memoria: list[float] = []
+        self._lock = threading.Lock()
+
+    def coletar(self, driver, pedido: bool = True):
+        """
+        Esvazia o log de performance do driver (chamar uma vez por pedido; o buffer cresce se ninguém ler).
+        Com pedido=False só descarta o que veio antes do loop (login, índice...).
+        """
+        try:
+            entradas = driver.get_log("performance")
+        except Exception:
+            return
+
+        req = byt = bloq = 0
+        for e in entradas:
+            try:
+                msg = json.loads(e["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            metodo = msg.get("method")
+            if metodo == "Network.requestWillBeSent":
+                if not msg["params"].get("request", {}).get("url", "").startswith("data:"):
+                    req += 1
+            elif metodo == "Network.loadingFinished":
+                byt += int(msg["params"].get("encodedDataLength") or 0)
+            elif metodo == "Network.loadingFailed":
+                p = msg["params"]
+                if p.get("blockedReason") or p.get("errorText") in ("net::ERR_BLOCKED_BY_CLIENT",
+                                                                    "net::ERR_NAME_NOT_RESOLVED"):
+                    bloq += 1
+
+        if not pedido:
+            return
+        with self._lock:
+            self.requisicoes += req
+            self.bytes += byt
+            self.bloqueadas += bloq
+            self.pedidos += 1
+            amostrar = self.pedidos % self.amostrar_memoria_a_cada == 1
+        if amostrar:
+            self.amostrar_memoria(driver)
+
+    def amostrar_memoria(self, driver):
+        mb = memoria_mb(driver)
+        if mb is not None:
+            with self._lock:
+                self.memoria.append(mb)
+
+    def imprimir_resumo(self, arquivo_historico: str | None):
+        with self._lock:
+            n = max(self.pedidos, 1)
+            linha = {
+                "data": f"{datetime.now():%Y-%m-%d %H:%M:%S}",
+                "modo": self.modo,
+                "pedidos": self.pedidos,
+                "req_por_pedido": round(self.requisicoes / n, 1),
+                "kb_por_pedido": round(self.bytes / n / 1024, 1),
+                "bloqueadas_por_pedido": round(self.bloqueadas / n, 1),
+                "mem_media_mb": round(sum(self.memoria) / len(self.memoria), 0) if self.memoria else "",
+                "mem_pico_mb": round(max(self.memoria), 0) if self.memoria else "",
+            }
+        if not self.pedidos:
+            return
+
+        print(f"\n🌐 Rede ({self.modo}): {linha['req_por_pedido']} req/pedido, {linha['kb_por_pedido']} KB/pedido, "
+              f"{linha['bloqueadas_por_pedido']} bloqueadas/pedido | memória Chrome "
+              f"{linha['mem_media_mb'] or 'n/d'} MB (pico {linha['mem_pico_mb'] or 'n/d'})")
+        if not arquivo_historico:
+            return
+
+        novo = not os.path.exists(arquivo_historico)
+        with open(arquivo_historico, "a", encoding="utf-8") as f:
+            if novo:
+                f.write(",".join(linha) + "\n")
+            f.write(",".join(str(v) for v in linha.values()) + "\n")
+
+        # ✅ economia do modo enxuto contra o normal (medianas do histórico)
+        hist = pd.read_csv(arquivo_historico)
+        hist = hist[hist["pedidos"] > 0]
+        por_modo = hist.groupby("modo")[["req_por_pedido", "kb_por_pedido", "mem_media_mb"]].median()
+        if {"normal", "enxuto"} <= set(por_modo.index):
+            normal, enxuto = por_modo.loc["normal"], por_modo.loc["enxuto"]
+            mem = normal["mem_media_mb"] - enxuto["mem_media_mb"]
+            print("   economia por pedido (enxuto x normal, medianas):")
+            print(f"   requisições {normal['req_por_pedido'] - enxuto['req_por_pedido']:.1f} | "
+                  f"KB {normal['kb_por_pedido'] - enxuto['kb_por_pedido']:.1f} | "
+                  f"memória {'n/d' if pd.isna(mem) else f'{mem:.0f} MB'}")
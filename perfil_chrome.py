@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import shutil
+
+# =====================================================
+# CLONE INCREMENTAL DO PERFIL DO CHROME
+# =====================================================
+
+# Só o que a sessão autenticada do Olist precisa (caminhos relativos ao perfil).
+# Cache, Code Cache, Service Worker, GPUCache etc. ficam de fora.
+ITENS_SESSAO = [
+    "Cookies",
+    "Cookies-journal",
+    "Network/Cookies",
+    "Network/Cookies-journal",
+    "Local Storage",
+    "Session Storage",
+    "IndexedDB/https_erp.olist.com_0.indexeddb.leveldb",
+    "Preferences",
+    "Secure Preferences",
+]
+
+# Relativos à pasta "User Data" (a chave que decifra os cookies fica no Local State)
+ITENS_USER_DATA = ["Local State"]
+
+MANIFESTO = ".manifesto_clone.json"
+
+
+def _sha256(caminho: str) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def _listar_arquivos(raiz: str, itens: list[str]):
+    # devolve caminhos relativos (com "/") de todos os arquivos dos itens que existirem
+    for item in itens:
+        origem = os.path.join(raiz, *item.split("/"))
+        if os.path.isfile(origem):
+            yield item
+        elif os.path.isdir(origem):
+            for pasta, _, arquivos in os.walk(origem):
+                for nome in arquivos:
+                    rel = os.path.relpath(os.path.join(pasta, nome), raiz)
+                    yield rel.replace(os.sep, "/")
+
+def _ler_manifesto(caminho: str) -> dict:
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _gravar_manifesto(caminho: str, manifesto: dict):
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f)
+    os.replace(tmp, caminho)
+
+def sincronizar(origem: str, destino: str, itens: list[str]) -> dict:
+    """
+    Copia de origem para destino só os arquivos de `itens` que mudaram.
+    Mesmo tamanho+mtime do manifesto = pula sem ler; mudou mas o hash bate = pula a cópia.
+    Retorna contadores: copiados, pulados, removidos, bytes.
+    """
+    os.makedirs(destino, exist_ok=True)
+    caminho_manifesto = os.path.join(destino, MANIFESTO)
+    anterior = _ler_manifesto(caminho_manifesto)
+    atual = {}
+    stats = {"copiados": 0, "pulados": 0, "removidos": 0, "bytes": 0}
+
+    for rel in _listar_arquivos(origem, itens):
+        src = os.path.join(origem, *rel.split("/"))
+        dst = os.path.join(destino, *rel.split("/"))
+        try:
+            st = os.stat(src)
+        except OSError:
+            continue
+
+        ref = anterior.get(rel)
+        existe = os.path.exists(dst)
+
+        if ref and existe and ref["tamanho"] == st.st_size and ref["mtime_ns"] == st.st_mtime_ns:
+            atual[rel] = ref
+            stats["pulados"] += 1
+            continue
+
+        try:
+            h = _sha256(src)
+        except OSError:
+            # arquivo travado (Chrome aberto?): mantém a cópia anterior se houver
+            if ref and existe:
+                atual[rel] = ref
+            continue
+
+        if not (ref and existe and ref["sha256"] == h):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(src, dst)
+            stats["copiados"] += 1
+            stats["bytes"] += st.st_size
+        else:
+            stats["pulados"] += 1
+
+        atual[rel] = {"tamanho": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": h}
+
+    # o que sumiu da origem sai do clone também
+    for rel in anterior.keys() - atual.keys():
+        try:
+            os.remove(os.path.join(destino, *rel.split("/")))
+            stats["removidos"] += 1
+        except OSError:
+            pass
+
+    _gravar_manifesto(caminho_manifesto, atual)
+    return stats
+
+def clonar_perfil_incremental(user_data_origem: str, perfil_origem: str,
+                              user_data_destino: str, perfil_destino: str) -> dict:
+    st_perfil = sincronizar(
+        os.path.join(user_data_origem, perfil_origem),
+        os.path.join(user_data_destino, perfil_destino),
+        ITENS_SESSAO,
+    )
+    st_raiz = sincronizar(user_data_origem, user_data_destino, ITENS_USER_DATA)
+    return {k: st_perfil[k] + st_raiz[k] for k in st_perfil}
+
+def clonar_workers(user_data_base: str, perfil: str, destinos: list[str]) -> list[dict]:
+    """
+    Gera os clones dos workers a partir do clone base (já enxuto), também incremental.
+    """
+    return [clonar_perfil_incremental(user_data_base, perfil, d, perfil) for d in destinos]
@@ -0,0 +1,84 @@
+import statistics
+import threading
+
+# =====================================================
+# PIPELINE EM DUAS ABAS (ABRE O PRÓXIMO ENQUANTO O BORDERÔ SALVA)
+# =====================================================
+
+
+class PipelineAbas:
+    """
+    Duas abas no mesmo driver (mesma sessão/cookies). O Selenium manda um comando por vez, mas o
+    Chrome continua carregando as duas: depois do clique em salvar numa aba, a outra já abre a conta
+    do próximo pedido, e só então o robô volta para esperar o que faltar do salvar.
+    `registrar()` guarda, por pedido, quanto da navegação do próximo rodou com o salvar em voo.
+    """
+
+    def __init__(self, driver, preparar, folga: float = 0.05):
+        self.folga = folga
+        self.pedidos = 0
+        self.escondido = 0.0            # medido: o salvar ainda corria ao voltar
+        self.escondido_estimado = 0.0   # estimado: o salvar acabou antes, não se sabe quando
+        self.adiantado: list[float] = []
+        self.espera: list[float] = []
+        self.salvar_medido: list[float] = []
+        self._lock = threading.Lock()
+        self.abrir(driver, preparar)
+
+    def abrir(self, driver, preparar):
+        """Abre a segunda aba (de novo, se o navegador foi reciclado). As métricas continuam."""
+        self.driver = driver
+        self.abas = [driver.current_window_handle]
+        driver.switch_to.new_window("tab")
+        self.abas.append(driver.current_window_handle)
+        preparar(driver)   # bloqueio de recursos é por aba; a aba nova também começa em Contas a Receber
+        driver.switch_to.window(self.abas[0])
+        self.atual = self.abas[0]
+
+    def outra(self) -> str:
+        return self.abas[1] if self.atual == self.abas[0] else self.abas[0]
+
+    def ir(self, aba: str):
+        if aba != self.atual:
+            self.driver.switch_to.window(aba)
+            self.atual = aba
+
+    def registrar(self, adiantado: float, espera: float):
+        """
+        adiantado: segundos abrindo o próximo na outra aba depois do clique em salvar;
+        espera: o que ainda faltou do salvar ao voltar.
+        Sobrou espera = o salvar durou a navegação inteira (toda ela ficou escondida, medido) e dá a
+        duração real do salvar; sem espera o salvar acabou em algum ponto da navegação, então o
+        escondido é só uma estimativa: o salvar típico medido (no máx. a navegação).
+        """
+        with self._lock:
+            self.pedidos += 1
+            self.adiantado.append(adiantado)
+            self.espera.append(espera)
+            if espera > self.folga:
+                self.salvar_medido.append(adiantado + espera)
+                self.escondido += adiantado
+            else:
+                ref = statistics.median(self.salvar_medido) if self.salvar_medido else adiantado
+                self.escondido_estimado += min(adiantado, ref)
+
+    def fechar(self):
+        # volta para uma aba só (a atual), para retentativas/reconciliação seguirem como sempre
+        outra = self.outra()
+        try:
+            self.driver.switch_to.window(outra)
+            self.driver.close()
+        except Exception:
+            pass
+        self.driver.switch_to.window(self.atual)
+
+    def imprimir_resumo(self):
+        if not self.pedidos:
+            return
+        ref = f"{statistics.median(self.salvar_medido):.2f}s" if self.salvar_medido else "n/d"
+        total = self.escondido + self.escondido_estimado
+        print(f"\n⏩ Pipeline em 2 abas: {self.pedidos} pedidos, latência escondida ~{total:.0f}s "
+              f"({total / self.pedidos:.2f}s/pedido; {self.escondido:.0f}s medidos + "
+              f"{self.escondido_estimado:.0f}s estimados) | próximo aberto com o salvar em voo "
+              f"p50 {statistics.median(self.adiantado):.2f}s, espera que sobrou p50 {statistics.median(self.espera):.2f}s, "
+              f"salvar medido p50 {ref}")
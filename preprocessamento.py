@@ -0,0 +1,301 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from valores_br import brl_coluna, centavos_coluna, datas_coluna
+
+# =====================================================
+# HELPERS DE FORMATAÇÃO (POR CÉLULA)
+# =====================================================
+# Caminho antigo (preprocessar_legado e benchmarks). O preprocessar usa o valores_br
+# (centavos inteiros, data com dia primeiro).
+
+def formatar_data_br(valor) -> str | None:
+    if pd.isna(valor):
+        return None
+    if isinstance(valor, (pd.Timestamp, datetime)):
+        return valor.strftime("%d/%m/%Y")
+    s = str(valor).strip()
+    if not s:
+        return None
+    dt = pd.to_datetime(s, errors="coerce", dayfirst=False)
+    if pd.isna(dt):
+        return None
+    return dt.strftime("%d/%m/%Y")
+
+def br_money(valor) -> str | None:
+    if valor is None or pd.isna(valor):
+        return None
+    if isinstance(valor, (int, float)):
+        return f"{float(valor):.2f}".replace(".", ",")
+    s = str(valor).strip()
+    if not s:
+        return None
+    s = s.replace("R$", "").replace(" ", "")
+    if "," in s and "." in s:
+        s = s.replace(".", "")
+    elif "." in s and "," not in s:
+        s = s.replace(".", ",")
+    try:
+        v = float(s.replace(".", "").replace(",", "."))
+        return f"{v:.2f}".replace(".", ",")
+    except Exception:
+        return s
+
+def valor_num(valor) -> float:
+    if valor is None or pd.isna(valor):
+        return 0.0
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    s = str(valor).strip()
+    if not s:
+        return 0.0
+    s = s.replace("R$", "").replace(" ", "")
+    if "," in s and "." in s:
+        s = s.replace(".", "")
+    s = s.replace(",", ".")
+    try:
+        return float(s)
+    except Exception:
+        return 0.0
+
+# =====================================================
+# STORE DE REGISTROS POR PEDIDO
+# =====================================================
+
+CAMPOS_REGISTRO = ("data_br", "taxa_br", "frete_br", "frete_num", "valor_br", "validacao")
+
+
+class RegistroPedido:
+    __slots__ = CAMPOS_REGISTRO
+
+    def __init__(self, data_br, taxa_br, frete_br, frete_num, valor_br, validacao):
+        self.data_br = data_br
+        self.taxa_br = taxa_br
+        self.frete_br = frete_br
+        self.frete_num = frete_num
+        self.valor_br = valor_br
+        self.validacao = validacao
+
+
+class RegistrosPedidos:
+    """
+    Um registro por pedido, guardado em colunas (listas/arrays) e indexado por ID.
+    Se o ID aparecer em mais de uma linha, vale a última (igual aos mapa_* antigos).
+    """
+
+    def __init__(self, codigos, data_br, taxa_br, frete_br, frete_num, valor_br, validacao):
+        self._pos = {c: i for i, c in enumerate(codigos) if c and c.lower() != "nan"}
+        self._data_br = data_br
+        self._taxa_br = taxa_br
+        self._frete_br = frete_br
+        self._frete_num = np.asarray(frete_num, dtype=np.float64)
+        self._valor_br = valor_br
+        self._validacao = validacao
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, codigo: str) -> bool:
+        return codigo in self._pos
+
+    def codigos(self):
+        return self._pos.keys()
+
+    def get(self, codigo: str) -> RegistroPedido | None:
+        i = self._pos.get(codigo)
+        if i is None:
+            return None
+        return RegistroPedido(
+            self._data_br[i], self._taxa_br[i], self._frete_br[i],
+            float(self._frete_num[i]), self._valor_br[i], self._validacao[i],
+        )
+
+    def mapas(self) -> dict[str, dict]:
+        # formato antigo (mapa_data, mapa_taxas, ...) para comparar com preprocessar_legado
+        out = {campo: {} for campo in CAMPOS_REGISTRO}
+        for codigo in self._pos:
+            reg = self.get(codigo)
+            for campo in CAMPOS_REGISTRO:
+                out[campo][codigo] = getattr(reg, campo)
+        return out
+
+# =====================================================
+# PRÉ-PROCESSAMENTO (VETORIZADO)
+# =====================================================
+
+def _coluna_data_br(serie: pd.Series) -> list:
+    return datas_coluna(serie)
+
+def _coluna_money_br(serie: pd.Series) -> list:
+    return brl_coluna(*centavos_coluna(serie))
+
+def _coluna_num(serie: pd.Series) -> np.ndarray:
+    # reais (float) a partir dos centavos; vazio/inválido = 0
+    return centavos_coluna(serie)[0] / 100
+
+def preprocessar(df: pd.DataFrame, coluna_codigo: str, coluna_data: str, coluna_taxas: str,
+                 coluna_frete: str, coluna_valor: str, coluna_validacao: str) -> RegistrosPedidos:
+    n = len(df)
+    vazio = pd.Series([None] * n, index=df.index, dtype=object)
+
+    def col(nome):
+        return df[nome] if nome in df.columns else vazio
+
+    codigos = col(coluna_codigo).astype(object).map(str).str.strip().tolist()
+    frete = col(coluna_frete)
+
+    if coluna_validacao in df.columns:
+        validacao = df[coluna_validacao].astype(object).map(str).str.strip().str.lower().tolist()
+    else:
+        validacao = [""] * n
+
+    return RegistrosPedidos(
+        codigos=codigos,
+        data_br=_coluna_data_br(col(coluna_data)),
+        taxa_br=_coluna_money_br(col(coluna_taxas)),
+        frete_br=_coluna_money_br(frete),
+        frete_num=_coluna_num(frete),
+        valor_br=_coluna_money_br(col(coluna_valor)),
+        validacao=validacao,
+    )
+
+# =====================================================
+# AGREGAÇÃO POR PEDIDO (RELATÓRIO SHOPEE COM VÁRIAS LINHAS POR ID)
+# =====================================================
+
+AGREGACOES = {"soma": "sum", "max": "max", "primeira": "first", "ultima": "last"}
+
+
+def agregar_por_pedido(df: pd.DataFrame, coluna_codigo: str, coluna_data: str, coluna_taxas: str,
+                       coluna_frete: str, coluna_valor: str, coluna_validacao: str,
+                       regras: dict[str, str],
+                       bloquear_conflitos: bool = True) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
+    """
+    Uma linha por pedido, na ordem da planilha. Linhas idênticas (export repetido) caem antes;
+    as demais (ajustes, reembolsos parciais, frete em linha separada) são combinadas por coluna
+    segundo `regras` ("soma", "max", "primeira", "ultima"). Devolve (pedidos, conflitos, bloqueados):
+    `conflitos` tem um pedido por linha com o motivo; `bloqueados` é a máscara (alinhada a `pedidos`)
+    dos que não podem ser baixados: com `bloquear_conflitos`, datas diferentes, validação divergente
+    ou líquido <= 0 depois de somar. A VALIDAÇÃO da planilha não é alterada.
+    """
+    vazio = pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    def col(nome):
+        return df[nome] if nome in df.columns else vazio
+
+    # colunas de dinheiro: as três do borderô + qualquer outra com regra (ex.: valor bruto) que exista
+    dinheiro = [coluna_taxas, coluna_frete, coluna_valor]
+    dinheiro += [c for c in regras if c not in dinheiro and c in df.columns]
+
+    codigos = col(coluna_codigo).astype(object).map(str).str.strip()
+    base = pd.DataFrame({
+        "codigo": codigos.to_numpy(),
+        "data": _coluna_data_br(col(coluna_data)),
+        "validacao": col(coluna_validacao).astype(object).map(str).str.strip().str.lower().to_numpy(),
+    })
+    for c in dinheiro:
+        # ✅ soma em centavos inteiros (exata); volta a reais só na saída
+        base[c], nulos = centavos_coluna(col(c))
+        base[f"_tem_{c}"] = ~nulos
+    base = base[(base["codigo"] != "") & (base["codigo"].str.lower() != "nan")]
+
+    repetida = base.duplicated(keep="first")
+    repetidas = repetida.groupby(base["codigo"], sort=False).sum()
+    base = base[~repetida]
+    base["ok"] = base["validacao"] == "ok"
+
+    g = base.groupby("codigo", sort=False)
+    agg = g.agg(
+        linhas=("codigo", "size"),
+        n_datas=("data", lambda s: s.nunique(dropna=False)),
+        data=("data", "first"),
+        todas_ok=("ok", "all"),
+        alguma_ok=("ok", "any"),
+        **{c: (c, AGREGACOES[regras.get(c, "soma")]) for c in dinheiro},
+        **{f"_tem_{c}": (f"_tem_{c}", "any") for c in dinheiro},
+    )
+    # validação do pedido: "ok" só se todas as linhas forem ok; senão a da primeira linha que não é
+    nao_ok = base.loc[~base["ok"]].groupby("codigo", sort=False)["validacao"].first()
+    agg["validacao"] = np.where(agg["todas_ok"], "ok", nao_ok.reindex(agg.index).fillna("").to_numpy())
+    agg["repetidas"] = repetidas.reindex(agg.index).fillna(0).astype(int)
+
+    motivos = pd.Series([[] for _ in range(len(agg))], index=agg.index, dtype=object)
+    regras_conflito = [
+        (agg["n_datas"] > 1, "datas diferentes", True),
+        (agg["alguma_ok"] & ~agg["todas_ok"], "validação divergente entre as linhas", True),
+        ((agg["linhas"] > 1) & (agg[coluna_valor] <= 0), "líquido <= 0 somando as linhas", True),
+        (agg["repetidas"] > 0, "linha repetida removida", False),
+    ]
+    bloqueado = pd.Series(False, index=agg.index)
+    for mascara, motivo, bloqueia in regras_conflito:
+        for codigo in agg.index[mascara]:
+            motivos[codigo].append(motivo)
+        if bloqueia:
+            bloqueado |= mascara
+    bloqueado &= bloquear_conflitos
+
+    pedidos = pd.DataFrame({
+        coluna_codigo: agg.index.to_numpy(),
+        # data já em dd/mm/aaaa: volta a datetime para o preprocessar não reinterpretar dia/mês
+        coluna_data: pd.to_datetime(agg["data"].to_numpy(), format="%d/%m/%Y", errors="coerce"),
+        # vazio em todas as linhas continua vazio (NaN), não vira 0,00
+        **{c: np.where(agg[f"_tem_{c}"], agg[c].to_numpy() / 100, np.nan) for c in dinheiro},
+        coluna_validacao: agg["validacao"].to_numpy(),
+    })
+
+    com_motivo = motivos.map(len) > 0
+    conflitos = pd.DataFrame({
+        "codigo": agg.index[com_motivo],
+        "linhas": agg.loc[com_motivo, "linhas"].to_numpy() + agg.loc[com_motivo, "repetidas"].to_numpy(),
+        "repetidas": agg.loc[com_motivo, "repetidas"].to_numpy(),
+        coluna_taxas: agg.loc[com_motivo, coluna_taxas].to_numpy() / 100,
+        coluna_frete: agg.loc[com_motivo, coluna_frete].to_numpy() / 100,
+        coluna_valor: agg.loc[com_motivo, coluna_valor].to_numpy() / 100,
+        "motivo": motivos[com_motivo].map("; ".join).to_numpy(),
+        "bloqueado": bloqueado[com_motivo].to_numpy(),
+    })
+    return pedidos, conflitos, pd.Series(bloqueado.to_numpy(), index=pedidos.index)
+
+# =====================================================
+# PRÉ-PROCESSAMENTO (REFERÊNCIA: LOOP ANTIGO COM ITERROWS)
+# =====================================================
+
+def preprocessar_legado(df: pd.DataFrame, coluna_codigo: str, coluna_data: str, coluna_taxas: str,
+                        coluna_frete: str, coluna_valor: str, coluna_validacao: str) -> dict[str, dict]:
+    """
+    Caminho antigo, linha a linha. Mantido só como referência para comparar
+    resultado e tempo com preprocessar().
+    """
+    datas = df[coluna_data].apply(formatar_data_br).tolist() if coluna_data in df.columns else None
+
+    mapa_data = {}
+    mapa_taxas = {}
+    mapa_frete = {}
+    mapa_valor = {}
+    mapa_validacao = {}
+    mapa_frete_num = {}
+
+    for pos, (_, row) in enumerate(df.iterrows()):
+        pid = str(row.get(coluna_codigo, "")).strip()
+        if not pid or pid.lower() == "nan":
+            continue
+
+        mapa_data[pid] = datas[pos] if datas is not None else None
+        mapa_taxas[pid] = br_money(row.get(coluna_taxas, None))
+        mapa_frete[pid] = br_money(row.get(coluna_frete, None))
+        mapa_frete_num[pid] = valor_num(row.get(coluna_frete, None))
+        mapa_valor[pid] = br_money(row.get(coluna_valor, None))
+
+        v = str(row.get(coluna_validacao, "")).strip().lower()
+        mapa_validacao[pid] = v
+
+    return {
+        "data_br": mapa_data,
+        "taxa_br": mapa_taxas,
+        "frete_br": mapa_frete,
+        "frete_num": mapa_frete_num,
+        "valor_br": mapa_valor,
+        "validacao": mapa_validacao,
+    }
@@ -0,0 +1,241 @@
+import statistics
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from navegador_enxuto import memoria_mb
+
+# =====================================================
+# RECICLAGEM DO CHROME (MEMÓRIA + TENDÊNCIA DE LENTIDÃO)
+# =====================================================
+
+CAIU = "Chrome não responde"
+CAMPOS_COOKIE = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+def vivo(driver) -> bool:
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException as e:
+        # alerta aberto não é Chrome caído
+        return "alert" in str(e).lower()
+
+
+def copiar_cookies(driver) -> list[dict]:
+    """
+    Todos os cookies do navegador (qualquer domínio) no formato do CDP; cai para os do domínio atual.
+    """
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    except Exception:
+        try:
+            cookies = [{**c, "expires": c["expiry"]} if "expiry" in c else c for c in driver.get_cookies()]
+        except Exception:
+            return []
+    out = []
+    for c in cookies:
+        sessao = c.get("session") or c.get("expires", -1) in (-1, None)
+        c = {k: v for k, v in c.items() if k in CAMPOS_COOKIE}
+        if sessao:
+            c.pop("expires", None)   # cookie de sessão: é justamente o que some ao reiniciar o Chrome
+        out.append(c)
+    return out
+
+
+def colar_cookies(driver, cookies: list[dict], url_base: str) -> int:
+    if not cookies:
+        return 0
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        return len(cookies)
+    except Exception:
+        pass
+    # sem CDP: add_cookie só aceita cookies do domínio aberto
+    driver.get(url_base)
+    n = 0
+    for c in cookies:
+        c = {("expiry" if k == "expires" else k): (int(v) if k == "expires" else v) for k, v in c.items()}
+        try:
+            driver.add_cookie(c)
+            n += 1
+        except WebDriverException:
+            pass
+    return n
+
+
+class ReciclagemNavegador:
+    """
+    Depois de milhares de pedidos o Chrome incha e cada etapa fica mais lenta, até cair.
+    `observar()` roda entre pedidos e diz quando reciclar: memória (processos do Chrome, ou heap JS
+    via CDP quando não dá para ver o processo) acima do limite, mediana dos últimos `janela` pedidos
+    acima de `fator_lentidao` x a dos primeiros, `max_pedidos` atingido ou Chrome que não responde.
+    `reciclar()` troca a aba (renderer novo, mesma sessão) e, a cada `abas_por_driver` trocas ou se o
+    Chrome caiu, reinicia o driver levando os cookies. Nunca recicla antes de `min_pedidos`.
+    """
+
+    def __init__(self, url: str, max_mb: float = 2500, max_heap_mb: float = 600, fator_lentidao: float = 1.8,
+                 janela: int = 30, amostrar_a_cada: int = 20, min_pedidos: int = 100, max_pedidos: int = 0,
+                 abas_por_driver: int = 3, status_suspeitos=("ERRO", "TIMEOUT")):
+        partes = urlsplit(url)
+        self.url_base = f"{partes.scheme}://{partes.netloc}/"
+        self.max_mb = max_mb
+        self.max_heap_mb = max_heap_mb
+        self.fator_lentidao = fator_lentidao
+        self.janela = janela
+        self.amostrar_a_cada = amostrar_a_cada
+        self.min_pedidos = min_pedidos
+        self.max_pedidos = max_pedidos
+        self.abas_por_driver = abas_por_driver
+        self.status_suspeitos = status_suspeitos
+        self.stats: Counter = Counter()
+        self.motivos: Counter = Counter()
+        self.pico_mb = 0.0
+        self.segundos = 0.0
+        self._estados: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()   # driver -> estado
+        self._lock = threading.Lock()
+
+    @property
+    def vezes(self) -> int:
+        with self._lock:
+            return sum(self.stats.values())
+
+    def _estado(self, driver) -> dict:
+        # ✅ pelo objeto do driver (id() de um driver fechado pode ser reusado por um novo)
+        with self._lock:
+            st = self._estados.get(driver)
+            if st is None:
+                st = self._estados[driver] = {"abas": 0, "cookies": []}
+                self._zerar(st)
+            return st
+
+    def esquecer(self, driver):
+        """Chamar antes de driver.quit(): contagem, linha de base e cookies daquele Chrome saem junto."""
+        with self._lock:
+            self._estados.pop(driver, None)
+
+    def _zerar(self, st: dict):
+        # depois de reciclar: contagem, linha de base e memória recomeçam
+        st.update(pedidos=0, inicio=[], base=None, recentes=deque(maxlen=self.janela), mem=None)
+
+    def medir(self, driver) -> tuple[float, float] | None:
+        """(MB, limite) da medida disponível: processos do Chrome ou, sem eles, heap JS da aba."""
+        mb = memoria_mb(driver)
+        if mb is not None:
+            return mb, self.max_mb
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            metricas = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            heap = next(m["value"] for m in metricas if m["name"] == "JSHeapTotalSize")
+            return heap / 1e6, self.max_heap_mb
+        except Exception:
+            return None
+
+    def observar(self, driver, segundos: float, status: str) -> str | None:
+        """
+        Chamar depois de cada pedido (ponto seguro: nenhum borderô aberto). Devolve o motivo
+        para reciclar agora, ou None.
+        """
+        st = self._estado(driver)
+        st["pedidos"] += 1
+
+        if status in self.status_suspeitos and not vivo(driver):
+            return CAIU
+
+        if status == "BAIXADO_OK":
+            if st["base"] is None:
+                st["inicio"].append(segundos)
+                if len(st["inicio"]) >= self.janela:
+                    st["base"] = statistics.median(st["inicio"])
+            else:
+                st["recentes"].append(segundos)
+
+        if st["pedidos"] % self.amostrar_a_cada == 0:
+            st["mem"] = self.medir(driver)
+            # ✅ foto dos cookies enquanto o Chrome está vivo: se ele cair, é com ela que o novo entra
+            st["cookies"] = copiar_cookies(driver) or st["cookies"]
+            if st["mem"]:
+                with self._lock:
+                    self.pico_mb = max(self.pico_mb, st["mem"][0])
+
+        if st["pedidos"] < self.min_pedidos:
+            return None
+        if self.max_pedidos and st["pedidos"] >= self.max_pedidos:
+            return f"limite: {st['pedidos']} pedidos desde a última reciclagem"
+        if st["mem"] and st["mem"][0] >= st["mem"][1]:
+            return f"memória: {st['mem'][0]:.0f} MB (limite {st['mem'][1]:.0f})"
+        if st["base"] and len(st["recentes"]) == self.janela:
+            atual = statistics.median(st["recentes"])
+            if atual >= self.fator_lentidao * st["base"]:
+                return f"lentidão: pedido levando {atual:.1f}s (no começo {st['base']:.1f}s)"
+        return None
+
+    def reciclar(self, driver, motivo: str, criar_driver, preparar):
+        """
+        Devolve o driver a usar daqui em diante (o mesmo, com aba nova, ou um novo).
+        criar_driver() abre um Chrome igual ao original; preparar(driver) deixa a aba pronta
+        (bloqueio de recursos, volta para Contas a Receber).
+        """
+        t0 = time.perf_counter()
+        st = self._estado(driver)
+        print(f"\n♻️ Reciclando o navegador: {motivo}")
+
+        if motivo != CAIU and st["abas"] < self.abas_por_driver:
+            try:
+                self._nova_aba(driver)
+                preparar(driver)
+                st["abas"] += 1
+                self._zerar(st)
+                self._contar("aba", motivo, t0)
+                return driver
+            except WebDriverException as e:
+                print(f"⚠️ Aba nova falhou ({e.__class__.__name__}): reiniciando o Chrome")
+
+        cookies = (copiar_cookies(driver) if motivo != CAIU else []) or st["cookies"]
+        self.esquecer(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+        novo = None
+        for tentativa in range(1, 4):
+            try:
+                novo = criar_driver()
+                break
+            except WebDriverException:
+                if tentativa == 3:
+                    raise
+                time.sleep(3)   # perfil ainda travado pelo Chrome antigo
+        levados = colar_cookies(novo, cookies, self.url_base)
+        print(f"   Chrome novo, {levados} cookies levados")
+        preparar(novo)
+        self._estado(novo)["cookies"] = cookies
+        self._contar("driver", motivo, t0)
+        return novo
+
+    def _nova_aba(self, driver):
+        # aba nova = renderer novo (a memória da aba velha vai embora com ela); sessão/cookies ficam
+        driver.switch_to.new_window("tab")
+        nova = driver.current_window_handle
+        for h in driver.window_handles:
+            if h != nova:
+                driver.switch_to.window(h)
+                driver.close()
+        driver.switch_to.window(nova)
+
+    def _contar(self, tipo: str, motivo: str, t0: float):
+        with self._lock:
+            self.stats[tipo] += 1
+            self.motivos[motivo.split(":")[0]] += 1
+            self.segundos += time.perf_counter() - t0
+
+    def imprimir_resumo(self):
+        if not self.stats and not self.pico_mb:
+            return
+        print(f"\n♻️ Navegador: {self.stats['aba']} abas novas, {self.stats['driver']} Chrome reiniciados "
+              f"({dict(self.motivos)}), {self.segundos:.0f}s reciclando | pico de memória {self.pico_mb:.0f} MB")
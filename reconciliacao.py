@@ -0,0 +1,116 @@
+from datetime import datetime
+
+import pandas as pd
+
+from indice_listagem import situacao_da_linha
+from valores_br import centavos
+
+# =====================================================
+# RECONCILIAÇÃO (CONFERÊNCIA EM LOTE NA LISTAGEM DO ERP)
+# =====================================================
+
+STATUS_AMBIGUOS = ("TIMEOUT", "ERRO", "RELOGAR")
+STATUS_FINAIS = ("SIM", "JA_BAIXADO", "", "NAO_ENCONTRADO", "PULADO_VALIDACAO")
+
+
+def pedidos_ambiguos(ledger, codigos) -> list[str]:
+    """
+    TIMEOUT/ERRO (desta execução ou de uma anterior, vindos da planilha/diário) e qualquer
+    status que não seja resultado final de um pedido que o robô chegou a tentar.
+    """
+    out = []
+    for codigo in dict.fromkeys(codigos):
+        st = ledger.status(codigo).strip().upper()
+        if st in STATUS_AMBIGUOS or (st not in STATUS_FINAIS and ledger.tentativas(codigo) > 0):
+            out.append(codigo)
+    return out
+
+
+def intervalo_datas(registros, codigos) -> tuple[str | None, str | None]:
+    # menor e maior data (dd/mm/aaaa) dos pedidos, para filtrar a listagem pelo período
+    datas = []
+    for codigo in codigos:
+        reg = registros.get(codigo)
+        if reg is None or not reg.data_br:
+            continue
+        try:
+            datas.append(datetime.strptime(reg.data_br, "%d/%m/%Y"))
+        except ValueError:
+            continue
+    if not datas:
+        return None, None
+    return min(datas).strftime("%d/%m/%Y"), max(datas).strftime("%d/%m/%Y")
+
+
+def valor_esperado(reg) -> float | None:
+    # valor da conta no ERP = líquido + taxas (o que o borderô baixa em valor0 + taxa0)
+    if reg is None or reg.valor_br is None:
+        return None
+    return ((centavos(reg.valor_br) or 0) + (centavos(reg.taxa_br) or 0)) / 100
+
+
+def valor_da_linha(celulas: list[str]) -> float | None:
+    for c in celulas:
+        if "R$" in c:
+            return (centavos(c) or 0) / 100
+    return None
+
+
+def conciliar(codigos, linhas: dict[str, dict], situacoes_baixado, so_baixados: bool = False) -> dict[str, str]:
+    """
+    codigo -> "baixado" / "aberto" / "ausente" / "indefinido", a partir das linhas lidas da listagem.
+    A situação vem da célula da coluna de situação (texto exato); listagem sem essa coluna dá
+    "indefinido", que nunca conta como baixado.
+    so_baixados=True: a listagem já veio filtrada por situação recebida, então quem não
+    aparece nela está em aberto (e quem aparece está baixado, qualquer que seja o texto).
+    """
+    out = {}
+    for codigo in codigos:
+        ln = linhas.get(codigo)
+        if ln is None:
+            out[codigo] = "aberto" if so_baixados else "ausente"
+        elif so_baixados:
+            out[codigo] = "baixado"
+        else:
+            situacao = situacao_da_linha(ln, situacoes_baixado)
+            out[codigo] = "indefinido" if situacao == "desconhecido" else situacao
+    return out
+
+
+def relatorio_discrepancias(situacoes: dict[str, str], antes: dict[str, str], depois: dict[str, str],
+                            linhas: dict[str, dict], registros) -> pd.DataFrame:
+    """
+    Uma linha por pedido conferido: status da planilha antes/depois, o que o ERP mostra e
+    valor da planilha x valor da conta no ERP. `discrepancia` vazio = planilha e ERP batem.
+    """
+    saida = []
+    for codigo, situacao in situacoes.items():
+        esperado = valor_esperado(registros.get(codigo))
+        ln = linhas.get(codigo)
+        no_erp = valor_da_linha(ln["celulas"]) if ln else None
+        diferenca = round(no_erp - esperado, 2) if (no_erp is not None and esperado is not None) else None
+
+        motivos = []
+        if situacao == "baixado":
+            motivos.append(f"baixado no ERP, planilha dizia {antes.get(codigo) or 'vazio'}")
+        elif situacao == "ausente":
+            motivos.append("não apareceu na listagem")
+        elif situacao == "indefinido":
+            motivos.append("listagem sem coluna de situação")
+        if diferenca is not None and abs(diferenca) > 0.01:
+            motivos.append("valor diferente")
+
+        saida.append({
+            "codigo": codigo,
+            "status_planilha": antes.get(codigo, ""),
+            "situacao_erp": situacao,
+            "status_final": depois.get(codigo, ""),
+            "valor_planilha": esperado,
+            "valor_erp": no_erp,
+            "diferenca": diferenca,
+            "discrepancia": "; ".join(motivos),
+        })
+    return pd.DataFrame(saida, columns=[
+        "codigo", "status_planilha", "situacao_erp", "status_final",
+        "valor_planilha", "valor_erp", "diferenca", "discrepancia",
+    ])
@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+import time
+import weakref
+from collections import Counter
+
+from selenium.common.exceptions import UnexpectedAlertPresentException
+from selenium.webdriver.common.keys import Keys
+
+# =====================================================
+# SESSÃO: VIGIA ENTRE ETAPAS + RE-LOGIN AUTOMÁTICO
+# =====================================================
+
+# tela de login = campo de senha visível ou rota de login (o ERP redireciona depois do alerta)
+JS_TELA_LOGIN = """
+const senha = document.querySelector("input[type='password']");
+return !!(senha && senha.offsetParent !== null) || /\\/(login|entrar|signin)/i.test(location.pathname);
+"""
+
+
+class VigiaSessao:
+    """
+    Guarda quais drivers perderam a sessão. O alerta "sessão expirou" costuma aparecer no meio
+    de uma etapa (depois do salvar, numa espera do motor) e é fechado ali mesmo; `marcar` anota
+    e `checar`, chamado entre etapas, avisa antes do robô gastar timeouts numa tela de login.
+    """
+
+    def __init__(self, eh_sessao_expirada):
+        self.eh_sessao_expirada = eh_sessao_expirada
+        self.deteccoes = Counter()
+        # pelo objeto driver, não pelo id(): Chrome reciclado que reaproveita o id nunca nasce "caído"
+        self._caidos: weakref.WeakSet = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def marcar(self, driver, texto_alerta: str | None = None, origem: str = "alerta") -> bool:
+        if texto_alerta is not None and not self.eh_sessao_expirada(texto_alerta):
+            return False
+        with self._lock:
+            self._caidos.add(driver)
+            self.deteccoes[origem] += 1
+        return True
+
+    def caiu(self, driver) -> bool:
+        with self._lock:
+            return driver in self._caidos
+
+    def checar(self, driver) -> bool:
+        # uma ida ao navegador; alerta aberto chega como UnexpectedAlertPresentException
+        if self.caiu(driver):
+            return True
+        try:
+            if driver.execute_script(JS_TELA_LOGIN):
+                return self.marcar(driver, origem="tela_login")
+        except UnexpectedAlertPresentException as e:
+            return self.marcar(driver, e.alert_text or "", origem="alerta")
+        except Exception:
+            pass
+        return False
+
+    def limpar(self, driver):
+        with self._lock:
+            self._caidos.discard(driver)
+
+
+def _fechar_alerta(driver):
+    try:
+        driver.switch_to.alert.accept()
+    except Exception:
+        pass
+
+
+def _ir(driver, url: str):
+    try:
+        driver.get(url)
+    except UnexpectedAlertPresentException:
+        driver.get(url)
+    _fechar_alerta(driver)
+
+
+def _achar(driver, estrategias: list[tuple[str, str]]):
+    for by, valor in estrategias:
+        try:
+            for el in driver.find_elements(by, valor):
+                if el.is_displayed():
+                    return el
+        except Exception:
+            continue
+    return None
+
+
+def _esperar(driver, estrategias: list[tuple[str, str]], timeout: float):
+    fim = time.time() + timeout
+    while True:
+        el = _achar(driver, estrategias)
+        if el is not None or time.time() >= fim:
+            return el
+        time.sleep(0.2)
+
+
+class RecuperadorSessao:
+    """
+    Refaz o login sem operador. Ordem:
+      1. cookies de `arquivo_cookies` (JSON no formato do driver.get_cookies() ou {"cookies": [...]}),
+         só se o arquivo mudou desde a última vez que foi usado nesse driver (cookie store renovado por fora);
+      2. usuário/senha na tela de login (`seletores`: "usuario", "senha", "entrar"; login em 1 ou 2 passos).
+    `confirmar(driver)` diz se voltou logado (ex.: campo de busca de Contas a Receber na tela).
+    Um re-login por vez: com vários workers o segundo espera o primeiro terminar.
+    """
+
+    def __init__(self, url_login: str, url_destino: str, seletores: dict, confirmar,
+                 usuario: str = "", senha: str = "", arquivo_cookies: str | None = None, timeout: float = 30):
+        self.url_login = url_login
+        self.url_destino = url_destino
+        self.seletores = seletores
+        self.confirmar = confirmar
+        self.usuario = usuario
+        self.senha = senha
+        self.arquivo_cookies = arquivo_cookies
+        self.timeout = timeout
+        self.stats = Counter()
+        self.segundos = 0.0
+        self._cookies_usados: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()   # driver -> mtime usado
+        self._lock = threading.Lock()
+
+    @property
+    def configurado(self) -> bool:
+        return bool(self.arquivo_cookies or (self.usuario and self.senha))
+
+    def recuperar(self, driver) -> bool:
+        with self._lock:
+            t0 = time.time()
+            try:
+                for metodo, func in (("cookies", self._por_cookies), ("senha", self._por_senha)):
+                    try:
+                        if func(driver):
+                            self.stats[metodo] += 1
+                            print(f"🔐 Sessão recuperada ({metodo}) em {time.time() - t0:.1f}s")
+                            return True
+                    except Exception as e:
+                        print(f"   ⚠️ Re-login por {metodo} falhou: {e}")
+                self.stats["falhas"] += 1
+                return False
+            finally:
+                self.segundos += time.time() - t0
+
+    def _por_cookies(self, driver) -> bool:
+        if not self.arquivo_cookies or not os.path.exists(self.arquivo_cookies):
+            return False
+        mtime = os.path.getmtime(self.arquivo_cookies)
+        if self._cookies_usados.get(driver) == mtime:
+            return False   # mesmo arquivo que já falhou/expirou nesse driver
+
+        with open(self.arquivo_cookies, "r", encoding="utf-8") as f:
+            cookies = json.load(f)
+        if isinstance(cookies, dict):
+            cookies = cookies.get("cookies", [])
+        self._cookies_usados[driver] = mtime
+
+        # add_cookie só vale para o domínio aberto
+        _ir(driver, self.url_destino)
+        driver.delete_all_cookies()
+        n = 0
+        for c in cookies:
+            cookie = {k: c[k] for k in ("name", "value", "path", "domain", "secure", "httpOnly") if c.get(k) is not None}
+            expira = c.get("expiry", c.get("expirationDate"))
+            if expira:
+                cookie["expiry"] = int(expira)
+            try:
+                driver.add_cookie(cookie)
+                n += 1
+            except Exception:
+                # exportado de outro host (.olist.com x erp.olist.com): tenta no domínio atual
+                cookie.pop("domain", None)
+                try:
+                    driver.add_cookie(cookie)
+                    n += 1
+                except Exception:
+                    pass
+        if not n:
+            return False
+        _ir(driver, self.url_destino)
+        return self.confirmar(driver)
+
+    def _por_senha(self, driver) -> bool:
+        if not (self.usuario and self.senha):
+            return False
+
+        try:
+            na_tela = driver.execute_script(JS_TELA_LOGIN)
+        except UnexpectedAlertPresentException:
+            na_tela = driver.execute_script(JS_TELA_LOGIN)
+        if not na_tela:
+            _ir(driver, self.url_login)
+
+        campo_usuario = _esperar(driver, self.seletores["usuario"] + self.seletores["senha"], self.timeout)
+        if campo_usuario is None:
+            raise RuntimeError("tela de login sem campo de usuário/senha")
+
+        campo_senha = _achar(driver, self.seletores["senha"])
+        if campo_senha is None or campo_senha == campo_usuario:
+            campo_usuario = _achar(driver, self.seletores["usuario"])
+        if campo_usuario is not None:
+            campo_usuario.clear()
+            campo_usuario.send_keys(self.usuario)
+
+        if campo_senha is None:
+            # login em 2 passos: e-mail → "Continuar" → senha
+            botao = _achar(driver, self.seletores["entrar"])
+            if botao is not None:
+                botao.click()
+            else:
+                campo_usuario.send_keys(Keys.ENTER)
+            campo_senha = _esperar(driver, self.seletores["senha"], self.timeout)
+            if campo_senha is None:
+                raise RuntimeError("campo de senha não apareceu")
+
+        campo_senha.clear()
+        campo_senha.send_keys(self.senha)
+        botao = _achar(driver, self.seletores["entrar"])
+        if botao is not None:
+            botao.click()
+        else:
+            campo_senha.send_keys(Keys.ENTER)
+
+        fim = time.time() + self.timeout
+        while time.time() < fim:
+            time.sleep(0.3)
+            try:
+                if not driver.execute_script(JS_TELA_LOGIN):
+                    break
+            except UnexpectedAlertPresentException:
+                continue
+        else:
+            raise RuntimeError("continuou na tela de login (usuário/senha recusados?)")
+
+        _ir(driver, self.url_destino)
+        return self.confirmar(driver)
+
+    def imprimir_resumo(self):
+        n = self.stats["cookies"] + self.stats["senha"]
+        if not (n or self.stats["falhas"]):
+            return
+        print(f"\n🔐 Re-login automático: {n} ({self.stats['cookies']} por cookies, {self.stats['senha']} por senha), "
+              f"{self.stats['falhas']} falhas, {self.segundos / max(n + self.stats['falhas'], 1):.1f}s em média")
@@ -0,0 +1,112 @@
+import threading
+import weakref
+from collections import Counter
+
+# =====================================================
+# CACHE DE SELETORES (APRENDE QUAL ESTRATÉGIA FUNCIONA)
+# =====================================================
+
+# Testa as estratégias em ordem numa única chamada e devolve [elemento, índice]
+JS_RESOLVER = """
+const estrategias = arguments[0];
+function utilizavel(el) {
+    if (el.disabled) return false;
+    const r = el.getBoundingClientRect();
+    return (r.width > 0 || r.height > 0) && getComputedStyle(el).visibility !== 'hidden';
+}
+for (let i = 0; i < estrategias.length; i++) {
+    const [by, sel] = estrategias[i];
+    let els = [];
+    try {
+        if (by === 'id') {
+            const e = document.getElementById(sel);
+            els = e ? [e] : [];
+        } else if (by === 'name') {
+            els = document.getElementsByName(sel);
+        } else if (by === 'xpath') {
+            const r = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let k = 0; k < r.snapshotLength; k++) els.push(r.snapshotItem(k));
+        } else {
+            els = document.querySelectorAll(sel);
+        }
+    } catch (e) {
+        continue;
+    }
+    for (const el of els) {
+        if (utilizavel(el)) return [el, i];
+    }
+}
+return null;
+"""
+
+
+class CacheSeletores:
+    """
+    Por elemento lógico ("busca", "lupa"...): guarda o WebElement resolvido (por driver)
+    e a estratégia que funcionou por último, que passa a ser testada primeiro.
+    O elemento guardado é reutilizado sem round trip até dar StaleElementReference;
+    aí quem usa chama invalidar() e resolve de novo.
+    """
+
+    def __init__(self):
+        self._preferida: dict[str, tuple[str, str]] = {}
+        # driver -> {nome: WebElement}, pelo objeto driver e não pelo id() (driver novo com o mesmo id
+        # não recebe elemento de outra sessão). O WebElement aponta para o driver, então a chave fraca
+        # sozinha não solta a entrada: quem recicla chama invalidar(driver), que a remove.
+        self._elementos: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.acertos: Counter = Counter()
+        self.falhas: Counter = Counter()
+        self.invalidacoes: Counter = Counter()
+
+    def resolver(self, driver, nome: str, estrategias: list[tuple[str, str]]):
+        el = self._elementos.get(driver, {}).get(nome)
+        if el is not None:
+            with self._lock:
+                self.acertos[nome] += 1
+            return el
+
+        preferida = self._preferida.get(nome)
+        ordem = list(estrategias)
+        if preferida in ordem:
+            ordem.remove(preferida)
+            ordem.insert(0, preferida)
+
+        r = driver.execute_script(JS_RESOLVER, [[by, sel] for by, sel in ordem])
+        with self._lock:
+            if not r:
+                self.falhas[nome] += 1
+                return None
+            el, idx = r
+            if preferida is not None and idx == 0:
+                self.acertos[nome] += 1
+            else:
+                self.falhas[nome] += 1
+            self._preferida[nome] = ordem[idx]
+            self._elementos.setdefault(driver, {})[nome] = el
+        return el
+
+    def lembrar(self, driver, nome: str, estrategia: tuple[str, str], el):
+        # para quando o elemento veio de um fallback fora do resolver (ex.: WebDriverWait)
+        with self._lock:
+            self._preferida[nome] = estrategia
+            self._elementos.setdefault(driver, {})[nome] = el
+
+    def invalidar(self, driver, nome: str | None = None):
+        with self._lock:
+            elementos = self._elementos.get(driver, {})
+            for n in [n for n in elementos if nome is None or n == nome]:
+                del elementos[n]
+                self.invalidacoes[n] += 1
+            if not elementos:
+                self._elementos.pop(driver, None)
+
+    def imprimir_resumo(self):
+        nomes = sorted(set(self.acertos) | set(self.falhas))
+        if not nomes:
+            return
+        print("\n🎯 Cache de seletores:")
+        for nome in nomes:
+            a, f = self.acertos[nome], self.falhas[nome]
+            print(f"   {nome:<8} acertos {a:>7} | falhas {f:>5} | stale {self.invalidacoes[nome]:>5} | "
+                  f"taxa {a / max(a + f, 1):.1%}")
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+# módulos do robô ficam na raiz do projeto (sem pacote)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class DriverFalso:
+    """
+    Só o que os módulos do robô chamam no driver do Selenium. `responder(driver, js, *args)` decide
+    o retorno do execute_script; `cdp` mapeia comando do CDP -> resposta (sem entrada: WebDriverException).
+    """
+
+    def __init__(self, responder=None, cdp=None):
+        self.responder = responder
+        self.cdp = dict(cdp or {})
+        self.scripts: list[str] = []
+        self.timeouts: list[float] = []
+        self.fechado = False
+
+    def execute_script(self, js, *args):
+        self.scripts.append(js)
+        return self.responder(self, js, *args) if self.responder else None
+
+    def execute_async_script(self, js, *args):
+        return {"ok": True}
+
+    def set_script_timeout(self, segundos):
+        self.timeouts.append(segundos)
+
+    def execute_cdp_cmd(self, cmd, params):
+        from selenium.common.exceptions import WebDriverException
+
+        if cmd not in self.cdp:
+            raise WebDriverException(f"sem {cmd}")
+        return self.cdp[cmd]
+
+    def get_cookies(self):
+        return []
+
+    def quit(self):
+        self.fechado = True
+
+
+@pytest.fixture
+def driver_falso():
+    # a classe: cada teste abre quantos drivers precisar
+    return DriverFalso
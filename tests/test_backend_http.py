@@ -0,0 +1,98 @@
+import socket
+import threading
+import time
+
+from backend_http import ClienteBorderoHTTP
+
+MODELO = {"url": "", "campos": {"valor": "{valor}"}, "regex_sucesso": "sucesso"}
+SESSAO = {"cookies": {"s": "1"}}
+RESPOSTA_OK = b"HTTP/1.1 200 OK\r\nContent-Length: 7\r\nConnection: keep-alive\r\n\r\nsucesso"
+
+
+class ServidorFalso:
+    """
+    Servidor HTTP de uma conexão por vez, roteirizado: `roteiro` diz o que fazer com cada POST
+    ("ok", "sem_resposta" = lê e fecha, "lento" = não responde, "ok_e_fecha" = responde e fecha).
+    """
+
+    def __init__(self, roteiro: list[str]):
+        self.roteiro = list(roteiro)
+        self.posts = 0
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.porta = self.sock.getsockname()[1]
+        threading.Thread(target=self._rodar, daemon=True).start()
+
+    def _ler_pedido(self, conn) -> bool:
+        dados = b""
+        while b"\r\n\r\n" not in dados:
+            parte = conn.recv(65536)
+            if not parte:
+                return False
+            dados += parte
+        cab, corpo = dados.split(b"\r\n\r\n", 1)
+        tam = next(int(l.split(b":")[1]) for l in cab.split(b"\r\n") if l.lower().startswith(b"content-length"))
+        while len(corpo) < tam:
+            corpo += conn.recv(65536)
+        return True
+
+    def _rodar(self):
+        while True:
+            conn, _ = self.sock.accept()
+            while self._ler_pedido(conn):
+                self.posts += 1
+                acao = self.roteiro.pop(0) if self.roteiro else "ok"
+                if acao == "sem_resposta":
+                    break
+                if acao == "lento":
+                    time.sleep(2)
+                    break
+                conn.sendall(RESPOSTA_OK)
+                if acao == "ok_e_fecha":
+                    break
+            conn.close()
+
+
+def cliente(srv: ServidorFalso, timeout: float = 5) -> ClienteBorderoHTTP:
+    modelo = {**MODELO, "url": f"http://127.0.0.1:{srv.porta}/bordero/{{id_conta}}"}
+    return ClienteBorderoHTTP(modelo, SESSAO, conexoes=1, por_segundo=0, timeout=timeout)
+
+
+def test_ok_reaproveita_conexao():
+    srv = ServidorFalso(["ok", "ok"])
+    c = cliente(srv)
+    assert c.baixar("1", {"valor": "10,00"}) == "BAIXADO_OK"
+    assert c.baixar("2", {"valor": "10,00"}) == "BAIXADO_OK"
+    assert srv.posts == 2
+
+
+def test_post_enviado_sem_resposta_e_ambiguo_e_nao_reenvia():
+    srv = ServidorFalso(["sem_resposta"])
+    c = cliente(srv)
+    assert c.baixar("1", {"valor": "10,00"}) == "TIMEOUT"
+    time.sleep(0.1)
+    assert srv.posts == 1
+
+
+def test_timeout_de_leitura_e_ambiguo():
+    srv = ServidorFalso(["lento"])
+    c = cliente(srv, timeout=0.3)
+    assert c.baixar("1", {"valor": "10,00"}) == "TIMEOUT"
+    assert srv.posts == 1
+
+
+def test_keep_alive_fechado_pelo_servidor_reconecta_sem_duplicar():
+    srv = ServidorFalso(["ok_e_fecha", "ok"])
+    c = cliente(srv)
+    assert c.baixar("1", {"valor": "10,00"}) == "BAIXADO_OK"
+    time.sleep(0.1)   # FIN do servidor chega na conexão ociosa do pool
+    assert c.baixar("2", {"valor": "10,00"}) == "BAIXADO_OK"
+    assert srv.posts == 2
+
+
+def test_servidor_fora_do_ar_e_erro_seguro():
+    sock = socket.create_server(("127.0.0.1", 0))
+    porta = sock.getsockname()[1]
+    sock.close()
+    modelo = {**MODELO, "url": f"http://127.0.0.1:{porta}/bordero/{{id_conta}}"}
+    c = ClienteBorderoHTTP(modelo, SESSAO, conexoes=1, por_segundo=0, timeout=1)
+    assert c.baixar("1", {"valor": "10,00"}) == "ERRO_HTTP_CONEXAO"
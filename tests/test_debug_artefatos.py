@@ -0,0 +1,57 @@
+import base64
+import os
+
+from debug_artefatos import GravadorDebug, tipo_do_nome
+
+
+class DriverFalso:
+    def __init__(self, kb: int = 100):
+        self._jpeg = base64.b64encode(os.urandom(kb * 1000)).decode()
+        self.page_source = "<html>" + "x" * 50_000 + "</html>"
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {"data": self._jpeg}
+
+
+def gravados(pasta: str) -> list[str]:
+    return [a for raiz, _, arqs in os.walk(pasta) for a in arqs if a != "indice.jsonl"]
+
+
+def test_tipo_do_nome():
+    assert tipo_do_nome("timeout_2511000001_t2.png", "2511000001") == "timeout"
+    assert tipo_do_nome("outro_X_NAO_ENCONTRADO_t1.png") == "outro_X_NAO_ENCONTRADO"
+
+
+def test_teto_de_mb_conta_o_que_esta_na_fila(tmp_path):
+    # 10 capturas de 100 KB enfileiradas antes de a thread gravar: o teto de 0,35 MB vale mesmo assim
+    g = GravadorDebug(str(tmp_path), max_mb=0.35, amostra_por_tipo=100, fila_max=64)
+    drv = DriverFalso()
+    for i in range(10):
+        g.capturar(drv, f"erro_2511{i:08d}_t1.png", codigo=f"2511{i:08d}")
+    g.fechar()
+    assert g.bytes <= g.max_bytes
+    assert len(gravados(g.pasta)) == 3
+    assert g.stats["pulado_limite"] == 7
+    assert g._reservados == 0
+
+
+def test_teto_de_arquivos_conta_html(tmp_path):
+    g = GravadorDebug(str(tmp_path), max_arquivos=5, amostra_por_tipo=100)
+    drv = DriverFalso(kb=1)
+    for i in range(5):
+        g.capturar(drv, f"erro_2511{i:08d}_t1.png", codigo=f"2511{i:08d}", html=True)
+    g.fechar()
+    # cada captura são 2 arquivos (jpg + html.gz): só 2 cabem em 5
+    assert len(gravados(g.pasta)) == 4
+    assert g._arquivos == 4
+
+
+def test_amostragem_por_tipo(tmp_path):
+    g = GravadorDebug(str(tmp_path), amostra_por_tipo=2, depois_a_cada=3)
+    drv = DriverFalso(kb=1)
+    for i in range(8):
+        g.capturar(drv, f"timeout_2511{i:08d}_t1.png", codigo=f"2511{i:08d}")
+    g.fechar()
+    # 2 primeiras + a 5ª e a 8ª
+    assert g.stats["gravado"] == 4
+    assert g.stats["pulado_amostragem"] == 4
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pandas as pd
+
+from diario_execucao import DiarioExecucao
+from ledger_status import LedgerStatus
+
+
+def ledger_da_planilha():
+    df = pd.DataFrame({"id": ["A", "B", "C", "D"], "st": ["", "", "SIM", ""]})
+    return LedgerStatus.do_dataframe(df, "id", "st")
+
+
+def test_retomada_depois_do_crash(tmp_path):
+    caminho = str(tmp_path / "diario.sqlite")
+    d = DiarioExecucao(caminho, entrada="nov")
+    d.registrar("A", "BAIXADO_OK", 1)
+    d.registrar_lote([("B", "TIMEOUT", 2), ("C", "ERRO", 1)])
+    DiarioExecucao(caminho, entrada="dez").registrar("D", "BAIXADO_OK", 1)
+    # crash: sem fechar(); o que foi registrado já está no disco
+
+    ledger = ledger_da_planilha()
+    assert DiarioExecucao(caminho, entrada="nov").reaplicar(ledger) == 3
+    assert [ledger.status(c) for c in "ABCD"] == ["SIM", "TIMEOUT", "SIM", ""]
+    assert ledger.tentativas("B") == 2
+    # reaplicados vão para o próximo checkpoint; D é de outra planilha e não foi tocado
+    assert ledger.retirar_alterados() == {"A": "SIM", "B": "TIMEOUT", "C": "SIM"}
+
+
+def test_diario_antigo_sem_coluna_entrada(tmp_path):
+    caminho = str(tmp_path / "diario.sqlite")
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("CREATE TABLE eventos (id INTEGER PRIMARY KEY AUTOINCREMENT, codigo TEXT NOT NULL, "
+                     "status TEXT NOT NULL, tentativas INTEGER NOT NULL DEFAULT 0, registrado_em REAL NOT NULL)")
+        conn.execute("INSERT INTO eventos (codigo, status, registrado_em) VALUES ('A', 'BAIXADO_OK', 0)")
+    conn.close()
+    d = DiarioExecucao(caminho, entrada="nov")
+    d.registrar("B", "BAIXADO_OK")
+    ledger = ledger_da_planilha()
+    assert d.reaplicar(ledger) == 1
+    assert [ledger.status(c) for c in "AB"] == ["", "SIM"]
+    d.fechar()
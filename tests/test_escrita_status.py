@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from escrita_status import EscritorStatus
+
+COLUNAS = ["ID do pedido", "Data", "Comprador", "Observação", "VALOR LIQUIDO", "BAIXADO"]
+
+
+def planilha() -> pd.DataFrame:
+    return pd.DataFrame({
+        "ID do pedido": ["2511000001", "2511000002", "2511000003"],
+        "Data": ["05/11/2025", "06/11/2025", "07/11/2025"],
+        "Comprador": ["Ana", "Bia", "Caio"],
+        "Observação": ["", "frete grátis", "0012"],
+        "VALOR LIQUIDO": ["10,00", "20,50", "1.234,56"],
+        "BAIXADO": ["", "", "SIM"],
+    })
+
+
+def escrever(origem, destino, valores, **kw) -> EscritorStatus:
+    esc = EscritorStatus(origem, destino, "ID do pedido", "BAIXADO", **kw)
+    esc.agendar(valores)
+    esc.fechar()
+    assert esc.erro is None
+    return esc
+
+
+def test_csv_mantem_todas_as_colunas_e_o_texto(tmp_path):
+    origem = tmp_path / "entrada.csv"
+    planilha().to_csv(origem, sep=";", index=False)
+    esc = escrever(str(origem), str(tmp_path / "saida.xlsx"), {"2511000001": "SIM"})
+    assert esc.destino.endswith(".csv")
+    saida = pd.read_csv(esc.destino, dtype=str, keep_default_na=False)
+    assert list(saida.columns) == COLUNAS
+    assert saida["BAIXADO"].tolist() == ["SIM", "", "SIM"]
+    assert saida["Observação"].tolist() == ["", "frete grátis", "0012"]
+    assert saida["VALOR LIQUIDO"].tolist() == ["10,00", "20,50", "1.234,56"]
+
+
+def test_xlsx_que_o_patch_nao_entende_regrava_tudo(tmp_path):
+    origem = tmp_path / "entrada.xlsx"
+    with pd.ExcelWriter(origem) as w:
+        planilha().to_excel(w, sheet_name="Novembro", index=False)
+        pd.DataFrame({"resumo": [1, 2]}).to_excel(w, sheet_name="Resumo", index=False)
+    esc = EscritorStatus(str(origem), str(tmp_path / "saida.xlsx"), "ID do pedido", "BAIXADO")
+    esc.modo = "tabela"   # o mesmo caminho do fallback de EstruturaInesperada
+    esc.agendar({"2511000002": "TIMEOUT"})
+    esc.fechar()
+    assert esc.erro is None
+    abas = pd.read_excel(esc.destino, sheet_name=None, dtype=str)
+    assert list(abas) == ["Novembro", "Resumo"]
+    assert list(abas["Novembro"].columns) == COLUNAS
+    assert abas["Novembro"]["BAIXADO"].fillna("").tolist() == ["", "TIMEOUT", "SIM"]
+    assert abas["Novembro"]["Comprador"].tolist() == ["Ana", "Bia", "Caio"]
+
+
+def test_xlsx_troca_so_as_celulas_de_status(tmp_path):
+    origem = tmp_path / "entrada.xlsx"
+    planilha().to_excel(origem, index=False)
+    esc = escrever(str(origem), str(tmp_path / "saida.xlsx"), {"2511000001": "SIM"})
+    assert esc.modo == "celulas"
+    ws = load_workbook(esc.destino).active
+    linhas = list(ws.iter_rows(values_only=True))
+    assert list(linhas[0]) == COLUNAS
+    assert [l[5] for l in linhas[1:]] == ["SIM", None, "SIM"]
+    assert not os.path.exists(tmp_path / "saida.tmp.xlsx")
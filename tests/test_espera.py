@@ -0,0 +1,17 @@
+import gc
+
+from espera import MotorEspera
+
+
+def test_configura_cada_driver_uma_vez(driver_falso):
+    motor = MotorEspera({"busca": 20}, limite_padrao=10)
+    d = driver_falso()
+    assert motor.aguardar(d, "busca") and motor.aguardar(d, "busca")
+    assert d.timeouts == [25]
+    # driver novo (reciclado) configura de novo; o fechado sai do motor
+    novo = driver_falso()
+    motor.aguardar(novo, "listagem")
+    assert novo.timeouts == [25]
+    del d, novo
+    gc.collect()
+    assert len(motor._configurados) == 0
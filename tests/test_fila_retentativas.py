@@ -0,0 +1,107 @@
+import threading
+import time
+
+from fila_retentativas import DisjuntorLentidao, FilaRetentativas
+
+
+def disjuntor_aberto(**kw) -> DisjuntorLentidao:
+    d = DisjuntorLentidao(janela=4, limite=0.5, minimo=2, pausa=0.01, pausa_max=0.05, **kw)
+    d.registrar(True)
+    d.registrar(True)
+    assert d.estado == "aberto"
+    return d
+
+
+def aguardar_em_thread(d: DisjuntorLentidao, timeout: float) -> bool:
+    # True se aguardar() voltou dentro do prazo
+    pronto = threading.Event()
+    threading.Thread(target=lambda: (d.aguardar(), pronto.set()), daemon=True).start()
+    return pronto.wait(timeout)
+
+
+def test_disjuntor_abre_e_fecha_com_sonda_ok():
+    d = disjuntor_aberto()
+    d.aguardar()
+    assert d.estado == "meio_aberto"
+    d.registrar(False)
+    assert d.estado == "fechado"
+
+
+def test_disjuntor_sonda_lenta_reabre_com_pausa_dobrada():
+    d = disjuntor_aberto()
+    d.aguardar()
+    d.registrar(True)
+    assert d.estado == "aberto"
+    assert d._pausa_atual == 0.02
+
+
+def test_sonda_sem_veredito_e_liberada():
+    d = disjuntor_aberto()
+    d.aguardar()              # esta thread fica com o pedido de teste
+    d.liberar_sonda()         # ex.: RELOGAR, nunca chegou a registrar()
+    assert aguardar_em_thread(d, 2.0)
+    assert d.estado == "meio_aberto"
+
+
+def test_sonda_sem_liberar_bloqueia_os_outros():
+    d = disjuntor_aberto()
+    d.aguardar()
+    assert not aguardar_em_thread(d, 0.8)
+
+
+def test_liberar_de_outra_thread_nao_solta_a_sonda():
+    d = disjuntor_aberto()
+    d.aguardar()
+    t = threading.Thread(target=d.liberar_sonda)
+    t.start()
+    t.join()
+    assert d._sonda_em_voo
+
+
+def test_sonda_esquecida_expira():
+    d = disjuntor_aberto(sonda_max=0.3)
+    d.aguardar()
+    assert aguardar_em_thread(d, 3.0)
+
+
+def test_liberar_depois_de_registrar_nao_faz_nada():
+    d = disjuntor_aberto()
+    d.aguardar()
+    d.registrar(False)
+    d.liberar_sonda()
+    assert d.estado == "fechado"
+    assert d.aguardar() == 0.0
+
+
+def test_fila_ordem_e_limite_de_rodadas():
+    f = FilaRetentativas(base=0.01, fator=2, teto=0.05, max_rodadas=2, jitter=0, semente=1)
+    assert f.adiar("A", "TIMEOUT")
+    assert f.adiar("B", "ERRO")
+    assert f.adiar("A", "TIMEOUT")
+    assert not f.adiar("A", "TIMEOUT")          # terceira vez: esgotou
+    assert f.esgotados == {"A": "TIMEOUT"}
+    t0 = time.monotonic()
+    assert list(f.rodada()) == ["A", "B", "A"]  # a segunda volta de A espera o dobro
+    assert time.monotonic() - t0 >= 0.015
+    assert len(f) == 0
+
+
+def test_fila_espera_exponencial_com_teto():
+    f = FilaRetentativas(base=10, fator=3, teto=50, jitter=0)
+    assert [f.espera(r) for r in (1, 2, 3)] == [10, 30, 50]
+
+
+def test_fila_descartar():
+    f = FilaRetentativas(base=0, jitter=0)
+    for c in ("A", "B", "C"):
+        f.adiar(c, "TIMEOUT")
+    f.descartar(["B"])
+    assert f.codigos() == ["A", "C"]
+
+
+def test_fila_contem():
+    f = FilaRetentativas(base=0, jitter=0)
+    f.adiar("A", "TIMEOUT")
+    assert "A" in f and "B" not in f
+    list(f.rodada())
+    assert "A" not in f
@@ -0,0 +1,83 @@
+import pandas as pd
+
+from indice_listagem import SITUACOES_BAIXADO, IndiceListagem, _codigo_da_linha, situacao_da_linha
+from ledger_status import LedgerStatus
+from reconciliacao import STATUS_FINAIS, conciliar, pedidos_ambiguos
+
+
+def linha(celulas, codigo=None, situacao=None):
+    return {"celulas": celulas, "texto": "\t".join(celulas), "destino": None,
+            "codigo": codigo, "situacao": situacao}
+
+
+def test_codigo_so_por_celula_exata():
+    alvos = {"251105ABC123"}
+    # o ID aparece como token no texto (ex.: no nome do cliente), mas não é a célula do pedido
+    ln = linha(["999", "Cliente 251105ABC123", "R$ 10,00"], codigo="999", situacao="Em aberto")
+    assert _codigo_da_linha(ln, alvos) is None
+    # sem cabeçalho: qualquer célula inteira igual, nunca token
+    assert _codigo_da_linha(linha(["Cliente 251105ABC123"]), alvos) is None
+    assert _codigo_da_linha(linha(["x", "251105ABC123"]), alvos) == "251105ABC123"
+    assert _codigo_da_linha(linha(["251105ABC123"], codigo="251105ABC123"), alvos) == "251105ABC123"
+
+
+def test_situacao_pela_celula_exata():
+    assert situacao_da_linha(linha([], situacao="Recebida"), SITUACOES_BAIXADO) == "baixado"
+    assert situacao_da_linha(linha([], situacao="  LIQUIDADA "), SITUACOES_BAIXADO) == "baixado"
+    assert situacao_da_linha(linha([], situacao="Não liquidado"), SITUACOES_BAIXADO) == "aberto"
+    assert situacao_da_linha(linha([], situacao="Em aberto"), SITUACOES_BAIXADO) == "aberto"
+    # texto da linha com "pago" não conta: só a célula de situação
+    ln = linha(["1", "Frete pago pelo comprador", "Em aberto"], codigo="1", situacao="Em aberto")
+    assert situacao_da_linha(ln, SITUACOES_BAIXADO) == "aberto"
+    assert situacao_da_linha(linha(["1", "Recebida"]), SITUACOES_BAIXADO) == "desconhecido"
+
+
+def test_indice_nao_marca_nao_liquidado(tmp_path):
+    indice = IndiceListagem(str(tmp_path / "indice.json"), ttl_horas=1)
+    indice._registrar_linhas([
+        linha(["A1"], codigo="A1", situacao="Não liquidado"),
+        linha(["B2"], codigo="B2", situacao="Recebido"),
+        linha(["C3"], codigo="C3"),
+    ], {"A1", "B2", "C3"}, SITUACOES_BAIXADO)
+    assert not indice.baixado("A1")
+    assert indice.baixado("B2")
+    assert not indice.baixado("C3")
+
+
+def test_conciliar_sem_coluna_de_situacao_fica_indefinido():
+    linhas = {
+        "A": linha(["A", "Pago"]),
+        "B": linha(["B", "Recebida"], codigo="B", situacao="Recebida"),
+        "C": linha(["C", "Não liquidado"], codigo="C", situacao="Não liquidado"),
+    }
+    situacoes = conciliar(["A", "B", "C", "D"], linhas, SITUACOES_BAIXADO)
+    assert situacoes == {"A": "indefinido", "B": "baixado", "C": "aberto", "D": "ausente"}
+
+
+def ledger_com(status, **kw):
+    df = pd.DataFrame({"id": list(status), "st": list(status.values())})
+    return LedgerStatus.do_dataframe(df, "id", "st", **kw)
+
+
+def test_ja_baixado_fica_separado_de_sim():
+    ledger = ledger_com({"A": "", "B": "SIM", "C": "TIMEOUT"})
+    for codigo in "ABC":
+        ledger.registrar(codigo, "JA_BAIXADO")
+    assert ledger.status("A") == "JA_BAIXADO"
+    assert ledger.status("B") == "SIM"
+    assert ledger.status("C") == "JA_BAIXADO"
+    assert all(ledger.ja_baixado(c) for c in "ABC")
+    # resultado pior não sobrescreve; o robô baixando depois vira SIM
+    ledger.registrar("A", "TIMEOUT")
+    assert ledger.status("A") == "JA_BAIXADO"
+    ledger.registrar("A", "BAIXADO_OK")
+    assert ledger.status("A") == "SIM"
+    assert "JA_BAIXADO" in STATUS_FINAIS
+    ledger.iniciar_tentativa("C")
+    assert pedidos_ambiguos(ledger, ["A", "B", "C"]) == []
+
+
+def test_ja_baixado_como_sim_opcional():
+    ledger = ledger_com({"A": ""}, ja_baixado_como_sim=True)
+    ledger.registrar("A", "JA_BAIXADO")
+    assert ledger.status("A") == "SIM"
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from ledger_status import LedgerStatus
+
+
+def ledger(**kw):
+    df = pd.DataFrame({"id": ["A", "B", "C", " D ", "A"], "st": ["SIM", "", "JA_BAIXADO", None, ""]})
+    return LedgerStatus.do_dataframe(df, "id", "st", **kw)
+
+
+def test_do_dataframe_e_ja_baixado():
+    led = ledger()
+    assert len(led) == 4 and "D" in led
+    assert [led.ja_baixado(c) for c in ("A", "B", "C", "D", "X")] == [True, False, True, False, False]
+    assert led.retirar_alterados() == {}
+
+
+def test_registrar_nao_desfaz_baixado():
+    led = ledger()
+    led.registrar("A", "TIMEOUT")           # SIM nunca é sobrescrito
+    led.registrar("C", "ERRO")              # JA_BAIXADO só por SIM
+    led.registrar("B", "TIMEOUT")
+    led.registrar("B", "JA_BAIXADO")
+    led.registrar("C", "BAIXADO_OK")
+    assert [led.status(c) for c in "ABC"] == ["SIM", "JA_BAIXADO", "SIM"]
+
+
+def test_ja_baixado_como_sim():
+    led = ledger(ja_baixado_como_sim=True)
+    led.registrar("B", "JA_BAIXADO")
+    assert led.status("B") == "SIM"
+
+
+def test_alterados_saem_uma_vez():
+    led = ledger()
+    led.iniciar_tentativa("B")
+    assert led.retirar_alterados() == {}     # tentativa sozinha não é resultado
+    led.registrar("B", "TIMEOUT")
+    led.registrar("E", "BAIXADO_OK")         # pedido fora da planilha entra no ledger
+    led.registrar("B", "BAIXADO_OK")
+    assert led.retirar_alterados() == {"B": "SIM", "E": "SIM"}
+    assert led.retirar_alterados() == {}
+    assert led.tentativas("B") == 1 and led.tentativas("E") == 0
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from leitura_entrada import ler_entrada
+from valores_br import centavos_coluna, datas_coluna
+
+COLUNAS = ["ID do pedido", "Data", "TOTAL TAXAS", "VALOR LIQUIDO"]
+
+
+def planilha(caminho, abas: dict[str, list]):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for nome, linhas in abas.items():
+        ws = wb.create_sheet(nome)
+        for linha in linhas:
+            ws.append(linha)
+    wb.save(caminho)
+    return str(caminho)
+
+
+def test_coluna_de_dinheiro_misturada(tmp_path):
+    caminho = planilha(tmp_path / "entrada.xlsx", {"nov": [
+        COLUNAS,
+        [2511000001, "05/11/2025", "R$ 5,00", 100.0],
+        [2511000002, "05/11/2025", 1.845, 100.0],
+        [2511000003, "05/11/2025", 1.234, 100.0],
+    ]})
+    df = ler_entrada(caminho, COLUNAS, "ID do pedido", "Data", pasta_cache=None)
+    assert df["ID do pedido"].tolist() == ["2511000001", "2511000002", "2511000003"]
+    c, nulos = centavos_coluna(df["TOTAL TAXAS"])
+    assert c.tolist() == [500, 185, 123] and not nulos.any()
+
+
+def test_coluna_de_data_misturada_com_serial(tmp_path):
+    caminho = planilha(tmp_path / "entrada.xlsx", {"nov": [
+        COLUNAS,
+        [2511000001, "05/11/2025", 1.0, 100.0],
+        [2511000002, 45966, 1.0, 100.0],
+        [2511000003, datetime(2025, 11, 6), 1.0, 100.0],
+    ]})
+    df = ler_entrada(caminho, COLUNAS, "ID do pedido", "Data", pasta_cache=None)
+    assert datas_coluna(df["Data"]) == ["05/11/2025", "05/11/2025", "06/11/2025"]
+
+
+def test_todas_as_abas_com_a_coluna_do_codigo(tmp_path):
+    caminho = planilha(tmp_path / "entrada.xlsx", {
+        "resumo": [["Total"], [3]],
+        "out": [COLUNAS, [2510000001, "05/10/2025", 1.0, 10.0]],
+        "nov": [["VALOR LIQUIDO", "ID do pedido", "Data"], [20.0, 2511000001, "05/11/2025"],
+                [30.0, 2511000002, "06/11/2025"]],
+    })
+    df = ler_entrada(caminho, COLUNAS, "ID do pedido", "Data", aba="*", pasta_cache=None)
+    assert df["ID do pedido"].tolist() == ["2510000001", "2511000001", "2511000002"]
+    assert df["VALOR LIQUIDO"].tolist() == [10.0, 20.0, 30.0]
+    # coluna que falta numa aba fica vazia nas linhas dela
+    assert df["TOTAL TAXAS"].tolist()[0] == 1.0 and pd.isna(df["TOTAL TAXAS"]).tolist()[1:] == [True, True]
+    # sem "*" só a primeira aba, que aqui não é de pedidos
+    with pytest.raises(ValueError):
+        ler_entrada(caminho, COLUNAS, "ID do pedido", "Data", pasta_cache=None)
+
+
+def test_cache_parquet_igual_a_leitura_fria(tmp_path):
+    caminho = planilha(tmp_path / "entrada.xlsx", {"nov": [
+        COLUNAS,
+        [2511000001, "05/11/2025", "R$ 5,00", 100.5],
+        [2511000002, 45966, 1.845, None],
+        [2511000003, datetime(2025, 11, 6), None, 7.0],
+    ]})
+    cache = tmp_path / "cache"
+    frio = ler_entrada(caminho, COLUNAS, "ID do pedido", "Data", pasta_cache=str(cache))
+    assert len(list(cache.glob("*.parquet"))) == 1
+    quente = ler_entrada(caminho, COLUNAS, "ID do pedido", "Data", pasta_cache=str(cache))
+    pd.testing.assert_frame_equal(frio, quente)
+    assert centavos_coluna(quente["TOTAL TAXAS"])[0].tolist() == [500, 185, 0]
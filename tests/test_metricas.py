@@ -0,0 +1,15 @@
+import numpy as np
+
+from metricas import percentil
+
+
+def test_percentil_igual_ao_numpy():
+    rng = np.random.default_rng(3)
+    for n in (1, 2, 7, 100, 1001):
+        v = rng.exponential(2.0, n).tolist()
+        for p in (0, 50, 95, 99, 100):
+            assert abs(percentil(v, p) - np.percentile(v, p)) < 1e-9
+
+
+def test_percentil_vazio():
+    assert percentil([], 95) == 0.0
@@ -0,0 +1,22 @@
+from selenium.webdriver.chrome.options import Options
+
+from navegador_enxuto import FLAGS_ENXUTAS, configurar_opcoes, regras_host
+
+
+def test_regras_host():
+    assert regras_host([]) is None
+    assert regras_host(["erp.olist.com", "*.olist.com"]) == "MAP * ~NOTFOUND, EXCLUDE erp.olist.com, EXCLUDE *.olist.com"
+
+
+def test_configurar_opcoes():
+    config = {"hosts_permitidos": ["erp.olist.com"]}
+    opcoes = Options()
+    configurar_opcoes(opcoes, config, enxuto=True, medir_rede=False)
+    assert opcoes.arguments == FLAGS_ENXUTAS + ["--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE erp.olist.com"]
+    assert "goog:loggingPrefs" not in opcoes.to_capabilities()
+
+    # sem modo enxuto nada de headless nem regra de DNS; medir rede só liga o log de performance
+    opcoes = Options()
+    configurar_opcoes(opcoes, config, enxuto=False, medir_rede=True)
+    assert opcoes.arguments == []
+    assert opcoes.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
@@ -0,0 +1,46 @@
+import os
+
+from perfil_chrome import MANIFESTO, sincronizar
+
+ITENS = ["Cookies", "Local Storage", "Preferences"]
+
+
+def escrever(raiz, rel, conteudo: bytes):
+    caminho = os.path.join(raiz, *rel.split("/"))
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "wb") as f:
+        f.write(conteudo)
+    return caminho
+
+
+def test_copia_so_o_que_mudou(tmp_path):
+    origem, destino = str(tmp_path / "origem"), str(tmp_path / "destino")
+    escrever(origem, "Cookies", b"c1")
+    escrever(origem, "Local Storage/leveldb/000001.log", b"ls")
+    escrever(origem, "Preferences", b"{}")
+    escrever(origem, "Cache/data_0", b"x" * 1000)   # fora dos itens: nunca vai para o clone
+
+    assert sincronizar(origem, destino, ITENS) == {"copiados": 3, "pulados": 0, "removidos": 0, "bytes": 6}
+    assert not os.path.exists(os.path.join(destino, "Cache"))
+    assert os.path.exists(os.path.join(destino, MANIFESTO))
+
+    # nada mudou: pula pelo tamanho+mtime, sem ler
+    assert sincronizar(origem, destino, ITENS)["pulados"] == 3
+
+    # mtime mudou mas o conteúdo é o mesmo: o hash bate e não copia
+    prefs = os.path.join(origem, "Preferences")
+    os.utime(prefs, ns=(os.stat(prefs).st_atime_ns, os.stat(prefs).st_mtime_ns + 10**9))
+    escrever(origem, "Cookies", b"c2")
+    os.remove(os.path.join(origem, "Local Storage", "leveldb", "000001.log"))
+    assert sincronizar(origem, destino, ITENS) == {"copiados": 1, "pulados": 1, "removidos": 1, "bytes": 2}
+    with open(os.path.join(destino, "Cookies"), "rb") as f:
+        assert f.read() == b"c2"
+    assert not os.path.exists(os.path.join(destino, "Local Storage", "leveldb", "000001.log"))
+
+
+def test_clone_apagado_volta_a_ser_copiado(tmp_path):
+    origem, destino = str(tmp_path / "origem"), str(tmp_path / "destino")
+    escrever(origem, "Cookies", b"c1")
+    sincronizar(origem, destino, ITENS)
+    os.remove(os.path.join(destino, "Cookies"))
+    assert sincronizar(origem, destino, ITENS)["copiados"] == 1
@@ -0,0 +1,31 @@
+from pipeline_abas import PipelineAbas
+
+
+class TrocaFalsa:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, tipo):
+        self.driver.abas.append(f"aba{len(self.driver.abas)}")
+        self.driver.current_window_handle = self.driver.abas[-1]
+
+    def window(self, aba):
+        self.driver.current_window_handle = aba
+
+
+class DriverFalso:
+    def __init__(self):
+        self.abas = ["aba0"]
+        self.current_window_handle = "aba0"
+        self.switch_to = TrocaFalsa(self)
+
+
+def test_escondido_medido_e_estimado_separados():
+    p = PipelineAbas(DriverFalso(), preparar=lambda d: None, folga=0.05)
+    assert p.outra() == "aba1"
+    p.registrar(adiantado=1.0, espera=0.5)   # salvar ainda corria: 1s medido, salvar = 1,5s
+    p.registrar(adiantado=2.0, espera=0.0)   # acabou antes: estimado pelo salvar típico (1,5s)
+    p.registrar(adiantado=0.4, espera=0.0)   # navegação curta: no máx. ela
+    assert p.escondido == 1.0
+    assert abs(p.escondido_estimado - 1.9) < 1e-9
+    assert p.salvar_medido == [1.5]
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from preprocessamento import agregar_por_pedido, preprocessar
+
+COLS = ("id", "data", "taxas", "frete", "liquido", "validacao")
+REGRAS = {"taxas": "soma", "frete": "soma", "liquido": "soma"}
+
+
+def agregar(linhas, regras=REGRAS, **kw):
+    df = pd.DataFrame(linhas, columns=COLS)
+    return agregar_por_pedido(df, "id", "data", "taxas", "frete", "liquido", "validacao", regras, **kw)
+
+
+def por_codigo(pedidos: pd.DataFrame) -> dict:
+    return {r.id: r for r in pedidos.itertuples(index=False)}
+
+
+def test_soma_em_centavos_e_ordem_da_planilha():
+    pedidos, conflitos, bloqueados = agregar([
+        ("B", "05/11/2025", "0,10", "0", "10,00", "ok"),
+        ("A", "05/11/2025", "1,00", "", "50,00", "ok"),
+        ("B", "05/11/2025", "0,20", "4,99", "-0,30", "ok"),
+    ])
+    assert pedidos["id"].tolist() == ["B", "A"]
+    b = por_codigo(pedidos)["B"]
+    assert (b.taxas, b.frete, b.liquido) == (0.30, 4.99, 9.70)
+    # frete vazio em todas as linhas continua vazio
+    assert np.isnan(por_codigo(pedidos)["A"].frete)
+    assert conflitos.empty
+    assert not bloqueados.any()
+
+
+def test_linha_repetida_cai_e_e_listada_sem_bloquear():
+    pedidos, conflitos, bloqueados = agregar([
+        ("A", "05/11/2025", "1,00", "0", "50,00", "ok"),
+        ("A", "05/11/2025", "1,00", "0", "50,00", "ok"),
+    ])
+    assert por_codigo(pedidos)["A"].liquido == 50.00
+    assert conflitos["motivo"].tolist() == ["linha repetida removida"]
+    assert conflitos["linhas"].tolist() == [2]
+    assert not bloqueados.any()
+
+
+def test_regras_por_coluna():
+    linhas = [
+        ("A", "05/11/2025", "3,00", "1,00", "50,00", "ok"),
+        ("A", "05/11/2025", "5,00", "2,00", "60,00", "ok"),
+    ]
+    pedidos, _, _ = agregar(linhas, regras={"taxas": "max", "frete": "primeira", "liquido": "ultima"})
+    a = por_codigo(pedidos)["A"]
+    assert (a.taxas, a.frete, a.liquido) == (5.00, 1.00, 60.00)
+
+
+def test_conflitos_bloqueiam_e_validacao_nao_e_reescrita():
+    pedidos, conflitos, bloqueados = agregar([
+        ("D", "05/11/2025", "1,00", "0", "10,00", "ok"),
+        ("D", "06/11/2025", "1,00", "0", "10,00", "ok"),
+        ("V", "05/11/2025", "1,00", "0", "10,00", "ok"),
+        ("V", "05/11/2025", "2,00", "0", "10,00", "divergente"),
+        ("N", "05/11/2025", "1,00", "0", "10,00", "ok"),
+        ("N", "05/11/2025", "1,00", "0", "-10,00", "ok"),
+        ("OK", "05/11/2025", "1,00", "0", "10,00", "ok"),
+    ])
+    motivos = dict(zip(conflitos["codigo"], conflitos["motivo"]))
+    assert motivos == {
+        "D": "datas diferentes",
+        "V": "validação divergente entre as linhas",
+        "N": "líquido <= 0 somando as linhas",
+    }
+    assert dict(zip(pedidos["id"], bloqueados)) == {"D": True, "V": True, "N": True, "OK": False}
+    # a validação do pedido vem das linhas, nunca vira "conflito"
+    assert dict(zip(pedidos["id"], pedidos["validacao"])) == {"D": "ok", "V": "divergente", "N": "ok", "OK": "ok"}
+
+
+def test_sem_bloquear_conflitos_so_lista():
+    _, conflitos, bloqueados = agregar([
+        ("D", "05/11/2025", "1,00", "0", "10,00", "ok"),
+        ("D", "06/11/2025", "1,00", "0", "10,00", "ok"),
+    ], bloquear_conflitos=False)
+    assert conflitos["bloqueado"].tolist() == [False]
+    assert not bloqueados.any()
+
+
+def test_preprocessar_do_agregado():
+    pedidos, _, _ = agregar([
+        ("A", "05/11/2025", "1,10", "2,5", "50,00", "OK"),
+        ("A", "05/11/2025", "0,20", "0", "1,005", "ok"),
+    ])
+    reg = preprocessar(pedidos, "id", "data", "taxas", "frete", "liquido", "validacao").get("A")
+    assert (reg.data_br, reg.taxa_br, reg.frete_br, reg.valor_br) == ("05/11/2025", "1,30", "2,50", "51,01")
+    assert reg.frete_num == 2.5
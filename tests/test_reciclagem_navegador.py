@@ -0,0 +1,54 @@
+from selenium.common.exceptions import WebDriverException
+
+from reciclagem_navegador import CAIU, ReciclagemNavegador
+
+URL = "https://erp.olist.com/contas_receber"
+
+
+def heap(mb: float) -> dict:
+    return {"Performance.enable": {}, "Performance.getMetrics": {"metrics": [{"name": "JSHeapTotalSize", "value": mb * 1e6}]}}
+
+
+def test_memoria_acima_do_limite_so_depois_do_minimo(driver_falso):
+    r = ReciclagemNavegador(URL, max_heap_mb=600, amostrar_a_cada=5, min_pedidos=10)
+    d = driver_falso(cdp=heap(700))
+    assert [r.observar(d, 1.0, "BAIXADO_OK") for _ in range(9)] == [None] * 9
+    assert r.observar(d, 1.0, "BAIXADO_OK") == "memória: 700 MB (limite 600)"
+    assert r.pico_mb == 700
+
+    abaixo = driver_falso(cdp=heap(100))
+    assert all(r.observar(abaixo, 1.0, "BAIXADO_OK") is None for _ in range(20))
+
+
+def test_tendencia_de_lentidao_pela_mediana(driver_falso):
+    r = ReciclagemNavegador(URL, fator_lentidao=1.8, janela=3, amostrar_a_cada=1000, min_pedidos=1)
+    d = driver_falso()
+    for s in (1.0, 1.2, 0.9):                  # linha de base: mediana 1.0
+        assert r.observar(d, s, "BAIXADO_OK") is None
+    assert r.observar(d, 30.0, "NAO_ENCONTRADO") is None   # só pedido baixado entra na medida
+    assert r.observar(d, 2.5, "BAIXADO_OK") is None
+    assert r.observar(d, 1.0, "BAIXADO_OK") is None        # janela ainda não cheia
+    assert r.observar(d, 1.7, "BAIXADO_OK") is None        # pico isolado de 2.5s: mediana 1.7 < 1.8
+    assert r.observar(d, 2.0, "BAIXADO_OK") is None
+    assert r.observar(d, 2.2, "BAIXADO_OK") == "lentidão: pedido levando 2.0s (no começo 1.0s)"
+
+
+def test_chrome_caido_e_limite_de_pedidos(driver_falso):
+    def morto(drv, js):
+        raise WebDriverException("chrome not reachable")
+
+    r = ReciclagemNavegador(URL, amostrar_a_cada=1000, min_pedidos=100, max_pedidos=3)
+    assert r.observar(driver_falso(morto), 60.0, "TIMEOUT") == CAIU   # mesmo antes do mínimo
+    d = driver_falso()
+    assert [r.observar(d, 1.0, "BAIXADO_OK") for _ in range(3)] == [None, None, None]
+
+
+def test_esquecer_o_driver_fechado(driver_falso):
+    r = ReciclagemNavegador(URL, amostrar_a_cada=1000, min_pedidos=2, max_pedidos=2)
+    d = driver_falso()
+    assert r.observar(d, 1.0, "BAIXADO_OK") is None
+    r.esquecer(d)
+    assert len(r._estados) == 0
+    # a contagem recomeça: o driver não herda o pedido já visto
+    assert r.observar(d, 1.0, "BAIXADO_OK") is None
+    assert r.observar(d, 1.0, "BAIXADO_OK") == "limite: 2 pedidos desde a última reciclagem"
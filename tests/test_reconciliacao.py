@@ -0,0 +1,59 @@
+import pandas as pd
+
+from indice_listagem import SITUACOES_BAIXADO
+from ledger_status import LedgerStatus
+from preprocessamento import RegistroPedido
+from reconciliacao import conciliar, intervalo_datas, pedidos_ambiguos, relatorio_discrepancias
+
+
+def linha(codigo, situacao, valor="R$ 110,00"):
+    celulas = [codigo, "Cliente", "05/11/2025", valor, situacao]
+    return {"celulas": celulas, "texto": "\t".join(celulas), "destino": None,
+            "codigo": codigo, "situacao": situacao}
+
+
+def registro(data="05/11/2025", valor="100,00", taxa="10,00"):
+    return RegistroPedido(data, taxa, "0,00", 0.0, valor, "ok")
+
+
+def test_conciliar_pela_situacao():
+    linhas = {"A": linha("A", "Recebida"), "B": linha("B", "Em aberto"), "C": linha("C", "Não liquidado")}
+    assert conciliar(["A", "B", "C", "D"], linhas, SITUACOES_BAIXADO) == {
+        "A": "baixado", "B": "aberto", "C": "aberto", "D": "ausente",
+    }
+
+
+def test_conciliar_listagem_so_de_baixados():
+    # listagem filtrada por "recebida": quem aparece está baixado, quem falta está em aberto
+    linhas = {"A": linha("A", "qualquer texto")}
+    assert conciliar(["A", "B"], linhas, SITUACOES_BAIXADO, so_baixados=True) == {"A": "baixado", "B": "aberto"}
+
+
+def test_pedidos_ambiguos():
+    df = pd.DataFrame({"id": list("ABCDEF"), "st": ["TIMEOUT", "ERRO", "SIM", "", "ERRO_HTTP_500", "NAO_ENCONTRADO"]})
+    ledger = LedgerStatus.do_dataframe(df, "id", "st")
+    # status desconhecido só conta se o robô chegou a tentar o pedido
+    assert pedidos_ambiguos(ledger, list("ABCDEF")) == ["A", "B"]
+    ledger.iniciar_tentativa("E")
+    assert pedidos_ambiguos(ledger, list("ABCDEFA")) == ["A", "B", "E"]
+
+
+def test_intervalo_datas():
+    registros = {"A": registro("10/11/2025"), "B": registro("02/11/2025"), "C": registro(None)}
+    assert intervalo_datas(registros, ["A", "B", "C", "X"]) == ("02/11/2025", "10/11/2025")
+    assert intervalo_datas(registros, ["C"]) == (None, None)
+
+
+def test_relatorio_discrepancias():
+    linhas = {"A": linha("A", "Recebida"), "B": linha("B", "Em aberto", valor="R$ 99,00")}
+    situacoes = {"A": "baixado", "B": "aberto", "C": "ausente"}
+    registros = {c: registro() for c in "ABC"}
+    rel = relatorio_discrepancias(situacoes, {"A": "TIMEOUT", "B": "ERRO", "C": "TIMEOUT"},
+                                  {"A": "SIM", "B": "ERRO", "C": "TIMEOUT"}, linhas, registros)
+    por = rel.set_index("codigo")
+    assert por.loc["A", "discrepancia"] == "baixado no ERP, planilha dizia TIMEOUT"
+    assert por.loc["A", "diferenca"] == 0.0
+    assert por.loc["B", "discrepancia"] == "valor diferente"
+    assert por.loc["B", "diferenca"] == -11.0
+    assert por.loc["C", "discrepancia"] == "não apareceu na listagem"
+    assert pd.isna(por.loc["C", "valor_erp"])
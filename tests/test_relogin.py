@@ -0,0 +1,20 @@
+from relogin import VigiaSessao
+
+
+def test_sessao_caida_e_por_driver(driver_falso):
+    vigia = VigiaSessao(lambda texto: "expirou" in texto)
+    d, novo = driver_falso(), driver_falso()
+    assert vigia.marcar(d, "Sua sessão expirou")
+    assert vigia.caiu(d) and vigia.checar(d)
+    assert not vigia.caiu(novo)
+
+
+def test_alerta_que_nao_e_de_sessao_nao_marca(driver_falso):
+    vigia = VigiaSessao(lambda texto: "expirou" in texto)
+    d = driver_falso(lambda drv, js: False)
+    assert not vigia.marcar(d, "Registro salvo")
+    assert not vigia.checar(d)
+    vigia.marcar(d, origem="tela_login")
+    vigia.limpar(d)
+    assert not vigia.caiu(d)
+    assert vigia.deteccoes["tela_login"] == 1
@@ -0,0 +1,38 @@
+import gc
+
+from seletores import CacheSeletores
+
+
+class ElementoFalso:
+    def __init__(self, parent):
+        self._parent = parent   # como o WebElement do Selenium
+
+
+def achar(driver, js, estrategias):
+    return [ElementoFalso(driver), 1]
+
+
+ESTRATEGIAS = [("id", "pesquisa"), ("css", "#pesquisa-mini")]
+
+
+def test_reaproveita_elemento_e_aprende_a_estrategia(driver_falso):
+    cache, d = CacheSeletores(), driver_falso(achar)
+    el = cache.resolver(d, "busca", ESTRATEGIAS)
+    assert cache.resolver(d, "busca", ESTRATEGIAS) is el
+    assert len(d.scripts) == 1
+    assert cache._preferida["busca"] == ("css", "#pesquisa-mini")
+    cache.invalidar(d, "busca")
+    cache.resolver(d, "busca", ESTRATEGIAS)
+    assert len(d.scripts) == 2
+
+
+def test_invalidar_o_driver_solta_os_elementos(driver_falso):
+    # o elemento guarda o driver (_parent): sem invalidar, o driver reciclado nunca sairia do cache
+    cache, d = CacheSeletores(), driver_falso(achar)
+    cache.resolver(d, "busca", ESTRATEGIAS)
+    novo = driver_falso(achar)
+    assert cache.resolver(novo, "busca", ESTRATEGIAS)._parent is novo
+    cache.invalidar(d)
+    del d
+    gc.collect()
+    assert len(cache._elementos) == 1
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from preprocessamento import agregar_por_pedido
+from validacao_previa import resumo_rejeicoes, validar_pedidos
+
+COLS = ("id", "data", "bruto", "taxas", "frete", "liquido", "validacao")
+REGRAS = {"taxas": "soma", "frete": "soma", "liquido": "soma", "bruto": "soma"}
+
+
+def planilha(linhas) -> pd.DataFrame:
+    return pd.DataFrame(linhas, columns=COLS)
+
+
+def validar(df, **kw):
+    prontos, rej = validar_pedidos(df, "id", "data", "bruto", "taxas", "frete", "liquido", "validacao", **kw)
+    return prontos, dict(zip(rej["codigo"], rej["motivo"]))
+
+
+def test_pedido_consistente_passa():
+    df = planilha([("1", "05/11/2025", 120.0, 15.0, 5.0, 100.0, "ok")])
+    prontos, motivos = validar(df)
+    assert prontos.tolist() == [True]
+    assert motivos == {}
+
+
+def test_regras_de_rejeicao():
+    df = planilha([
+        ("data", None, 120.0, 15.0, 5.0, 100.0, "ok"),
+        ("zero", "05/11/2025", 20.0, 15.0, 5.0, 0.0, "ok"),
+        ("taxa", "05/11/2025", 90.0, -15.0, 5.0, 100.0, "ok"),
+        ("conta", "05/11/2025", 121.37, 15.0, 5.0, 100.0, "ok"),
+        ("texto", "05/11/2025", 120.0, 15.0, 5.0, "abc", "ok"),
+        ("planilha", "05/11/2025", 120.0, 15.0, 5.0, 100.0, "divergente"),
+    ])
+    prontos, motivos = validar(df)
+    assert not prontos.any()
+    assert motivos["data"] == "data vazia ou inválida"
+    assert motivos["zero"] == "líquido <= 0"
+    assert motivos["taxa"] == "taxas negativas"
+    assert motivos["conta"] == "bruto − taxas − frete ≠ líquido"
+    assert motivos["texto"] == "líquido vazio ou inválido"
+    assert motivos["planilha"] == "VALIDAÇÃO da planilha não é ok"
+
+
+def test_tolerancia_em_centavos():
+    df = planilha([("1", "05/11/2025", 120.01, 15.0, 5.0, 100.0, "ok"),
+                   ("2", "05/11/2025", 120.02, 15.0, 5.0, 100.0, "ok")])
+    assert validar(df)[0].tolist() == [True, False]
+    assert validar(df, tolerancia_centavos=2)[0].tolist() == [True, True]
+
+
+def test_sem_coluna_bruto_nao_refaz_a_conta():
+    df = planilha([("1", "05/11/2025", None, 15.0, 5.0, 100.0, "ok")]).drop(columns="bruto")
+    assert validar(df)[0].tolist() == [True]
+
+
+def test_taxa_e_frete_vazios_contam_como_zero():
+    df = planilha([("1", "05/11/2025", 100.0, None, np.nan, 100.0, "ok")])
+    assert validar(df)[0].tolist() == [True]
+
+
+def test_validacao_da_planilha_pode_ser_ignorada():
+    df = planilha([("1", "05/11/2025", 120.0, 15.0, 5.0, 100.0, "")])
+    assert validar(df, confiar_validacao=False)[0].tolist() == [True]
+
+
+def test_conflito_da_agregacao_rejeita_mesmo_sem_confiar_na_planilha():
+    df = planilha([
+        ("1", "05/11/2025", 60.0, 7.5, 2.5, 50.0, "ok"),
+        ("1", "06/11/2025", 60.0, 7.5, 2.5, 50.0, "ok"),   # mesma conta, datas diferentes
+        ("2", "05/11/2025", 120.0, 15.0, 5.0, 100.0, "ok"),
+    ])
+    pedidos, conflitos, bloqueados = agregar_por_pedido(df, "id", "data", "taxas", "frete", "liquido",
+                                                         "validacao", REGRAS)
+    assert bloqueados.tolist() == [True, False]
+    assert pedidos["validacao"].tolist() == ["ok", "ok"]   # a VALIDAÇÃO não é reescrita
+    for confiar in (True, False):
+        prontos, motivos = validar(pedidos, confiar_validacao=confiar, bloqueados=bloqueados)
+        assert prontos.tolist() == [False, True]
+        assert "conflito" in motivos["1"]
+
+
+def test_resumo_conta_cada_motivo():
+    df = planilha([("1", None, 120.0, -1.0, 5.0, 100.0, "ok"), ("2", None, 120.0, 15.0, 5.0, 100.0, "ok")])
+    _, rej = validar_pedidos(df, *COLS)
+    resumo = resumo_rejeicoes(rej)
+    assert resumo["data vazia ou inválida"] == 2
+    assert resumo["taxas negativas"] == 1
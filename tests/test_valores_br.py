@@ -0,0 +1,83 @@
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from leitura_entrada import _tipar_coluna
+from valores_br import brl_coluna, centavos, centavos_coluna, data_br, datas_coluna, formatar_centavos
+
+# (célula, centavos esperados)
+CORPUS_VALORES = [
+    ("1.234,56", 123456), ("R$ 1.234,56", 123456), ("R$\xa01.234,56", 123456), ("1234,56", 123456),
+    ("1,234.56", 123456), ("1234.56", 123456), ("1.234", 123400), ("1.234.567", 123456700),
+    ("1.234.567,8", 123456780), ("12.5", 1250), ("0.123", 12), ("0.125", 13), ("1,5", 150),
+    ("1,234", 123), ("1,235", 124), ("10", 1000), ("  7,00 ", 700), ("-3,50", -350), ("3,50-", -350),
+    ("(3,50)", -350), ("-R$ 3,50", -350), ("+2,00", 200), (",5", 50), ("0,01", 1), ("0,005", 1),
+    (12.5, 1250), (0.1, 10), (0.285, 29), (1.005, 101), (-0.285, -29), (19.99, 1999), (100, 10000),
+    (np.float64(2.675), 268), (np.int64(3), 300), (Decimal("1.015"), 102),
+    ("", None), ("   ", None), (None, None), (float("nan"), None), (pd.NA, None), ("abc", None),
+    ("1,2,3", None), ("1e5", None), ("R$", None), ("--1", None), (True, None),
+]
+
+# (célula, dd/mm/aaaa esperado)
+CORPUS_DATAS = [
+    ("05/11/2025", "05/11/2025"), ("5/11/2025", "05/11/2025"), ("05/11/25", "05/11/2025"),
+    ("2025-11-05", "05/11/2025"), ("2025-11-05 13:45:00", "05/11/2025"), ("05-11-2025", "05/11/2025"),
+    ("05.11.2025", "05/11/2025"), ("05/11/2025 08:30", "05/11/2025"), ("31/12/2025", "31/12/2025"),
+    (datetime(2025, 11, 5), "05/11/2025"), (pd.Timestamp("2025-11-05"), "05/11/2025"), (45966, "05/11/2025"),
+    (45966.5, "05/11/2025"), ("31/02/2025", None), ("ontem", None), ("", None), (None, None), (pd.NaT, None),
+]
+
+
+def em_lote(serie: pd.Series) -> list:
+    c, nulos = centavos_coluna(serie)
+    return [None if n else int(v) for v, n in zip(c, nulos)]
+
+
+@pytest.mark.parametrize("entrada,esperado", CORPUS_VALORES)
+def test_centavos(entrada, esperado):
+    assert centavos(entrada) == esperado
+    if esperado is not None:
+        assert centavos(formatar_centavos(esperado)) == esperado
+
+
+@pytest.mark.parametrize("entrada,esperado", CORPUS_DATAS)
+def test_data_br(entrada, esperado):
+    assert data_br(entrada) == esperado
+
+
+def test_lote_igual_ao_escalar_no_corpus():
+    serie = pd.Series([e for e, _ in CORPUS_VALORES], dtype=object)
+    assert em_lote(serie) == [e for _, e in CORPUS_VALORES]
+    assert datas_coluna(pd.Series([e for e, _ in CORPUS_DATAS], dtype=object)) == [e for _, e in CORPUS_DATAS]
+
+
+def test_coluna_float_usa_a_mesma_regra_do_escalar():
+    assert em_lote(pd.Series([0.285, 1.005, 2.675, -0.285, 19.99, np.nan])) == [29, 101, 268, -29, 1999, None]
+    # perto do meio centavo, onde uma folga em float arredondaria diferente do Decimal(repr)
+    rng = np.random.default_rng(11)
+    base = np.round(rng.uniform(-1000, 1000, 5000), 3)
+    valores = np.concatenate([base, base + 1e-7, base - 1e-7, [0.28499999, 0.2849999999, 1e-9, -0.005]])
+    serie = pd.Series(valores)
+    assert em_lote(serie) == [centavos(float(v)) for v in valores]
+
+
+def test_coluna_inteira():
+    assert em_lote(pd.Series([1, -2, 0])) == [100, -200, 0]
+    assert em_lote(pd.Series([1, None, 3], dtype="Int64")) == [100, None, 300]
+
+
+def test_brl_coluna():
+    c, nulos = centavos_coluna(pd.Series(["1.234,5", None, "-0,07"], dtype=object))
+    assert brl_coluna(c, nulos) == ["1234,50", None, "-0,07"]
+    assert brl_coluna(c, nulos, milhar=True) == ["1.234,50", None, "-0,07"]
+
+
+def test_coluna_misturada_do_leitor_igual_ao_numero():
+    # coluna com texto e número (ex.: fórmula de taxa) chega do leitor como texto; "1.845" viraria milhar
+    valores = ["R$ 5,00", 1.845, 12.5, 1.234, -0.285, 1234567.891]
+    texto = pd.Series(_tipar_coluna(valores, "TOTAL TAXAS", "ID do pedido", "Data"), dtype=object)
+    assert em_lote(texto) == [500, 185, 1250, 123, -29, 123456789]
+    assert em_lote(texto) == [centavos(v) for v in valores]
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from valores_br import centavos_coluna, datas_coluna, formatar_centavos
+
+# =====================================================
+# VALIDAÇÃO FINANCEIRA PRÉVIA (ANTES DE ABRIR O NAVEGADOR)
+# =====================================================
+
+
+def validar_pedidos(df: pd.DataFrame, coluna_codigo: str, coluna_data: str, coluna_bruto: str | None,
+                    coluna_taxas: str, coluna_frete: str, coluna_valor: str, coluna_validacao: str,
+                    tolerancia_centavos: int = 1, confiar_validacao: bool = True,
+                    bloqueados: pd.Series | None = None) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Confere todos os pedidos de uma vez (uma passada por coluna, em centavos) e devolve
+    (prontos, rejeitados): `prontos` é uma máscara alinhada ao df; `rejeitados` tem um pedido por
+    linha com todos os motivos. Rejeita data vazia/inválida, líquido vazio ou <= 0, taxa/frete/bruto
+    negativos e, se a coluna do bruto existir, bruto − taxas − frete diferente do líquido por mais de
+    `tolerancia_centavos`. Taxa/frete vazios contam como 0. Com `confiar_validacao`, VALIDAÇÃO da
+    planilha diferente de "ok" também rejeita (o que o loop fazia pedido a pedido).
+    `bloqueados` (de agregar_por_pedido) rejeita sempre, com ou sem `confiar_validacao`.
+    """
+    n = len(df)
+    vazio = pd.Series([None] * n, index=df.index, dtype=object)
+
+    def col(nome):
+        return df[nome] if nome and nome in df.columns else vazio
+
+    tem_bruto = bool(coluna_bruto) and coluna_bruto in df.columns
+    datas = np.array(datas_coluna(col(coluna_data)), dtype=object)
+    taxas, taxas_nulas = centavos_coluna(col(coluna_taxas))
+    frete, frete_nulo = centavos_coluna(col(coluna_frete))
+    valor, valor_nulo = centavos_coluna(col(coluna_valor))
+    bruto, bruto_nulo = centavos_coluna(col(coluna_bruto))
+    validacao = col(coluna_validacao).astype(object).map(str).str.strip().str.lower().to_numpy()
+
+    # taxa/frete vazios = 0 (o borderô não preenche o campo)
+    calculado = bruto - np.where(taxas_nulas, 0, taxas) - np.where(frete_nulo, 0, frete)
+    diferenca = calculado - valor
+    confere = tem_bruto & ~bruto_nulo & ~valor_nulo
+
+    regras = [
+        (datas == None, "data vazia ou inválida"),  # noqa: E711 (comparação elemento a elemento)
+        (valor_nulo, "líquido vazio ou inválido"),
+        (~valor_nulo & (valor <= 0), "líquido <= 0"),
+        (~taxas_nulas & (taxas < 0), "taxas negativas"),
+        (~frete_nulo & (frete < 0), "frete negativo"),
+        (tem_bruto & ~bruto_nulo & (bruto < 0), "bruto negativo"),
+        (tem_bruto & bruto_nulo, "bruto vazio ou inválido"),
+        (confere & (np.abs(diferenca) > tolerancia_centavos), "bruto − taxas − frete ≠ líquido"),
+    ]
+    if bloqueados is not None:
+        regras.append((bloqueados.reindex(df.index, fill_value=False).to_numpy(dtype=bool),
+                       "linhas do pedido em conflito (ver relatório de conflitos)"))
+    if confiar_validacao:
+        regras.append((validacao != "ok", "VALIDAÇÃO da planilha não é ok"))
+
+    rejeitado = np.zeros(n, dtype=bool)
+    motivos = [[] for _ in range(n)]
+    for mascara, motivo in regras:
+        mascara = np.asarray(mascara, dtype=bool)
+        rejeitado |= mascara
+        # texto só para quem caiu (poucos); a conta em si é toda em vetor
+        for i in np.flatnonzero(mascara):
+            motivos[i].append(motivo)
+
+    r = np.flatnonzero(rejeitado)
+
+    def reais_texto(c, nulos):
+        return [None if nulos[i] else formatar_centavos(int(c[i])) for i in r]
+
+    rejeitados = pd.DataFrame({
+        "codigo": col(coluna_codigo).astype(object).map(str).str.strip().to_numpy()[r],
+        "data": datas[r],
+        "bruto": reais_texto(bruto, bruto_nulo) if tem_bruto else [None] * len(r),
+        "taxas": reais_texto(taxas, taxas_nulas),
+        "frete": reais_texto(frete, frete_nulo),
+        "liquido": reais_texto(valor, valor_nulo),
+        "liquido_calculado": reais_texto(calculado, ~confere),
+        "diferenca": reais_texto(diferenca, ~confere),
+        "validacao_planilha": validacao[r],
+        "motivo": ["; ".join(motivos[i]) for i in r],
+    })
+    return pd.Series(~rejeitado, index=df.index), rejeitados
+
+
+def resumo_rejeicoes(rejeitados: pd.DataFrame) -> dict[str, int]:
+    """Quantos pedidos caíram em cada motivo (um pedido pode ter vários)."""
+    if rejeitados.empty:
+        return {}
+    return rejeitados["motivo"].str.split("; ").explode().value_counts().to_dict()
@@ -0,0 +1,180 @@
+import re
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# VALORES EM CENTAVOS (INTEIROS) E DATAS DD/MM/AAAA
+# =====================================================
+#
+# Regras do texto de dinheiro (um só lugar; br_money/valor_num antigos ficam só como referência):
+# - "R$", espaços e NBSP são ignorados; "-1,00", "1,00-" e "(1,00)" são negativos
+# - vírgula e ponto juntos: o que vem por último é o decimal ("1.234,56" e "1,234.56")
+# - só vírgula: decimal ("1,5" = 1,50; "1,234" = 1,23)
+# - só ponto: milhar quando todo grupo depois do ponto tem 3 dígitos e a parte inteira não é 0
+#   ("1.234" = 1.234,00; "1.234.567" = 1.234.567,00), senão decimal ("12.5", "0.123")
+# - arredondamento meio para cima no centavo
+# Número (int/float) vira centavos pelo texto mais curto que o representa (0.1 -> "0.1"), sem ruído binário.
+
+EXCEL_EPOCA = datetime(1899, 12, 30)
+FORMATOS_DATA = ("%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d-%m-%Y", "%d.%m.%Y",
+                 "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%Y-%m-%dT%H:%M:%S")
+RE_MILHAR = re.compile(r"\d{1,3}(\.\d{3})+")
+UM_CENTAVO = Decimal(1)
+
+
+def _decimal_centavos(d: Decimal) -> int:
+    return int((d * 100).quantize(UM_CENTAVO, rounding=ROUND_HALF_UP))
+
+
+@lru_cache(maxsize=65536)
+def _centavos_texto(s: str) -> int | None:
+    s = s.replace("R$", "").replace("\xa0", "").replace(" ", "")
+    if not s:
+        return None
+    negativo = False
+    if s.startswith("(") and s.endswith(")"):
+        negativo, s = True, s[1:-1]
+    if s.endswith("-"):
+        negativo, s = True, s[:-1]
+    if s.startswith("-"):
+        negativo, s = not negativo, s[1:]
+    elif s.startswith("+"):
+        s = s[1:]
+
+    virgula, ponto = s.rfind(","), s.rfind(".")
+    if virgula >= 0 and ponto >= 0:
+        if virgula > ponto:
+            s = s.replace(".", "").replace(",", ".")
+        else:
+            s = s.replace(",", "")
+    elif virgula >= 0:
+        if s.count(",") > 1:
+            return None
+        s = s.replace(",", ".")
+    elif ponto >= 0 and RE_MILHAR.fullmatch(s) and not s.startswith("0"):
+        s = s.replace(".", "")
+
+    if not s or not all(c.isdigit() or c == "." for c in s) or s.count(".") > 1 or s == ".":
+        return None
+    try:
+        c = _decimal_centavos(Decimal(s))
+    except InvalidOperation:
+        return None
+    return -c if negativo else c
+
+
+def centavos(valor) -> int | None:
+    """Célula -> centavos (int). None para vazio/NaN/texto que não é dinheiro."""
+    if valor is None:
+        return None
+    if isinstance(valor, (bool, np.bool_)):
+        return None
+    if isinstance(valor, (int, np.integer)):
+        return int(valor) * 100
+    if isinstance(valor, (float, np.floating)):
+        if np.isnan(valor) or np.isinf(valor):
+            return None
+        return _decimal_centavos(Decimal(repr(float(valor))))
+    if isinstance(valor, Decimal):
+        return _decimal_centavos(valor) if valor.is_finite() else None
+    if pd.isna(valor):
+        return None
+    return _centavos_texto(str(valor).strip())
+
+
+def formatar_centavos(c: int | None, milhar: bool = False) -> str | None:
+    """Centavos -> "1234,56" (o que vai no campo do ERP) ou "1.234,56" com milhar=True."""
+    if c is None:
+        return None
+    reais, resto = divmod(abs(int(c)), 100)
+    inteiro = f"{reais:,}".replace(",", ".") if milhar else str(reais)
+    return f"{'-' if c < 0 else ''}{inteiro},{resto:02d}"
+
+
+def reais(c: int | None) -> float | None:
+    return None if c is None else c / 100
+
+
+@lru_cache(maxsize=65536)
+def _data_texto(s: str) -> str | None:
+    for fmt in FORMATOS_DATA:
+        try:
+            return datetime.strptime(s, fmt).strftime("%d/%m/%Y")
+        except ValueError:
+            continue
+    return None
+
+
+def data_br(valor) -> str | None:
+    """
+    Célula -> "dd/mm/aaaa". Texto é sempre lido com o dia primeiro ("05/11/2025" = 5 de novembro);
+    número é data serial do Excel.
+    """
+    if valor is None:
+        return None
+    if isinstance(valor, (pd.Timestamp, datetime, date)):
+        return None if pd.isna(valor) else valor.strftime("%d/%m/%Y")
+    if isinstance(valor, (int, float, np.integer, np.floating)) and not isinstance(valor, bool):
+        if pd.isna(valor) or not 1 <= valor < 2958466:
+            return None
+        return (EXCEL_EPOCA + timedelta(days=float(valor))).strftime("%d/%m/%Y")
+    if pd.isna(valor):
+        return None
+    s = str(valor).strip()
+    return _data_texto(s) if s else None
+
+# =====================================================
+# API EM LOTE (COLUNA INTEIRA)
+# =====================================================
+
+
+def _por_unicos(serie: pd.Series, func, vazio):
+    # func uma vez por valor distinto; devolve array alinhado à série
+    codigos, unicos = pd.factorize(serie.to_numpy(dtype=object), use_na_sentinel=True)
+    valores = np.empty(len(unicos) + 1, dtype=object)
+    valores[:-1] = [func(v) for v in unicos]
+    valores[-1] = vazio
+    return valores[codigos]
+
+
+def centavos_coluna(serie: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Coluna -> (centavos int64, nulos bool). Nulo = vazio/NaN/texto inválido (centavos 0 ali).
+    Mesma regra de centavos() célula a célula; float é convertido uma vez por valor distinto.
+    """
+    if pd.api.types.is_integer_dtype(serie) and not serie.hasnans:
+        return serie.to_numpy(dtype=np.int64) * 100, np.zeros(len(serie), dtype=bool)
+    if pd.api.types.is_float_dtype(serie) or pd.api.types.is_integer_dtype(serie):
+        arr = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+        nulos = ~np.isfinite(arr)
+        # o mesmo Decimal(repr) do escalar (0.285 -> "0.285" -> 29), não uma folga em float
+        unicos, inverso = np.unique(np.where(nulos, 0.0, arr), return_inverse=True)
+        c = np.array([centavos(float(v)) for v in unicos], dtype=np.int64)[inverso.reshape(-1)]
+        return c, nulos
+    obj = _por_unicos(serie, centavos, None)
+    nulos = np.array([v is None for v in obj], dtype=bool)
+    c = np.where(nulos, 0, obj).astype(np.int64)
+    return c, nulos
+
+
+def brl_coluna(c: np.ndarray, nulos: np.ndarray, milhar: bool = False) -> list:
+    """Centavos em lote -> textos pt-BR (None onde nulo). Formata uma vez por valor distinto."""
+    unicos, inverso = np.unique(np.where(nulos, 0, c), return_inverse=True)
+    textos = np.array([formatar_centavos(int(v), milhar) for v in unicos], dtype=object)[inverso.reshape(-1)]
+    textos[nulos] = None
+    return textos.tolist()
+
+
+def datas_coluna(serie: pd.Series) -> list:
+    """Coluna -> "dd/mm/aaaa" (None onde vazio/inválido). Texto repetido é lido uma vez só."""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        valores = np.empty(len(unicos) + 1, dtype=object)
+        valores[:-1] = unicos.strftime("%d/%m/%Y").tolist()
+        valores[-1] = None
+        return valores[codigos].tolist()
+    return _por_unicos(serie, data_br, None).tolist()